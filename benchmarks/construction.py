@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of construction cost per operation, comparing the public (validating or copying)
+constructors to the trusted paths used by internal operators.
+
+    python -m benchmarks.construction
+"""
+import timeit
+from typing import Callable
+
+import numpy as np
+
+from satisfactory_tools.config.standardization import ConfigData
+from satisfactory_tools.core.material import MaterialSpec, MaterialSpecFactory
+from satisfactory_tools.core.process import ProcessNode
+
+MATERIAL_COUNT = 150
+NODE_COUNT = 500
+CONFIG = ConfigData(display_name="benchmark", class_name="benchmark")
+
+
+def _time(operation: Callable[[], object], number: int) -> float:
+    """
+    Best of five runs, in microseconds per operation.
+    """
+    return min(timeit.repeat(operation, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    materials = MaterialSpecFactory(**{f"material_{i}": 0 for i in range(MATERIAL_COUNT)})
+    values = np.arange(MATERIAL_COUNT, dtype=np.float64)
+    nodes = [
+        ProcessNode(name=f"recipe_{i}",
+                    input_materials=materials(**{f"material_{i % MATERIAL_COUNT}": 2}),
+                    output_materials=materials(**{f"material_{(i + 1) % MATERIAL_COUNT}": 1}),
+                    power_production=0,
+                    power_consumption=4,
+                    machine=CONFIG)
+        for i in range(NODE_COUNT)
+    ]
+    node = nodes[0]
+    fields = dict(node.__dict__) | {"internal_nodes": frozenset(nodes)}
+
+    cases = [
+        ("MaterialSpec from vector",
+         lambda: MaterialSpec(materials.index, values.copy()),
+         lambda: MaterialSpec._from_dense(materials.index, values.copy()),
+         10000),
+        ("ProcessNode * scale",
+         lambda: node.model_copy(update={"scale": 2}),
+         lambda: node * 2,
+         10000),
+        ("ProcessNode",
+         lambda: ProcessNode(**node.__dict__),
+         lambda: ProcessNode._trusted(**node.__dict__),
+         10000),
+        (f"composite of {NODE_COUNT} nodes",
+         lambda: ProcessNode(**fields),
+         lambda: ProcessNode._trusted(**fields),
+         100),
+    ]
+
+    print(f"{'operation':<28}{'public (us)':>16}{'trusted (us)':>16}{'speedup':>10}")
+    for name, validated, trusted, number in cases:
+        before = _time(validated, number)
+        after = _time(trusted, number)
+        print(f"{name:<28}{before:>16.2f}{after:>16.2f}{before / after:>9.1f}x")
+
+    print()
+    print(f"{'operation':<28}{'time (us)':>16}")
+    first, second = nodes[0].input_materials, nodes[1].input_materials
+    dense = MaterialSpec(materials.index, values)
+    for name, operation, number in [
+        ("sparse spec + spec", lambda: first + second, 10000),
+        ("dense spec + spec", lambda: dense + dense, 10000),
+        (f"from_nodes, {NODE_COUNT} nodes", lambda: ProcessNode.from_nodes(*nodes), 20),
+    ]:
+        print(f"{name:<28}{_time(operation, number):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
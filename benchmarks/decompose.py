@@ -0,0 +1,79 @@
+"""
+Benchmark of a plan over several unrelated recipe trees, comparing one monolithic solve to
+DecomposedBackend solving the trees concurrently.
+
+    python -m benchmarks.decompose
+"""
+import os
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.resolve import MATERIAL_COUNT, RAW_COUNT, RECIPE_COUNT, synthetic_catalog
+from satisfactory_tools.core.material import MaterialSpecFactory
+from satisfactory_tools.core.process import (
+    DecomposedBackend,
+    HighsBackend,
+    Process,
+    RoundingBackend,
+)
+
+TREE_COUNT = 8
+
+
+def independent_trees() -> tuple[MaterialSpecFactory, list]:
+    """
+    Copies of the synthetic catalog over disjoint materials.
+    """
+    names = [f"tree_{tree}_material_{i}"
+             for tree in range(TREE_COUNT) for i in range(MATERIAL_COUNT)]
+    materials = MaterialSpecFactory(**{name: 0 for name in names})
+    _, template = synthetic_catalog(np.random.default_rng(0))
+
+    def rename(spec, tree):
+        columns, values = spec.nonzero()
+        return materials(**{f"tree_{tree}_{spec.index.names[column]}": value
+                            for column, value in zip(columns, values, strict=True)})
+
+    nodes = []
+    for tree in range(TREE_COUNT):
+        for node in template:
+            update = {"name": f"tree_{tree}_{node.name}",
+                      "input_materials": rename(node.input_materials, tree),
+                      "output_materials": rename(node.output_materials, tree)}
+            nodes.append(node.model_copy(update=update))
+
+    return materials, nodes
+
+
+def main() -> None:
+    materials, nodes = independent_trees()
+    target = materials(**{f"tree_{tree}_material_{i}": 7.3
+                          for tree in range(TREE_COUNT)
+                          for i in range(MATERIAL_COUNT - 30, MATERIAL_COUNT)})
+    print(f"{TREE_COUNT} independent trees of {RECIPE_COUNT + RAW_COUNT} recipes")
+
+    backends = [("continuous", HighsBackend(), False), ("rounded", RoundingBackend(), True)]
+    for name, backend, integer in backends:
+        start = perf_counter()
+        expected = Process.minimize_input(target, nodes, backend=backend, integer=integer)
+        expected = expected.statistics.objective
+        print(f"{f'{name}, monolithic (s)':<40}{perf_counter() - start:>10.3f}")
+
+        for workers in sorted({2, os.cpu_count() or 1}):
+            decomposed = DecomposedBackend(backend, workers)
+            # the first solve starts the pool, later ones reuse it
+            for pool in ("new", "reused"):
+                start = perf_counter()
+                solution = Process.minimize_input(target, nodes,
+                                                  backend=decomposed,
+                                                  integer=integer)
+                elapsed = perf_counter() - start
+                assert np.isclose(solution.statistics.objective, expected)
+                print(f"{f'{name}, {workers} workers, {pool} pool (s)':<40}{elapsed:>10.3f}")
+
+            decomposed.close()
+
+
+if __name__ == "__main__":
+    main()
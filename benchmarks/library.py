@@ -0,0 +1,51 @@
+"""
+Benchmark of a library of saved plans, timing opening and searching it against loading every plan.
+
+    python -m benchmarks.library
+"""
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.resolve import MATERIAL_COUNT, synthetic_catalog
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.library import PlanLibrary
+from satisfactory_tools.core.process import Process
+
+PLAN_COUNT = 300
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    materials, nodes = synthetic_catalog(rng)
+    catalog = RecipeCatalog(nodes)
+
+    with tempfile.TemporaryDirectory() as directory:
+        library = PlanLibrary(Path(directory))
+        for i in range(PLAN_COUNT):
+            outputs = np.arange(MATERIAL_COUNT - 20, MATERIAL_COUNT)
+            targets = rng.choice(outputs, size=3, replace=False)
+            target = materials(**{f"material_{j}": float(rng.integers(1, 20)) for j in targets})
+            library.save(Process.minimize_input(target, nodes, catalog=catalog), name=f"plan {i}")
+
+        size = sum(path.stat().st_size for path in Path(directory).iterdir())
+
+        start = perf_counter()
+        reopened = PlanLibrary(Path(directory))
+        found = reopened.search(f"material_{MATERIAL_COUNT - 1}")
+        listing = perf_counter() - start
+
+        start = perf_counter()
+        for entry in reopened.search():
+            reopened.load(entry.name, catalog)
+        loading = perf_counter() - start
+
+    print(f"{PLAN_COUNT} plans, {size / 1e3:.0f} kB on disk")
+    print(f"{'open and search (ms)':<28}{listing * 1e3:>10.2f}   {len(found)} found")
+    print(f"{'load every plan (ms)':<28}{loading * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of re-solving after nudging one target rate, comparing cold solves to a SolveSession that
+reuses the previous solution.
+
+    python -m benchmarks.resolve
+"""
+from time import perf_counter
+
+import numpy as np
+
+from satisfactory_tools.config.standardization import ConfigData
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.material import MaterialSpecFactory
+from satisfactory_tools.core.process import Process, ProcessNode, SolveSession
+
+MATERIAL_COUNT = 150
+RAW_COUNT = 20
+RECIPE_COUNT = 700
+EDIT_COUNT = 50
+CONFIG = ConfigData(display_name="benchmark", class_name="benchmark")
+
+
+def synthetic_catalog(rng: np.random.Generator) -> tuple[MaterialSpecFactory, list[ProcessNode]]:
+    """
+    Extractors for the first materials, and recipes that only consume materials ordered before
+    their outputs, like the tiers of the game's tech tree.
+    """
+    names = [f"material_{i}" for i in range(MATERIAL_COUNT)]
+    materials = MaterialSpecFactory(**{name: 0 for name in names})
+    nodes = [
+        ProcessNode(name=f"extract_{i}",
+                    input_materials=materials(),
+                    output_materials=materials(**{names[i]: 60}),
+                    power_production=0,
+                    power_consumption=5,
+                    machine=CONFIG)
+        for i in range(RAW_COUNT)
+    ]
+    for i in range(RECIPE_COUNT):
+        output = int(rng.integers(RAW_COUNT, MATERIAL_COUNT))
+        inputs = rng.choice(output, size=min(output, int(rng.integers(1, 5))), replace=False)
+        input_materials = materials(**{names[j]: float(rng.integers(1, 10)) for j in inputs})
+        output_materials = materials(**{names[output]: float(rng.integers(1, 5))})
+        nodes.append(ProcessNode(name=f"recipe_{i}",
+                                 input_materials=input_materials,
+                                 output_materials=output_materials,
+                                 power_production=0,
+                                 power_consumption=4,
+                                 machine=CONFIG))
+    return materials, nodes
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    materials, nodes = synthetic_catalog(rng)
+    catalog = RecipeCatalog(nodes)
+    targets = {f"material_{i}": 10.0 for i in range(MATERIAL_COUNT - 5, MATERIAL_COUNT)}
+    edited = (list(targets.items())[rng.integers(len(targets))] for _ in range(EDIT_COUNT))
+    edits = [targets | {name: value * (1 + rng.uniform(-.05, .05))} for name, value in edited]
+
+    session = SolveSession()
+    Process.minimize_input(materials(**targets), nodes, catalog=catalog, session=session)
+
+    cold = []
+    warm = []
+    warm_starts = 0
+    for edit in edits:
+        target = materials(**edit)
+        start = perf_counter()
+        expected = Process.minimize_input(target, nodes, catalog=catalog)
+        cold.append(perf_counter() - start)
+
+        start = perf_counter()
+        solution = Process.minimize_input(target, nodes, catalog=catalog, session=session)
+        warm.append(perf_counter() - start)
+
+        warm_starts += solution.statistics.warm_start
+        assert np.isclose(solution.statistics.objective, expected.statistics.objective)
+
+    print(f"{EDIT_COUNT} single target edits, {RECIPE_COUNT + RAW_COUNT} recipes, "
+          f"{MATERIAL_COUNT} materials")
+    print(f"{'cold solve (ms)':<24}{np.median(cold) * 1e3:>10.2f}")
+    print(f"{'session solve (ms)':<24}{np.median(warm) * 1e3:>10.2f}")
+    print(f"{'previous basis reused':<24}{warm_starts:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark of whole-machine plans, comparing the continuous solve, rounding and repairing it with
+RoundingBackend, and branch and bound with MilpBackend.
+
+    python -m benchmarks.rounding
+"""
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.resolve import MATERIAL_COUNT, RAW_COUNT, RECIPE_COUNT, synthetic_catalog
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.process import MilpBackend, Process, RoundingBackend, SolverOptions
+
+TARGET_COUNT = 30
+TIME_LIMIT = 20
+
+
+def main() -> None:
+    materials, nodes = synthetic_catalog(np.random.default_rng(0))
+    catalog = RecipeCatalog(nodes)
+    target = materials(**{f"material_{i}": 7.3
+                          for i in range(MATERIAL_COUNT - TARGET_COUNT, MATERIAL_COUNT)})
+
+    runs = {
+        "continuous": {},
+        "rounded": {"integer": True, "backend": RoundingBackend()},
+        "branch and bound": {
+            "integer": True,
+            "backend": MilpBackend(SolverOptions(time_limit=TIME_LIMIT, mip_rel_gap=.01)),
+        },
+    }
+    print(f"{TARGET_COUNT} targets, {RECIPE_COUNT + RAW_COUNT} recipes, {MATERIAL_COUNT} materials")
+    print(f"{'':<20}{'time (ms)':>12}{'objective':>12}{'gap':>8}")
+    for name, arguments in runs.items():
+        start = perf_counter()
+        statistics = Process.minimize_input(target, nodes, catalog=catalog, **arguments).statistics
+        elapsed = perf_counter() - start
+        gap = "" if statistics.mip_gap is None else f"{statistics.mip_gap:.1%}"
+        print(f"{name:<20}{elapsed * 1e3:>12.1f}{statistics.objective:>12.1f}{gap:>8}")
+
+
+if __name__ == "__main__":
+    main()
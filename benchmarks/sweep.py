@@ -0,0 +1,47 @@
+"""
+Benchmark of sweeping one target from 1 to 500 per minute, comparing a loop of independent solves to
+Process.minimize_input_sweep.
+
+    python -m benchmarks.sweep
+"""
+import os
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.resolve import MATERIAL_COUNT, synthetic_catalog
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.material import MaterialMatrix
+from satisfactory_tools.core.process import Process
+
+SWEEP = np.arange(1, 501, dtype=np.float64)
+
+
+def main() -> None:
+    materials, nodes = synthetic_catalog(np.random.default_rng(0))
+    catalog = RecipeCatalog(nodes)
+    base = materials(**{f"material_{i}": 10.0
+                        for i in range(MATERIAL_COUNT - 5, MATERIAL_COUNT - 1)})
+    column = base.index[f"material_{MATERIAL_COUNT - 1}"]
+    values = np.tile(base.array, (len(SWEEP), 1))
+    values[:, column] = SWEEP
+    targets = MaterialMatrix(base.index, values)
+
+    start = perf_counter()
+    expected = [Process.minimize_input(target, nodes, catalog=catalog).statistics.objective
+                for target in targets]
+    loop = perf_counter() - start
+    print(f"{len(SWEEP)} targets, {len(nodes)} recipes")
+    print(f"{'loop of solves (s)':<28}{loop:>10.3f}")
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = perf_counter()
+        result = Process.minimize_input_sweep(targets, nodes, catalog=catalog, workers=workers)
+        elapsed = perf_counter() - start
+        assert np.allclose(result.objective, expected)
+        warm_starts = result.warm_start.sum()
+        print(f"{f'sweep, {workers} workers (s)':<28}{elapsed:>10.3f}   {warm_starts} warm starts")
+
+
+if __name__ == "__main__":
+    main()
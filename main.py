@@ -5,12 +5,13 @@ from pathlib import Path
 from nicegui import ui
 
 from satisfactory_tools.config.parser import ConfigParser
+from satisfactory_tools.core.cache import SolutionCache
 from satisfactory_tools.ui.models import Optimizer
 from satisfactory_tools.ui.views import OptimizerView
 
 config = ConfigParser(Path("./Docs.json")).parse_config()
 
-optimizer = Optimizer(config.materials, config.recipes)
+optimizer = Optimizer(config.materials, config.recipes, SolutionCache(directory=Path("./solution_cache")))
 
 
 with ui.header(elevated=True):
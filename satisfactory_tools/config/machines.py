@@ -53,6 +53,8 @@ class FuelManifest:
     fuel_load: float = 0
     byproduct_load: float = 0
     supplemental_load: float = 0
+    # supplemental resource per MW per second, in config units
+    supplemental_ratio: float = 0
 
 @dataclass(frozen=True)
 class GeneratorData(MachineData):
@@ -116,12 +118,13 @@ def _parse_generator(generator_config: dict[str, ...]) -> GeneratorData | None:
     fuels = tuple(
         FuelManifest(
             fuel=fuel_config["mFuelClass"],
-            byproduct=fuel_config["mByproduct"],
-            supplemental=fuel_config["mSupplementalResourceClass"],
+            byproduct=fuel_config["mByproduct"] or None,
+            supplemental=fuel_config["mSupplementalResourceClass"] or None,
 
             fuel_load=float(generator_config["mFuelLoadAmount"] or 0),
             byproduct_load=float(fuel_config["mByproductAmount"] or 0),
-            supplemental_load=float(generator_config["mSupplementalLoadAmount"] or 0)
+            supplemental_load=float(generator_config["mSupplementalLoadAmount"] or 0),
+            supplemental_ratio=float(generator_config.get("mSupplementalToPowerRatio") or 0),
         )
         for fuel_config in generator_config["mFuel"]
     )
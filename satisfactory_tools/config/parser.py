@@ -2,6 +2,7 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Container
 
 from more_itertools import only
 
@@ -9,12 +10,14 @@ from satisfactory_tools.auto_mapping import AutoMapping
 from satisfactory_tools.categorized_collection import CategorizedCollection
 from satisfactory_tools.config.machines import (
     ExtractorData,
+    FuelManifest,
     GeneratorData,
     MachineData,
     parse_machines,
 )
 from satisfactory_tools.config.materials import MaterialMetadata, parse_materials
-from satisfactory_tools.config.recipes import parse_recipes
+from satisfactory_tools.config.recipes import RecipeData, parse_recipes
+from satisfactory_tools.config.standardization import CYCLES_PER_MINUTE
 from satisfactory_tools.core.material import MaterialSpec, MaterialSpecFactory
 from satisfactory_tools.core.process import ProcessNode
 
@@ -66,12 +69,13 @@ class ConfigParser:
             for machine_class in recipe.machines:
                 # ignores recipes that can't be created by parsed machines
                 for machine in producers_lookup.class_name[machine_class].values:
-                    result[recipe.display_name] = ProcessNode(name=recipe.display_name,
-                                                            input_materials=self.dict_to_material_spec(recipe.inputs, material_class),
-                                                            output_materials=self.dict_to_material_spec(recipe.outputs, material_class),
-                                                            power_production=machine.power_production,
-                                                            power_consumption=machine.power_consumption,
-                                                              machine=machine)
+                    name = self.recipe_name(recipe, machine, result)
+                    result[name] = ProcessNode(name=name,
+                                               input_materials=self.dict_to_material_spec(recipe.inputs, material_class),
+                                               output_materials=self.dict_to_material_spec(recipe.outputs, material_class),
+                                               power_production=machine.power_production,
+                                               power_consumption=machine.power_consumption,
+                                               machine=machine)
 
         for extractor in self.machine_data.extractors:
             for resource in extractor.resources:
@@ -79,15 +83,17 @@ class ConfigParser:
                 output_materials = self.dict_to_material_spec({resource: extractor.items_per_cycle}, material_class)
                 resource_name = self.lookup_material(resource).display_name
                 result[resource_name] = ProcessNode(name=resource_name,
-                                                   input_materials=material_class.empty(),
+                                                   input_materials=material_class.empty().intern(),
                                                    output_materials=output_materials,
                                                    power_production=extractor.power_production,
                                                    power_consumption=extractor.power_consumption,
                                                     machine=extractor)
 
         for generator in self.machine_data.generators:
-            # TODO: need the material metadata to map from class name to resource name
-            pass
+            for fuel in generator.fuels:
+                node = self.generator_node(generator, fuel, material_class)
+                if node is not None:
+                    result[node.name] = node
 
         for key, value in result.items():
             tags = self.node_tags(value)
@@ -95,6 +101,43 @@ class ConfigParser:
 
         return result
 
+    @staticmethod
+    def recipe_name(recipe: RecipeData, machine: MachineData, taken: Container[str]) -> str:
+        """
+        Recipes made in several machines get a node for each, named after the machine after the first.
+        """
+        if recipe.display_name not in taken:
+            return recipe.display_name
+
+        return f"{recipe.display_name} ({machine.display_name})"
+
+    def generator_node(self, generator: GeneratorData, fuel: FuelManifest, material_class: MaterialSpecFactory) -> ProcessNode | None:
+        """
+        Generator burning fuel at full power, with materials per minute. None for fuels that aren't a
+        single parsed material, like classes of fuels, or that have no energy.
+        """
+        try:
+            fuel_data = self.lookup_material(fuel.fuel)
+        except KeyError:
+            return None
+
+        if fuel_data.energy_value <= 0:
+            return None
+
+        # energy values are per config unit, so rates stay in config units until the spec is made
+        fuel_rate = generator.power_production * CYCLES_PER_MINUTE / fuel_data.energy_value
+        inputs = {fuel.fuel: fuel_rate}
+        if fuel.supplemental:
+            inputs[fuel.supplemental] = fuel.supplemental_ratio * generator.power_production * CYCLES_PER_MINUTE
+
+        outputs = {fuel.byproduct: fuel.byproduct_load * fuel_rate} if fuel.byproduct else {}
+        return ProcessNode(name=f"{generator.display_name}: {fuel_data.display_name}",
+                           input_materials=self.dict_to_material_spec(inputs, material_class),
+                           output_materials=self.dict_to_material_spec(outputs, material_class),
+                           power_production=generator.power_production,
+                           power_consumption=generator.power_consumption,
+                           machine=generator)
+
     def node_tags(self, node: ProcessNode) -> set[str]:
         tags = set()
 
@@ -136,7 +179,8 @@ class ConfigParser:
 
     def dict_to_material_spec(self, materials_dict: dict[str, float], materials_factory: MaterialSpecFactory) -> MaterialSpec:
         try:
-            return materials_factory(**{material.display_name: value / material.material_type.scale() for material, value in zip(map(self.lookup_material, materials_dict.keys()), materials_dict.values())})
+            # recipes built for several machines share identical specs
+            return materials_factory(**{material.display_name: value / material.material_type.scale() for material, value in zip(map(self.lookup_material, materials_dict.keys()), materials_dict.values())}).intern()
         except KeyError:
             # FIXME: custom exception
             raise Exception("Recipe requires excluded material or produces excluded product.")
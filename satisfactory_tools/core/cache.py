@@ -0,0 +1,147 @@
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from satisfactory_tools.core.catalog import RecipeCatalog, spec_fingerprint
+from satisfactory_tools.core.material import MaterialSpec
+from satisfactory_tools.core.process import ProcessNode, Solution, SolverOptions
+
+# bump when the cached problems or their storage change, so stale entries are never read
+CACHE_VERSION = 2
+
+
+class SolutionCache:
+    """
+    Solutions addressed by a fingerprint of the request, see request_fingerprint. Recent solutions
+    are kept in memory, up to maxsize, and in the directory, if given, where they survive restarts.
+
+    Solutions are stored as the fingerprint and scale of each used node, rather than catalog ids, so
+    they're found again in any catalog with the same nodes. A changed recipe changes its
+    fingerprint, so results that depend on it are never returned.
+
+    Caches pickle empty and without their directory, so copies sent to worker processes don't carry
+    the stored solutions or write to the store.
+    """
+    maxsize: int
+    directory: Path | None
+    _memory: OrderedDict[bytes, Solution]
+
+    def __init__(self, maxsize: int = 128, directory: Path | None = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._memory = OrderedDict()
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def __reduce__(self):
+        return SolutionCache, (self.maxsize,)
+
+    def get(self, key: bytes, catalog: RecipeCatalog, name: str = "Result") -> Solution | None:
+        """
+        Cached solution for the request, over the nodes of catalog.
+        """
+        solution = self._memory.get(key)
+        if solution is not None:
+            self._memory.move_to_end(key)
+            if solution.catalog is catalog:
+                return Solution(catalog, solution.ids, solution.scales, name=name,
+                                statistics=solution.statistics,
+                                sensitivity=solution.sensitivity,
+                                pruning=solution.pruning)
+
+            fingerprints = solution.catalog.fingerprints(solution.ids)
+            return self._transfer(fingerprints, solution.scales, catalog, name)
+
+        if self.directory is None or not (path := self._path(key)).exists():
+            return None
+
+        with np.load(path, allow_pickle=False) as stored:
+            fingerprints = [fingerprint.tobytes() for fingerprint in stored["fingerprints"]]
+            scales = stored["scales"]
+
+        solution = self._transfer(fingerprints, scales, catalog, name)
+        if solution is not None:
+            self._remember(key, solution)
+
+        return solution
+
+    def put(self, key: bytes, solution: Solution) -> None:
+        self._remember(key, solution)
+        if self.directory is None:
+            return
+
+        fingerprints = np.array(solution.catalog.fingerprints(solution.ids), dtype="S16")
+        # write then rename, so readers never see partial entries
+        path = self._path(key)
+        partial = path.with_suffix(".partial.npz")
+        np.savez(partial,
+                 fingerprints=fingerprints.view(np.uint8).reshape(len(solution), 16),
+                 scales=solution.scales)
+        os.replace(partial, path)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*.npz"):
+                path.unlink()
+
+    def _remember(self, key: bytes, solution: Solution) -> None:
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: bytes) -> Path:
+        return self.directory / f"{key.hex()}.npz"
+
+    @staticmethod
+    def _transfer(fingerprints: list[bytes], scales: np.ndarray, catalog: RecipeCatalog,
+                  name: str) -> Solution | None:
+        ids = [catalog.find(fingerprint) for fingerprint in fingerprints]
+        if None in ids:
+            return None
+
+        return Solution(catalog, ids, scales, name=name)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._memory or (self.directory is not None and self._path(key).exists())
+
+
+def request_fingerprint(objective: str,
+                        catalog: RecipeCatalog,
+                        process_nodes: Iterable[ProcessNode],
+                        target_output: MaterialSpec,
+                        available_materials: MaterialSpec | None = None,
+                        include_power: bool = False,
+                        net_power: float = 0,
+                        integer: bool = False,
+                        exact: bool = True,
+                        flatten: bool = False,
+                        options: SolverOptions | None = None) -> bytes:
+    """
+    Key of a solve request: the objective, the contents of the usable nodes in any order, the
+    target, the available materials, the power balance, whether machine counts are whole, and if so
+    whether they're exact or rounded, with the time limit and gap of the integer solve, since they
+    decide which solution is returned, and whether composites are flattened. Nodes are registered in
+    the catalog.
+    """
+    options = options or SolverOptions()
+    limits = (options.time_limit, options.mip_rel_gap) if integer else None
+    ids = catalog.register_all(process_nodes)
+    digest = hashlib.blake2b(digest_size=16)
+    request = (CACHE_VERSION, objective, include_power, float(net_power),
+               integer, integer and exact, limits, flatten)
+    digest.update(repr(request).encode())
+    digest.update(b"".join(sorted(catalog.fingerprints(ids))))
+    digest.update(spec_fingerprint(target_output))
+    if available_materials is not None:
+        digest.update(spec_fingerprint(available_materials))
+
+    return digest.digest()
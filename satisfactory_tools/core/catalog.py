@@ -0,0 +1,435 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, ClassVar, Iterable
+from uuid import uuid4
+from weakref import WeakValueDictionary
+
+import numpy as np
+from scipy import sparse
+from typing_extensions import Self
+
+from satisfactory_tools.core.material import MaterialIndex, MaterialSpec
+
+if TYPE_CHECKING:
+    from satisfactory_tools.core.process import ProcessNode
+
+
+def node_fingerprint(node: "ProcessNode") -> bytes:
+    """
+    Digest of a node's contents. Unlike hash(), it's the same in every process and across restarts,
+    so it can address stored results.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((node.name,
+                        asdict(node.machine),
+                        float(node.power_production),
+                        float(node.power_consumption),
+                        float(node.scale))).encode())
+    for spec in (node.input_materials, node.output_materials):
+        digest.update(spec_fingerprint(spec))
+
+    # internal nodes are unordered
+    for internal in sorted(node_fingerprint(internal) for internal in node.internal_nodes):
+        digest.update(internal)
+
+    return digest.digest()
+
+
+def spec_fingerprint(spec: MaterialSpec) -> bytes:
+    columns, values = spec.nonzero()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([spec.index.names[column] for column in columns]).encode())
+    digest.update(np.asarray(values, dtype=np.float64).tobytes())
+    return digest.digest()
+
+
+@dataclass(frozen=True)
+class PruneReport:
+    """
+    Nodes removed before a solve, by id, and why.
+    """
+    # removed node: the kept node with the same materials and power
+    duplicates: dict[int, int]
+    # removed node: a kept node with the same outputs from no more of any input, and no less power
+    dominated: dict[int, int]
+    # nodes consuming a material that no remaining node produces and isn't available
+    starved: list[int]
+    # index of each such material
+    unproduced: list[int]
+
+    @property
+    def removed(self) -> list[int]:
+        return sorted([*self.duplicates, *self.dominated, *self.starved])
+
+    def __len__(self) -> int:
+        return len(self.duplicates) + len(self.dominated) + len(self.starved)
+
+
+@dataclass(frozen=True)
+class CompiledCatalog:
+    """
+    Sparse matrices of a catalog's nodes, with one row per material and one column per node id.
+    Values include each node's own scale, matching the nodes built by scaling catalog nodes by a
+    solution.
+    """
+    index: MaterialIndex
+    inputs: sparse.csc_array
+    outputs: sparse.csc_array
+    # outputs - inputs, production is positive and consumption negative
+    stoichiometry: sparse.csc_array
+    power_production: np.ndarray
+    power_consumption: np.ndarray
+
+    @classmethod
+    def from_nodes(cls, index: MaterialIndex, nodes: list["ProcessNode"]) -> Self:
+        scales = np.array([node.scale for node in nodes], dtype=np.float64)
+
+        def stack(specs: list[MaterialSpec]) -> sparse.csc_array:
+            columns, data = ((), ())
+            if specs:
+                columns, data = zip(*(spec.nonzero() for spec in specs), strict=True)
+            lengths = [len(spec_columns) for spec_columns in columns]
+            node_ids = np.repeat(np.arange(len(specs)), lengths)
+            rows = np.concatenate(columns) if specs else np.empty(0, dtype=np.intp)
+            values = np.concatenate(data) * scales[node_ids] if specs else np.empty(0)
+            return sparse.csc_array((values, (rows, node_ids)), shape=(len(index), len(specs)))
+
+        inputs = stack([node.input_materials for node in nodes])
+        outputs = stack([node.output_materials for node in nodes])
+        return cls(index=index,
+                   inputs=inputs,
+                   outputs=outputs,
+                   stoichiometry=(outputs - inputs).tocsc(),
+                   power_production=scales * [node.power_production for node in nodes],
+                   power_consumption=scales * [node.power_consumption for node in nodes])
+
+    @cached_property
+    def _produced_by(self) -> sparse.csr_array:
+        # (nodes, materials), 1 where the node produces the material
+        return (abs(self.outputs) > 0).astype(np.int8).T.tocsr()
+
+    @cached_property
+    def _consumed_by(self) -> sparse.csr_array:
+        # (materials, nodes), 1 where the node consumes the material
+        return (abs(self.inputs) > 0).astype(np.int8).tocsr()
+
+    def suppliers(self, materials: np.ndarray, available: np.ndarray,
+                  nodes: np.ndarray | None = None) -> np.ndarray:
+        """
+        Ids of available nodes that produce any of the materials, directly or through the inputs of
+        other available nodes. Seed nodes, if given, are included along with their suppliers. The
+        search expands a frontier of newly needed materials, so each material and node is visited
+        once.
+
+        materials: boolean mask over the material index
+        available: boolean mask over the node ids
+        nodes: boolean mask of seed node ids
+        """
+        eligible = np.zeros(len(available), dtype=bool) if nodes is None else nodes.copy()
+        needed = materials | (self._consumed_by @ eligible.astype(np.int32) > 0)
+        frontier = needed
+
+        while frontier.any():
+            new_nodes = (self._produced_by @ frontier.astype(np.int32) > 0) & available & ~eligible
+            eligible |= new_nodes
+            frontier = (self._consumed_by @ new_nodes.astype(np.int32) > 0) & ~needed
+            needed |= frontier
+
+        return np.flatnonzero(eligible)
+
+    def prune(self, node_ids: np.ndarray,
+              supplied: np.ndarray | None = None) -> tuple[np.ndarray, PruneReport]:
+        """
+        Remove nodes that an optimal solution never needs:
+
+        - starved nodes, which consume a material that no remaining node produces, repeated until
+          every input is produced or supplied
+        - dominated nodes, when another node makes the same outputs from no more of each input and
+          with no less net power, since nodes have equal cost
+        - duplicates, which are dominated both ways, keeping the lowest id
+
+        Outputs are compared as they are rather than per unit, so whole node counts stay as good.
+        Returns the kept ids with a report of the rest.
+
+        node_ids: nodes to prune
+        supplied: boolean mask of materials available without producing them
+        """
+        node_ids = np.asarray(node_ids, dtype=np.intp)
+        kept = np.zeros(self.stoichiometry.shape[1], dtype=bool)
+        kept[node_ids] = True
+        supplied = np.zeros(len(self.index), dtype=bool) if supplied is None else supplied
+
+        starved = np.zeros_like(kept)
+        while True:
+            produced = supplied | (self._produced_by.T @ kept.astype(np.int32) > 0)
+            new = kept & (self._consumed_by.T @ (~produced).astype(np.int32) > 0)
+            if not new.any():
+                break
+
+            starved |= new
+            kept &= ~new
+
+        consumed = self._consumed_by @ starved.astype(np.int32) > 0
+        # the dominator with the lowest rank is never dominated itself, so it's kept
+        dominators = self._dominators
+        removed = kept & (dominators @ kept.astype(np.int32) > 0)
+        duplicates = {}
+        dominated = {}
+        for node_id in np.flatnonzero(removed):
+            entries = slice(dominators.indptr[node_id], dominators.indptr[node_id + 1])
+            candidates = dominators.indices[entries]
+            best = np.argmin(np.where(kept[candidates], self._rank[candidates], len(kept)))
+            kind = duplicates if dominators.data[entries][best] == 2 else dominated
+            kind[int(node_id)] = int(dominators.indices[entries][best])
+
+        report = PruneReport(duplicates=duplicates,
+                             dominated=dominated,
+                             starved=np.flatnonzero(starved).tolist(),
+                             unproduced=np.flatnonzero(consumed & ~produced).tolist())
+        return np.flatnonzero(kept & ~removed), report
+
+    @cached_property
+    def _rank(self) -> np.ndarray:
+        # dominating nodes rank first: by total input, then net power, then id
+        inputs = np.asarray(self.inputs.sum(axis=0)).ravel()
+        order = np.lexsort((np.arange(len(inputs)), -self.power_balance, inputs))
+        rank = np.empty(len(order), dtype=np.intp)
+        rank[order] = np.arange(len(order))
+        return rank
+
+    @cached_property
+    def _dominators(self) -> sparse.csr_array:
+        """
+        (nodes, nodes), 1 where the column node dominates the row node and 2 where it's a duplicate
+        of lower rank. Only nodes with the same outputs are compared, found by grouping a projection
+        of the outputs, which can collide, so outputs are still compared within groups.
+        """
+        node_count = self.stoichiometry.shape[1]
+        weights = np.random.default_rng(0).uniform(1, 2, len(self.index))
+        _, groups, counts = np.unique(self.outputs.T @ weights,
+                                      return_inverse=True,
+                                      return_counts=True)
+        node_ids = np.flatnonzero(counts[groups] > 1)
+        groups = groups[node_ids]
+        inputs = self.inputs[:, node_ids].toarray().T
+        outputs = self.outputs[:, node_ids].toarray().T
+        power = self.power_balance[node_ids]
+        rank = self._rank[node_ids]
+
+        rows, columns, values = [], [], []
+        order = np.argsort(groups, kind="stable")
+        for members in np.split(order, np.flatnonzero(np.diff(groups[order])) + 1):
+            # [dominated, dominator]
+            dominates = (
+                (outputs[members][:, np.newaxis] == outputs[members][np.newaxis]).all(axis=2)
+                & (inputs[members][:, np.newaxis] >= inputs[members][np.newaxis]).all(axis=2)
+                & (power[members][:, np.newaxis] <= power[members][np.newaxis])
+                & (rank[members][:, np.newaxis] > rank[members][np.newaxis])
+            )
+            same = (
+                (inputs[members][:, np.newaxis] == inputs[members][np.newaxis]).all(axis=2)
+                & (power[members][:, np.newaxis] == power[members][np.newaxis])
+            )
+            dominated, dominator = np.nonzero(dominates)
+            rows.append(node_ids[members[dominated]])
+            columns.append(node_ids[members[dominator]])
+            values.append(np.where(same[dominated, dominator], 2, 1).astype(np.int8))
+
+        if not rows:
+            return sparse.csr_array((node_count, node_count), dtype=np.int8)
+
+        entries = (np.concatenate(rows), np.concatenate(columns))
+        return sparse.csr_array((np.concatenate(values), entries), shape=(node_count, node_count))
+
+    @property
+    def power_balance(self) -> np.ndarray:
+        """
+        Net power production of each node.
+        """
+        return self.power_production - self.power_consumption
+
+    def columns(self, node_ids: Iterable[int] | np.ndarray,
+                include_power: bool = False) -> sparse.csc_array:
+        """
+        Stoichiometry of the given nodes, optionally with their net power production as a last row.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.intp)
+        matrix = self.stoichiometry[:, node_ids]
+        if include_power:
+            power = self.power_balance[node_ids][np.newaxis, :]
+            matrix = sparse.vstack([matrix, power], format="csc")
+
+        return matrix
+
+
+class RecipeCatalog:
+    """
+    Registry of process nodes, giving each node a stable integer id. Graphs, solver columns and
+    results are keyed by id, and nodes are only looked up when they're presented. Ids are assigned
+    in registration order and never reused.
+
+    Each catalog has a key that survives pickling. Unpickling a catalog whose key is already loaded
+    in this process returns the loaded catalog, so results computed in worker processes can refer to
+    it by key and id alone.
+    """
+    _loaded: ClassVar[WeakValueDictionary[str, "RecipeCatalog"]] = WeakValueDictionary()
+    # compiled matrices of recently used catalogs by key and size, held strongly, so a worker that
+    # unpickles a fresh copy of the same catalog for each request compiles it once
+    _recently_compiled: ClassVar[OrderedDict[tuple[str, int], CompiledCatalog]] = OrderedDict()
+    recently_compiled_size: ClassVar[int] = 4
+
+    key: str
+    _nodes: list["ProcessNode"]
+    _ids: dict["ProcessNode", int]
+    # built on first solve, and again only once nodes are added
+    _compiled: CompiledCatalog | None
+    # node fingerprints by id, computed on first use
+    _fingerprints: list[bytes]
+    _ids_by_fingerprint: dict[bytes, int]
+    # primitive ids and counts by node id, see primitives
+    _primitives: dict[int, tuple[np.ndarray, np.ndarray]]
+
+    def __init__(self, nodes: Iterable["ProcessNode"] = (), key: str | None = None):
+        self.key = key or uuid4().hex
+        self._nodes = []
+        self._ids = {}
+        self._compiled = None
+        self._fingerprints = []
+        self._ids_by_fingerprint = {}
+        self._primitives = {}
+        self.register_all(nodes)
+        self._loaded[self.key] = self
+
+    @classmethod
+    def get(cls, key: str) -> Self:
+        """
+        Catalog with the given key loaded in this process.
+        """
+        try:
+            return cls._loaded[key]
+        except KeyError:
+            raise KeyError(f"Recipe catalog {key} is not loaded in this process.") from None
+
+    def __reduce__(self):
+        # the compiled matrices are rebuilt on demand rather than pickled
+        return _restore_catalog, (self.key, self._nodes)
+
+    def register(self, node: "ProcessNode") -> int:
+        """
+        Id of the node, registering it if it isn't in the catalog.
+        """
+        if (node_id := self._ids.get(node)) is not None:
+            return node_id
+
+        if self._nodes and node.input_materials.index is not self.index:
+            raise ValueError("Catalog nodes must be defined over the same materials.")
+
+        node_id = len(self._nodes)
+        self._nodes.append(node)
+        self._ids[node] = node_id
+        self._compiled = None
+        return node_id
+
+    def register_all(self, nodes: Iterable["ProcessNode"]) -> list[int]:
+        return [self.register(node) for node in nodes]
+
+    @property
+    def index(self) -> MaterialIndex:
+        if not self._nodes:
+            raise ValueError("Cannot infer materials of an empty catalog.")
+
+        return self._nodes[0].input_materials.index
+
+    def compile(self) -> CompiledCatalog:
+        """
+        Sparse matrices of every node in the catalog, cached until another node is registered.
+        """
+        if self._compiled is None:
+            # ids are never reused, so a catalog of the same key and size has the same nodes
+            recent = self._recently_compiled
+            size_key = (self.key, len(self))
+            self._compiled = recent.get(size_key)
+            if self._compiled is None:
+                self._compiled = CompiledCatalog.from_nodes(self.index, self._nodes)
+
+            recent[size_key] = self._compiled
+            recent.move_to_end(size_key)
+            while len(recent) > self.recently_compiled_size:
+                recent.popitem(last=False)
+
+        return self._compiled
+
+    def id(self, node: "ProcessNode") -> int:
+        return self._ids[node]
+
+    def fingerprints(self, ids: Iterable[int]) -> list[bytes]:
+        """
+        Content fingerprints of the nodes, see node_fingerprint.
+        """
+        self._update_fingerprints()
+        return [self._fingerprints[node_id] for node_id in ids]
+
+    def find(self, fingerprint: bytes) -> int | None:
+        """
+        Id of the node with the fingerprint, if it's in the catalog.
+        """
+        self._update_fingerprints()
+        return self._ids_by_fingerprint.get(fingerprint)
+
+    def _update_fingerprints(self) -> None:
+        for node in self._nodes[len(self._fingerprints):]:
+            fingerprint = node_fingerprint(node)
+            self._ids_by_fingerprint.setdefault(fingerprint, len(self._fingerprints))
+            self._fingerprints.append(fingerprint)
+
+    def primitives(self, node_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Ids of the primitive nodes, those without internal nodes, that a node is made of, and how
+        many of each a single run of the node uses. Primitives are registered unscaled. Expansions
+        are kept, so composites that share sub-composites expand them once.
+        """
+        if (expansion := self._primitives.get(node_id)) is not None:
+            return expansion
+
+        node = self._nodes[node_id]
+        if not node.internal_nodes:
+            primitive_id = node_id if node.scale == 1 else self.register(node.unscaled)
+            ids = np.array([primitive_id], dtype=np.intp)
+            expansion = ids, np.array([1.0 if node.scale == 1 else float(node.scale)])
+        else:
+            expansions = ((internal, self.primitives(self.register(internal.unscaled)))
+                          for internal in node.internal_nodes)
+            ids, counts = zip(*((ids, counts * internal.scale)
+                                for internal, (ids, counts) in expansions), strict=True)
+            # the same primitive reached through several internal nodes is one entry
+            ids, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+            expansion = ids, np.bincount(inverse, np.concatenate(counts)) * node.scale
+
+        self._primitives[node_id] = expansion
+        return expansion
+
+    def nodes(self, ids: Iterable[int]) -> list["ProcessNode"]:
+        return [self._nodes[node_id] for node_id in ids]
+
+    def __getitem__(self, node_id: int) -> "ProcessNode":
+        return self._nodes[node_id]
+
+    def __contains__(self, node: "ProcessNode") -> bool:
+        return node in self._ids
+
+    def __iter__(self):
+        yield from self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+def _restore_catalog(key: str, nodes: list["ProcessNode"]) -> RecipeCatalog:
+    existing = RecipeCatalog._loaded.get(key)
+    if existing is None:
+        return RecipeCatalog(nodes, key=key)
+
+    existing.register_all(nodes)
+    return existing
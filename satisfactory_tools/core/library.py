@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import ClassVar
+from uuid import uuid4
+
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.material import MaterialSpec
+from satisfactory_tools.core.process import Process, Solution
+
+# bump when the index layout changes, indexes of other versions aren't read or overwritten
+INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PlanEntry:
+    """
+    What the index knows about a saved plan, enough to list and search plans without reading them.
+    """
+    name: str
+    # body of the plan in the library directory, see Solution.save
+    file: str
+    # net rates by material name
+    outputs: dict[str, float]
+    inputs: dict[str, float]
+    machines: float
+    power_production: float
+    power_consumption: float
+    # digest of the plan's recipe fingerprints, plans over the same recipes share it
+    recipes: str
+
+    def matches(self, query: str) -> bool:
+        """
+        Whether the name, or a material the plan produces, contains the query, ignoring case.
+        """
+        query = query.casefold()
+        return any(query in text.casefold() for text in (self.name, *self.outputs))
+
+
+class PlanLibrary:
+    """
+    Plans saved in a directory, keyed by name. Each plan is a body file, the flattened solution
+    saved by Solution.save, and the index lists every plan's PlanEntry. Listing and searching only
+    read the index, once on first use, and a body is read when its plan is loaded, so opening a
+    library doesn't grow with the number of plans.
+
+    Plans are saved over the recipes they run, so they load into any catalog with those recipes.
+    """
+    index_name: ClassVar[str] = "index.json"
+
+    directory: Path
+    _entries: dict[str, PlanEntry] | None
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._entries = None
+        directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def entries(self) -> dict[str, PlanEntry]:
+        """
+        Entry of each saved plan by name, read from the index on first use. Raises ValueError for an
+        index of another version, rather than replacing it and losing its plans.
+        """
+        if self._entries is None:
+            path = self.directory / self.index_name
+            stored = {"version": INDEX_VERSION, "plans": []}
+            if path.exists():
+                stored = json.loads(path.read_text())
+            if stored.get("version") != INDEX_VERSION:
+                raise ValueError(f"Plan index {path} has version {stored.get('version')}, "
+                                 f"expected {INDEX_VERSION}.")
+
+            self._entries = {entry["name"]: PlanEntry(**entry) for entry in stored["plans"]}
+
+        return self._entries
+
+    def search(self, query: str = "") -> list[PlanEntry]:
+        """
+        Entries matching the query, see PlanEntry.matches, by name.
+        """
+        matching = (entry for entry in self.entries.values() if entry.matches(query))
+        return sorted(matching, key=lambda entry: entry.name)
+
+    def save(self, solution: Solution, name: str | None = None,
+             overwrite: bool = False) -> PlanEntry:
+        """
+        Save the plan under name, defaulting to the solution's name. Raises ValueError when a plan
+        of that name is saved already, unless it's overwritten.
+        """
+        name = name if name is not None else solution.name
+        if name in self.entries and not overwrite:
+            raise ValueError(f"A plan named {name!r} is already saved.")
+
+        flat = solution.flattened()
+        flat = Solution(flat.catalog, flat.ids, flat.scales, name=name, statistics=flat.statistics)
+        process = flat.process
+        # new bodies get new files, so the index never refers to a partial body
+        file = f"{uuid4().hex}.npz"
+        flat.save(self.directory / file)
+
+        fingerprints = sorted(flat.catalog.fingerprints(flat.ids))
+        recipes = hashlib.blake2b(b"".join(fingerprints), digest_size=16)
+        entry = PlanEntry(name=name,
+                          file=file,
+                          outputs=_rates(process.output_materials),
+                          inputs=_rates(process.input_materials),
+                          machines=float(flat.scales.sum()),
+                          power_production=float(process.power_production),
+                          power_consumption=float(process.power_consumption),
+                          recipes=recipes.hexdigest())
+        previous = self.entries.get(name)
+        self.entries[name] = entry
+        self._write_index()
+        if previous is not None:
+            (self.directory / previous.file).unlink(missing_ok=True)
+
+        return entry
+
+    def load(self, name: str, catalog: RecipeCatalog) -> Solution:
+        """
+        The saved plan over the recipes of catalog, see Solution.load.
+        """
+        return Solution.load(self.directory / self.entries[name].file, catalog)
+
+    def node(self, name: str, catalog: RecipeCatalog) -> Process:
+        """
+        The saved plan as a single node, to reuse as a recipe.
+        """
+        return self.load(name, catalog).process
+
+    def remove(self, name: str) -> None:
+        entry = self.entries.pop(name)
+        self._write_index()
+        (self.directory / entry.file).unlink(missing_ok=True)
+
+    def _write_index(self) -> None:
+        # write then rename, so readers never see a partial index
+        path = self.directory / self.index_name
+        partial = path.with_suffix(".partial")
+        plans = [asdict(entry) for entry in self.entries.values()]
+        partial.write_text(json.dumps({"version": INDEX_VERSION, "plans": plans}))
+        os.replace(partial, path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+
+def _rates(spec: MaterialSpec) -> dict[str, float]:
+    columns, values = spec.nonzero()
+    return {spec.index.names[column]: float(value)
+            for column, value in zip(columns, values, strict=True)}
@@ -1,213 +1,641 @@
+import operator
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from functools import singledispatchmethod
-from math import isclose
 from numbers import Number
-from typing import Any
+from typing import Any, ClassVar
+from weakref import WeakValueDictionary
 
-from pydantic import BaseModel, Field, RootModel
+import numpy as np
+from pydantic_core import core_schema
 from typing_extensions import Self
 
+# specs with at most this fraction of nonzero materials are stored sparsely
+SPARSE_DENSITY = 0.25
+# below this many materials, numpy call overhead outweighs the work saved by merging sparse specs,
+# so they're combined as dense vectors
+SPARSE_MERGE_SIZE = 4096
+
+_NO_COLUMNS = np.empty(0, dtype=np.intp)
+_NO_DATA = np.empty(0, dtype=np.float64)
+
 
 class _SignalClass:
     """
     Used for single dispatch on Self type
     """
+    __slots__ = ()
 
 
-class HashableDict(RootModel[dict[str, float]]):
-    root: dict[str, float]
+class MaterialIndex:
+    """
+    Interned mapping of material names to array columns. Indexes are shared between every spec
+    built over the same names, so specs can be combined with plain array arithmetic.
+    """
+    _interned: ClassVar[dict[tuple[str, ...], "MaterialIndex"]] = {}
 
-    def __init__(self, **kwargs):
-        return super().__init__(kwargs)
+    names: tuple[str, ...]
+    columns: dict[str, int]
 
-    def __hash__(self) -> int:
-        return hash(frozenset(self.root.items()))
+    def __new__(cls, names: Iterable[str]) -> Self:
+        names = tuple(names)
+        if (existing := cls._interned.get(names)) is not None:
+            return existing
 
-    def items(self):
-        yield from self.root.items()
+        obj = super().__new__(cls)
+        obj.names = names
+        obj.columns = {name: column for column, name in enumerate(names)}
+        cls._interned[names] = obj
+        return obj
 
-    def keys(self):
-        yield from self.root.keys()
+    def __getitem__(self, name: str) -> int:
+        return self.columns[name]
 
-    def values(self):
-        yield from self.root.values()
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
 
-    def __getitem__(self, name: str):
-        return self.root[name]
+    def __iter__(self):
+        yield from self.names
 
-    def __or__(self, other: Any) -> Self:
-        if not isinstance(other, (dict, HashableDict)):
-            return NotImplemented
+    def __len__(self) -> int:
+        return len(self.names)
 
-        if isinstance(other, HashableDict):
-            other = other.root
+    def __reduce__(self):
+        # re-intern on unpickling, so specs sent to worker processes share one index
+        return (type(self), (self.names,))
 
-        return type(self)(**(self.root | other))
+    def __repr__(self) -> str:
+        return f"MaterialIndex({len(self)} materials)"
 
-    def __contains__(self, name: str):
-        return name in self.root
 
-    def get(self, name: str, default: Any = None):
-        return self.root.get(name, default)
+class MaterialSpec(_SignalClass):
+    """
+    Immutable quantity of each material in a MaterialIndex. Values are stored either as a dense
+    float64 vector over the index, or sparsely as sorted column and value arrays. Recipes only touch
+    a handful of materials, so the sparse form keeps their cost proportional to the recipe rather
+    than the catalog. Results are converted to the dense form once they fill more than
+    SPARSE_DENSITY of the index.
+    """
+    __slots__ = ("_index", "_values", "_columns", "_data", "_hash", "__weakref__")
+
+    # canonical instance of each spec, for specs shared between many recipes
+    _interned: ClassVar[WeakValueDictionary[tuple[MaterialIndex, bytes, bytes], "MaterialSpec"]] = (
+        WeakValueDictionary()
+    )
+
+    _index: MaterialIndex
+    # dense storage, None when sparse
+    _values: np.ndarray | None
+    # sparse storage, None when dense
+    _columns: np.ndarray | None
+    _data: np.ndarray | None
+    # computed on first use, specs are immutable
+    _hash: int | None
+
+    def __init__(self, index: MaterialIndex, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(index),):
+            raise ValueError(f"Expected {len(index)} values, got shape {values.shape}.")
+
+        values.flags.writeable = False
+        self._index = index
+        self._values = values
+        self._columns = None
+        self._data = None
+        self._hash = None
+
+    @classmethod
+    def _from_dense(cls, index: MaterialIndex, values: np.ndarray) -> Self:
+        """
+        Wrap a float64 vector produced internally, without the checks done by __init__. The spec
+        takes ownership of values.
+        """
+        values.flags.writeable = False
+        obj = cls.__new__(cls)
+        obj._index = index
+        obj._values = values
+        obj._columns = None
+        obj._data = None
+        obj._hash = None
+        return obj
+
+    @classmethod
+    def from_sparse(cls, index: MaterialIndex, columns: np.ndarray, data: np.ndarray) -> Self:
+        """
+        Build a spec from sorted, unique column positions and their values. Zero values are dropped,
+        and the result is stored densely if it fills enough of the index.
+        """
+        return cls._from_sparse(index,
+                                np.asarray(columns, dtype=np.intp),
+                                np.asarray(data, dtype=np.float64))
+
+    @classmethod
+    def _from_sparse(cls, index: MaterialIndex, columns: np.ndarray, data: np.ndarray) -> Self:
+        if np.count_nonzero(data) != len(data):
+            keep = data != 0
+            columns = columns[keep]
+            data = data[keep]
+
+        if len(columns) > SPARSE_DENSITY * len(index):
+            values = np.zeros(len(index))
+            values[columns] = data
+            return cls._from_dense(index, values)
+
+        return cls._wrap_sparse(index, columns, data)
+
+    @classmethod
+    def _wrap_sparse(cls, index: MaterialIndex, columns: np.ndarray, data: np.ndarray) -> Self:
+        """
+        Wrap sorted columns and their nonzero values, without the checks done by _from_sparse.
+        """
+        columns.flags.writeable = False
+        data.flags.writeable = False
+        obj = cls.__new__(cls)
+        obj._index = index
+        obj._values = None
+        obj._columns = columns
+        obj._data = data
+        obj._hash = None
+        return obj
+
+    @classmethod
+    def from_dict(cls, material_values: Mapping[str, float],
+                  index: MaterialIndex | None = None) -> Self:
+        if index is None:
+            index = MaterialIndex(material_values.keys())
+
+        if not material_values:
+            return cls._from_sparse(index, _NO_COLUMNS, _NO_DATA)
+
+        entries = sorted((index[name], value) for name, value in material_values.items())
+        columns, data = zip(*entries, strict=True)
+        return cls._from_sparse(index,
+                                np.array(columns, dtype=np.intp),
+                                np.array(data, dtype=np.float64))
+
+    @classmethod
+    def weighted_sum(cls, specs: Sequence["MaterialSpec"], weights: np.ndarray) -> Self:
+        """
+        Sum of the specs, each times its weight, as a sparse matrix-vector product: the nonzeros of
+        every spec are gathered once and summed per material, so the cost follows their number
+        rather than the size of the index.
+        """
+        if not specs:
+            raise ValueError("Cannot infer materials of an empty sum.")
+
+        index = specs[0].index
+        if set(map(operator.attrgetter("_index"), specs)) != {index}:
+            raise ValueError("MaterialSpecs are defined over different materials.")
+
+        columns, data = zip(*map(MaterialSpec.nonzero, specs), strict=True)
+        lengths = np.fromiter(map(len, columns), dtype=np.intp, count=len(columns))
+        materials, positions = np.unique(np.concatenate(columns), return_inverse=True)
+        values = np.bincount(positions,
+                             weights=np.concatenate(data) * np.repeat(weights, lengths),
+                             minlength=len(materials))
+        return cls._from_sparse(index, materials, values)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        def validate(value: Any) -> MaterialSpec:
+            if isinstance(value, MaterialSpec):
+                return value
+
+            if isinstance(value, Mapping):
+                # specs were models with a single field before, as in results saved then
+                legacy = value.get("material_values")
+                if value.keys() == {"material_values"} and isinstance(legacy, Mapping):
+                    value = legacy
+
+                return cls.from_dict(value)
+
+            raise ValueError(f"Cannot build MaterialSpec from {type(value).__name__}.")
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda spec: spec.material_values
+            ),
+        )
+
+    @property
+    def index(self) -> MaterialIndex:
+        return self._index
+
+    @property
+    def is_sparse(self) -> bool:
+        return self._values is None
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Dense values, ordered by the index columns. Read-only view for dense specs, and a new array
+        for sparse ones.
+        """
+        if self._values is not None:
+            return self._values
+
+        values = np.zeros(len(self._index))
+        values[self._columns] = self._data
+        return values
+
+    @property
+    def material_values(self) -> dict[str, float]:
+        return dict(self)
+
+    def nonzero(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sorted columns of the nonzero values, and the values themselves.
+        """
+        if self._values is None:
+            return self._columns, self._data
 
+        columns = np.flatnonzero(self._values)
+        return columns, self._values[columns]
 
-class MaterialSpec(BaseModel, _SignalClass, frozen=True):
-    material_values: HashableDict = Field(default_factory=HashableDict)
+    def _new(self, values: np.ndarray) -> Self:
+        return type(self)._from_dense(self._index, values)
+
+    def _take(self, columns: np.ndarray) -> np.ndarray:
+        if self._values is not None:
+            return self._values[columns]
+
+        result = np.zeros(len(columns))
+        if len(self._columns):
+            positions = np.searchsorted(self._columns, columns).clip(max=len(self._columns) - 1)
+            found = self._columns[positions] == columns
+            result[found] = self._data[positions[found]]
+
+        return result
+
+    def _map(self, op: Callable[[np.ndarray], np.ndarray]) -> Self:
+        """
+        Apply an elementwise op, where op(0) == 0, to each value.
+        """
+        if self._values is None:
+            # op can only zero values, so the spec stays sparse
+            data = op(self._data)
+            if np.count_nonzero(data) == len(data):
+                return type(self)._wrap_sparse(self._index, self._columns, data)
+
+            keep = data != 0
+            return type(self)._wrap_sparse(self._index, self._columns[keep], data[keep])
+
+        return self._new(op(self._values))
+
+    def _combine(self, other: "MaterialSpec",
+                 op: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Self:
+        """
+        Apply an elementwise op, where op(0, 0) == 0, to each pair of values. Sparse specs over
+        indexes of at least SPARSE_MERGE_SIZE materials are merged on the union of their columns,
+        anything else is combined densely.
+        """
+        if other._index is not self._index:
+            raise ValueError("MaterialSpecs are defined over different materials.")
+
+        dense = self._values is not None or other._values is not None
+        if dense or len(self._index) < SPARSE_MERGE_SIZE:
+            return self._new(op(self.array, other.array))
+
+        columns = np.union1d(self._columns, other._columns)
+        left = np.zeros(len(columns))
+        left[columns.searchsorted(self._columns)] = self._data
+        right = np.zeros(len(columns))
+        right[columns.searchsorted(other._columns)] = other._data
+        return type(self)._from_sparse(self._index, columns, op(left, right))
+
+    def _ratios(self, other: "MaterialSpec",
+                op: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> np.ndarray:
+        if other._index is not self._index:
+            raise ValueError("MaterialSpecs are defined over different materials.")
+
+        columns, denominator = other.nonzero()
+        if not len(columns):
+            raise ZeroDivisionError("Cannot divide by empty MaterialSpec.")
+
+        return op(self._take(columns), denominator)
 
     def empty(self, values: dict[str, float] | None = None) -> Self:
-        values = values or {}
-        return type(self)(material_values={key: values.get(key, 0) for key in self.keys()})
+        if not values:
+            return type(self)._from_sparse(self._index, _NO_COLUMNS, _NO_DATA)
 
-    def _copy_and_update(self, new_values: dict[str, float]) -> Self:
-        return type(self)(material_values=self.empty().material_values | new_values)
+        return self.from_dict(values, self._index)
 
     def __lt__(self, other: Number) -> Self:
         """
         Return a MaterialSpec where values less than the given number are kept and remaining values set to
         their default.
         """
-
-        return self._copy_and_update(
-            {name: value for (name, value) in self if value < other}
-        )
+        return self._map(lambda values: np.where(values < other, values, 0.0))
 
     def __gt__(self, other: Number) -> Self:
         """
         Return a MaterialSpec where values greater than the given number are kept and remaining values set to
         their default.
         """
-        return self._copy_and_update(
-            {name: value for (name, value) in self if value > other}
-        )
+        return self._map(lambda values: np.where(values > other, values, 0.0))
 
     def __le__(self, other: Number) -> Self:
         """
         Return a MaterialSpec where values less than or equal to the given number are kept and remaining
         values set to their default.
         """
-
-        return self._copy_and_update(
-            {name: value for (name, value) in self if value <= other}
-        )
+        return self._map(lambda values: np.where(values <= other, values, 0.0))
 
     def __ge__(self, other: Number) -> Self:
         """
         Return a MaterialSpec where values greater than or equal to the given number are kept and remaining
         values set to their default.
         """
+        return self._map(lambda values: np.where(values >= other, values, 0.0))
 
-        return self._copy_and_update(
-            {name: value for (name, value) in self if value >= other}
-        )
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MaterialSpec):
+            return NotImplemented
+
+        if other._index is not self._index or hash(self) != hash(other):
+            return False
+
+        columns, data = self.nonzero()
+        other_columns, other_data = other.nonzero()
+        return np.array_equal(columns, other_columns) and np.array_equal(data, other_data)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self._key())
+
+        return self._hash
+
+    def _key(self) -> tuple[MaterialIndex, bytes, bytes]:
+        # only nonzero values, so dense and sparse forms of the same spec have the same key
+        columns, data = self.nonzero()
+        return self._index, columns.tobytes(), data.tobytes()
+
+    def __reduce__(self):
+        # cached hashes aren't pickled, string hashing differs between processes
+        if self._values is None:
+            return type(self)._from_sparse, (self._index, self._columns, self._data)
+
+        return type(self)._from_dense, (self._index, self._values)
+
+    def intern(self) -> Self:
+        """
+        Canonical instance equal to this spec. Specs interned while the canonical instance is alive
+        share it, along with its cached hash.
+        """
+        return self._interned.setdefault(self._key(), self)
 
     def __add__(self, other: Self | Any) -> Self:
-        if not isinstance(other, type(self)):
+        if not isinstance(other, MaterialSpec):
             return NotImplemented
 
-        result = {}
-        for name, value in self:
-            result[name] = value + other[name]
-        return type(self)(material_values=result)
+        return self._combine(other, np.add)
 
     def __sub__(self, other: Self | Any) -> Self:
-        if not isinstance(other, type(self)):
+        if not isinstance(other, MaterialSpec):
             return NotImplemented
 
-        result = {}
-        for name, value in self:
-            result[name] = value - other[name] 
-        return type(self)(material_values = result)
+        return self._combine(other, np.subtract)
 
     def __mul__(self, scalar: Number) -> Self:
-        result = {}
-        for name, value in self:
-            result[name] = value * scalar
-        return type(self)(material_values = result)
+        if not isinstance(scalar, Number):
+            return NotImplemented
+
+        return self._map(lambda values: values * scalar)
 
     def __rmul__(self, scalar: Number) -> Self:
         return self * scalar
 
+    def __neg__(self) -> Self:
+        return self._map(np.negative)
+
     @singledispatchmethod
     def __truediv__(self, other: Any) -> Number | Self:
         return NotImplemented
 
     @__truediv__.register
     def _(self, other: Number) -> Self:
-        result = {}
-        for name, value in self:
-            result[name] = value / other
+        if other == 0:
+            raise ZeroDivisionError("Cannot divide MaterialSpec by zero.")
 
-        return type(self)(material_values = result)
+        return self._map(lambda values: values / other)
 
     @__truediv__.register(_SignalClass)
     def _(self, other: Self) -> Number:
-        if all(value == 0 for _, value in other):
-            raise ZeroDivisionError("Cannot divide by empty MaterialSpec.")
-
-        return min(self.material_values[name] / value for name, value in other if not isclose(value, 0))
+        return float(np.min(self._ratios(other, np.true_divide)))
 
     @singledispatchmethod
-    def __floordiv__(self, other: Any) -> int | Self:
+    def __floordiv__(self, other: Any) -> float | Self:
         return NotImplemented
 
     @__floordiv__.register(_SignalClass)
-    def _(self, other: Self) -> int:
-        if all(value == 0 for _, value in other):
-            raise ZeroDivisionError("Cannot divide by empty MaterialSpec.")
-
-        return min(self.material_values[name] // value for name, value in other if not isclose(value, 0))
+    def _(self, other: Self) -> float:
+        return float(np.min(self._ratios(other, np.floor_divide)))
 
     @__floordiv__.register
     def _(self, other: Number) -> Self:
-        result = {}
-        for name, value in self:
-            result[name] = value // other 
-        return type(self)(material_values = result)
+        if other == 0:
+            raise ZeroDivisionError("Cannot divide MaterialSpec by zero.")
+
+        return self._map(lambda values: values // other)
 
     def __iter__(self):
-        yield from self.material_values.items()
+        yield from zip(self._index.names, self.array.tolist(), strict=True)
 
     def values(self):
-        yield from self.material_values.values()
+        yield from self.array.tolist()
 
     def keys(self):
-        yield from self.material_values.keys()
+        yield from self._index.names
 
     def __and__(self, other: Self) -> Self:
         if not isinstance(other, MaterialSpec):
             return NotImplemented
 
-        def test(a: float, b: float) -> bool:
-            return (not isclose(a, 0)) and (not isclose(b, 0))
+        def both(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            return np.where((a != 0) & (b != 0), np.maximum(a, b), 0.0)
 
-        return type(self)(
-            material_values={name: max(value, matched_value) if test(value, matched_value) else 0 for (name, value), (_, matched_value) in zip(self, other)})
+        return self._combine(other, both)
 
     def __or__(self, other: Self) -> Self:
         if not isinstance(other, MaterialSpec):
             return NotImplemented
 
-        def test(a: float, b: float) -> bool:
-            return (not isclose(a, 0)) or (not isclose(b, 0))
+        def either(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            return np.where((a != 0) | (b != 0), np.maximum(a, b), 0.0)
 
-        return type(self)(
-            material_values={name: max(value, matched_value) if test(value, matched_value) else 0 for (name, value), (_, matched_value) in zip(self, other)})
+        return self._combine(other, either)
 
     def __getitem__(self, item: str) -> Number:
-        return self.material_values[item]
+        column = self._index[item]
+        if self._values is not None:
+            return float(self._values[column])
+
+        position = np.searchsorted(self._columns, column)
+        if position < len(self._columns) and self._columns[position] == column:
+            return float(self._data[position])
+
+        return 0.0
 
     def __repr__(self) -> str:
-        return "\n".join(f"{name}: {value}" for name, value in self if not isclose(value, 0))
+        columns, data = self.nonzero()
+        names = self._index.names
+        return "\n".join(f"{names[column]}: {value}"
+                         for column, value in zip(columns, data.tolist(), strict=True))
 
     def __contains__(self, name: str):
-        return (name in self.material_values) and (not isclose(self.material_values.get(name, 0), 0))
+        return name in self._index and self[name] != 0
+
+
+class MaterialMatrix:
+    """
+    Stack of MaterialSpecs over one MaterialIndex, with one spec per row. Used to aggregate many
+    specs with single numpy operations rather than one MaterialSpec per step.
+    """
+    __slots__ = ("_index", "_values")
+
+    _index: MaterialIndex
+    _values: np.ndarray
+
+    def __init__(self, index: MaterialIndex, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != len(index):
+            raise ValueError(f"Expected (n, {len(index)}) values, got shape {values.shape}.")
+
+        values.flags.writeable = False
+        self._index = index
+        self._values = values
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[MaterialSpec], index: MaterialIndex | None = None) -> Self:
+        specs = list(specs)
+        if index is None:
+            if not specs:
+                raise ValueError("Cannot infer materials of an empty MaterialMatrix.")
+            index = specs[0].index
+
+        if any(spec.index is not index for spec in specs):
+            raise ValueError("MaterialSpecs are defined over different materials.")
+
+        columns, data = zip(*(spec.nonzero() for spec in specs), strict=True) if specs else ((), ())
+        lengths = [len(spec_columns) for spec_columns in columns]
+
+        values = np.zeros((len(specs), len(index)))
+        if sum(lengths):
+            rows = np.repeat(np.arange(len(specs)), lengths)
+            values[rows, np.concatenate(columns)] = np.concatenate(data)
+
+        return cls(index, values)
+
+    @property
+    def index(self) -> MaterialIndex:
+        return self._index
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Read-only (rows, materials) view of the values.
+        """
+        return self._values
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._values.shape
+
+    def _new(self, values: np.ndarray) -> Self:
+        return type(self)(self._index, values)
+
+    def _other_values(self, other: "MaterialMatrix") -> np.ndarray:
+        if other._index is not self._index:
+            raise ValueError("MaterialMatrices are defined over different materials.")
+
+        if other.shape != self.shape:
+            raise ValueError(f"Cannot combine matrices of shape {self.shape} and {other.shape}.")
+
+        return other._values
+
+    def scale(self, factors: Iterable[float] | np.ndarray) -> Self:
+        """
+        Multiply each row by its own factor.
+        """
+        factors = np.asarray(factors, dtype=np.float64)
+        return self._new(self._values * factors[:, np.newaxis])
+
+    def sum(self, weights: Iterable[float] | np.ndarray | None = None) -> MaterialSpec:
+        """
+        Sum the rows, optionally weighting each row, into a single spec.
+        """
+        if weights is None:
+            return MaterialSpec._from_dense(self._index, self._values.sum(axis=0))
+
+        weights = np.asarray(weights, dtype=np.float64)
+        return MaterialSpec._from_dense(self._index, weights @ self._values)
+
+    def net_production(self, consumption: Self,
+                       weights: Iterable[float] | np.ndarray | None = None) -> MaterialSpec:
+        """
+        Sum of these rows, as production, less the matching rows of consumption.
+        """
+        return (self - consumption).sum(weights)
+
+    def select_rows(self, rows: Iterable[int] | np.ndarray) -> Self:
+        return self._new(self._values[np.asarray(rows, dtype=np.intp)])
+
+    def select_materials(self, names: Iterable[str]) -> Self:
+        """
+        Matrix of only the given material columns, over an index of those materials.
+        """
+        index = MaterialIndex(names)
+        columns = np.fromiter((self._index[name] for name in index),
+                              dtype=np.intp,
+                              count=len(index))
+        return type(self)(index, self._values[:, columns])
+
+    def used_materials(self) -> list[str]:
+        """
+        Materials with a nonzero value in any row.
+        """
+        return [self._index.names[column] for column in np.flatnonzero(self._values.any(axis=0))]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._values[:, self._index[name]]
+
+    def __add__(self, other: Self | Any) -> Self:
+        if not isinstance(other, MaterialMatrix):
+            return NotImplemented
+
+        return self._new(self._values + self._other_values(other))
+
+    def __sub__(self, other: Self | Any) -> Self:
+        if not isinstance(other, MaterialMatrix):
+            return NotImplemented
+
+        return self._new(self._values - self._other_values(other))
+
+    def __getitem__(self, row: int) -> MaterialSpec:
+        return MaterialSpec._from_dense(self._index, self._values[row])
+
+    def __iter__(self):
+        yield from (MaterialSpec._from_dense(self._index, row) for row in self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
 
 
 class MaterialSpecFactory:
     def __init__(self, **kwargs):
         self.initial_values = kwargs
+        self.index = MaterialIndex(kwargs.keys())
+        self._initial_array = np.array(list(kwargs.values()), dtype=np.float64)
 
     def __call__(self, **kwargs) -> MaterialSpec:
-        return MaterialSpec(material_values=HashableDict(**(self.initial_values | kwargs)))
+        if not self._initial_array.any():
+            return MaterialSpec.from_dict(kwargs, self.index)
+
+        values = self._initial_array.copy()
+        for name, value in kwargs.items():
+            values[self.index[name]] = value
+
+        return MaterialSpec(self.index, values)
 
     def empty(self) -> MaterialSpec:
         return self()
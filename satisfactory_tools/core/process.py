@@ -1,21 +1,671 @@
+import json
+import os
+from abc import ABC, abstractmethod
 from collections import defaultdict
-from functools import singledispatchmethod
-from math import isclose
-from typing import Any, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import cached_property, singledispatchmethod
+from itertools import repeat
+from pathlib import Path
+from time import perf_counter
+from typing import Any, BinaryIO, Callable, ClassVar, Hashable, Iterable, Literal, Mapping
 
 import networkx as nx
 import numpy as np
-from more_itertools import distinct_combinations
-from pydantic import BaseModel, ConfigDict, Field
-from scipy.optimize import linprog
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from scipy import sparse
+from scipy.optimize import LinearConstraint, OptimizeResult, linprog, milp
+from scipy.sparse.csgraph import connected_components
 from typing_extensions import Self
 
 from satisfactory_tools.config.standardization import ConfigData
-from satisfactory_tools.core.material import MaterialSpec
+from satisfactory_tools.core.catalog import CompiledCatalog, PruneReport, RecipeCatalog
+from satisfactory_tools.core.material import MaterialIndex, MaterialMatrix, MaterialSpec
+
+# bypasses the frozen model __setattr__ when building trusted nodes
+_object_setattr = object.__setattr__
+# bump when the layout of saved solutions changes, see Solution.save
+SAVE_VERSION = 1
 
 
 class SolutionFailedException(Exception):
-    ...
+    def __init__(self, result: "LPResult"):
+        super().__init__(result.statistics.message)
+        self.result = result
+
+
+@dataclass(frozen=True)
+class LinearProgram:
+    """
+    minimize c @ x subject to A_ub @ x <= b_ub and lower <= x <= upper, with x integral where
+    integrality is 1
+    """
+    c: np.ndarray
+    A_ub: sparse.csc_array
+    b_ub: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    integrality: np.ndarray | None = None
+
+    @classmethod
+    def nonnegative(cls, c: np.ndarray, A_ub: sparse.csc_array, b_ub: np.ndarray) -> Self:
+        return cls(c=c, A_ub=A_ub, b_ub=b_ub, lower=np.zeros(len(c)), upper=np.full(len(c), np.inf))
+
+    def presolve(self) -> tuple[Self, np.ndarray, np.ndarray]:
+        """
+        Problem without columns whose bounds fix them, without rows that have no other coefficients
+        and can't be violated, and without columns that have no coefficients and don't improve the
+        objective. Removed columns sit at their lower bound. Returns the reduced problem with the
+        kept row and column masks.
+        """
+        fixed = self.lower == self.upper
+        b_ub = self.b_ub - self.A_ub @ np.where(fixed, self.lower, 0) if fixed.any() else self.b_ub
+        row_counts = np.diff(self.A_ub[:, ~fixed].tocsr().indptr)
+        rows = (row_counts > 0) | (b_ub < 0)
+        matrix = self.A_ub[rows]
+        improves = (self.c < 0) & (self.upper > self.lower)
+        columns = ~fixed & ((np.diff(matrix.indptr) > 0) | improves | ~np.isfinite(self.lower))
+
+        reduced = LinearProgram(c=self.c[columns],
+                                A_ub=matrix[:, columns],
+                                b_ub=b_ub[rows],
+                                lower=self.lower[columns],
+                                upper=self.upper[columns],
+                                integrality=self._integrality(columns))
+        return reduced, rows, columns
+
+    @property
+    def is_integer(self) -> bool:
+        return self.integrality is not None and bool(self.integrality.any())
+
+    def relaxation(self) -> Self:
+        """
+        The problem with every column continuous.
+        """
+        return replace(self, integrality=None)
+
+    def integral(self, x: np.ndarray, tolerance: float, step: float = 1) -> bool:
+        """
+        Whether x is within tolerance of a multiple of step on every integer column.
+        """
+        if not self.is_integer:
+            return True
+
+        values = x[self.integrality.astype(bool)] / step
+        return bool((np.abs(values - np.round(values)) <= tolerance).all())
+
+    def blocks(self, count: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Rows and columns of up to count independent subproblems. Rows and columns are connected by
+        nonzero coefficients, and the connected components are packed, largest first, into the
+        subproblem with the fewest nonzeros so far. Returns the row and column indices of each.
+        """
+        rows, columns = self.A_ub.shape
+        pattern = sparse.csr_array((abs(self.A_ub) > 0).astype(np.int8))
+        # bipartite graph of rows then columns
+        graph = sparse.block_array([[None, pattern], [pattern.T, None]], format="csr")
+        component_count, labels = connected_components(graph, directed=False)
+
+        # rows without coefficients join another subproblem
+        sizes = np.bincount(labels[rows:],
+                            weights=np.diff(self.A_ub.tocsc().indptr) + 1,
+                            minlength=component_count)
+        loads = np.zeros(max(1, min(count, int((sizes > 0).sum()))))
+        groups = np.empty(component_count, dtype=np.intp)
+        for component in np.argsort(-sizes, kind="stable"):
+            groups[component] = np.argmin(loads)
+            loads[groups[component]] += sizes[component]
+
+        row_groups, column_groups = groups[labels[:rows]], groups[labels[rows:]]
+        return [(np.flatnonzero(row_groups == group), np.flatnonzero(column_groups == group))
+                for group in range(len(loads))]
+
+    def subproblem(self, rows: np.ndarray, columns: np.ndarray) -> Self:
+        return LinearProgram(c=self.c[columns],
+                             A_ub=self.A_ub[rows][:, columns],
+                             b_ub=self.b_ub[rows],
+                             lower=self.lower[columns],
+                             upper=self.upper[columns],
+                             integrality=self._integrality(columns))
+
+    def _integrality(self, columns: np.ndarray) -> np.ndarray | None:
+        return None if self.integrality is None else self.integrality[columns]
+
+    def reduced_costs(self, row_duals: np.ndarray) -> np.ndarray:
+        return self.c - self.A_ub.T @ row_duals
+
+    def active_set(self, row_duals: np.ndarray,
+                   tolerance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Split columns by their reduced costs into basic columns and columns at a bound, and rows
+        into tight rows with nonzero duals and the rest. Returns x with columns at their bound and
+        basic columns at 0, the basic column mask and the tight row mask.
+        """
+        reduced_costs = self.reduced_costs(row_duals)
+        at_lower = (self.lower == self.upper) | (reduced_costs > tolerance)
+        at_upper = ~at_lower & (reduced_costs < -tolerance)
+        basic = ~(at_lower | at_upper)
+
+        x = np.where(at_upper, self.upper, self.lower)
+        x[basic] = 0
+        return x, basic, row_duals < -tolerance
+
+
+@dataclass(frozen=True)
+class SolverOptions:
+    """
+    method: "auto" lets HiGHS choose, "simplex" is dual simplex and "ipm" is interior point
+    time_limit: wall clock seconds, integer problems return the best solution found by then
+    mip_rel_gap: integer solves stop once within this fraction of the bound, MilpBackend only
+    tolerances: HiGHS defaults when None, only used by HighsBackend since milp doesn't take them
+    """
+    method: Literal["auto", "simplex", "ipm"] = "auto"
+    presolve: bool = True
+    time_limit: float | None = None
+    mip_rel_gap: float | None = None
+    primal_feasibility_tolerance: float | None = None
+    dual_feasibility_tolerance: float | None = None
+
+    def linprog_options(self) -> dict[str, Any]:
+        return self._options(presolve=self.presolve,
+                             time_limit=self.time_limit,
+                             primal_feasibility_tolerance=self.primal_feasibility_tolerance,
+                             dual_feasibility_tolerance=self.dual_feasibility_tolerance)
+
+    def milp_options(self, integer: bool = False) -> dict[str, Any]:
+        return self._options(presolve=self.presolve,
+                             time_limit=self.time_limit,
+                             mip_rel_gap=self.mip_rel_gap if integer else None)
+
+    @staticmethod
+    def _options(**options: Any) -> dict[str, Any]:
+        # unset options are left to HiGHS, and each scipy function warns about keys it doesn't take
+        return {key: value for key, value in options.items() if value is not None}
+
+
+@dataclass(frozen=True)
+class SolveStatistics:
+    """
+    status follows scipy.optimize.linprog: 0 optimal, 1 iteration or time limit, 2 infeasible,
+    3 unbounded, 4 numerical difficulties. Rows and columns removed are from our presolve, the
+    backend's own presolve isn't reported.
+
+    Integer solves report the best bound on the objective, at least the objective of the LP
+    relaxation, and the relative gap between it and the objective. A solve stopped by the time limit
+    has status 1 and may still have a solution, see LPResult.feasible.
+    """
+    backend: str
+    status: int
+    message: str
+    iterations: int | None
+    wall_time: float
+    rows_removed: int
+    columns_removed: int
+    objective: float | None
+    # reused the previous solution of a SolveSession without calling the backend
+    warm_start: bool = False
+    dual_bound: float | None = None
+    mip_gap: float | None = None
+
+    @property
+    def presolve_reductions(self) -> int:
+        return self.rows_removed + self.columns_removed
+
+
+@dataclass(frozen=True)
+class LPResult:
+    x: np.ndarray | None
+    statistics: SolveStatistics
+    # marginals of the A_ub rows, nonpositive, None if the backend doesn't report them
+    row_duals: np.ndarray | None = None
+
+    @property
+    def success(self) -> bool:
+        return self.statistics.status == 0
+
+    @property
+    def feasible(self) -> bool:
+        """
+        Optimal, or an integer solve stopped by a limit with a solution that satisfies every
+        constraint.
+        """
+        stopped = self.statistics.status == 1 and self.statistics.mip_gap is not None
+        return self.success or (stopped and self.x is not None)
+
+
+class LPBackend(ABC):
+    """
+    Solves linear programs. Subclasses only call the underlying solver, presolve and statistics are
+    shared.
+    """
+    name: ClassVar[str]
+    options: SolverOptions
+
+    def __init__(self, options: SolverOptions | None = None):
+        self.options = options or SolverOptions()
+
+    @abstractmethod
+    def _solve(self, problem: LinearProgram) -> OptimizeResult:
+        ...
+
+    def solve(self, problem: LinearProgram) -> LPResult:
+        start = perf_counter()
+        reduced, rows, columns = problem, None, None
+        if self.options.presolve:
+            reduced, rows, columns = problem.presolve()
+        result = self._solve(reduced) if reduced.c.size else self._empty(reduced)
+        return self._result(problem, rows, columns, result, start)
+
+    @staticmethod
+    def _empty(problem: LinearProgram) -> OptimizeResult:
+        # solvers reject problems without columns, which are feasible only at x = []
+        if (problem.b_ub >= 0).all():
+            return OptimizeResult(status=0,
+                                  message="Optimization terminated successfully. (No columns)",
+                                  x=np.empty(0),
+                                  nit=0,
+                                  ineqlin=OptimizeResult(marginals=np.zeros(len(problem.b_ub))))
+
+        return OptimizeResult(status=2, message="The problem is infeasible. (No columns)", x=None)
+
+    def _result(self, problem: LinearProgram,
+                rows: np.ndarray | None,
+                columns: np.ndarray | None,
+                result: OptimizeResult,
+                start: float,
+                **statistics: Any) -> LPResult:
+        # columns removed by presolve sit at their lower bound
+        kept = columns if columns is not None else slice(None)
+        x = None
+        objective = None
+        if result.x is not None:
+            x = problem.lower.copy()
+            x[kept] = result.x
+            objective = float(problem.c @ x)
+
+        row_duals = None
+        if result.x is not None and (marginals := result.get("ineqlin")) is not None:
+            row_duals = np.zeros(len(problem.b_ub))
+            row_duals[rows if rows is not None else slice(None)] = marginals.marginals
+
+        statistics = SolveStatistics(backend=self.name,
+                                     status=result.status,
+                                     message=result.message,
+                                     iterations=result.get("nit"),
+                                     wall_time=perf_counter() - start,
+                                     rows_removed=0 if rows is None else int((~rows).sum()),
+                                     columns_removed=0 if columns is None
+                                     else int((~columns).sum()),
+                                     objective=objective,
+                                     **statistics)
+        return LPResult(x=x, statistics=statistics, row_duals=row_duals)
+
+
+class HighsBackend(LPBackend):
+    """
+    HiGHS through scipy.optimize.linprog.
+    """
+    name = "highs"
+    _methods: ClassVar[dict[str, str]] = {"auto": "highs",
+                                          "simplex": "highs-ds",
+                                          "ipm": "highs-ipm"}
+
+    def _solve(self, problem: LinearProgram) -> OptimizeResult:
+        if problem.is_integer:
+            raise ValueError("Integer problems need a MilpBackend.")
+
+        return linprog(c=problem.c,
+                       A_ub=problem.A_ub,
+                       b_ub=problem.b_ub,
+                       bounds=np.column_stack([problem.lower, problem.upper]),
+                       method=self._methods[self.options.method],
+                       options=self.options.linprog_options())
+
+
+class MilpBackend(LPBackend):
+    """
+    HiGHS through scipy.optimize.milp. Doesn't report iterations or row duals, or take a method.
+
+    Integer problems solve the LP relaxation first. It settles infeasible and unbounded problems,
+    and relaxations that are already integral, without branching, and bounds the objective
+    otherwise. Branch and bound then runs for what's left of the time limit, and stops at
+    mip_rel_gap.
+    """
+    name = "milp"
+    tolerance: ClassVar[float] = 1e-6
+    # integer columns are multiples of step
+    step: float = 1
+
+    def _solve(self, problem: LinearProgram, time_limit: float | None = None) -> OptimizeResult:
+        constraints = ()
+        if problem.b_ub.size:
+            constraints = LinearConstraint(problem.A_ub, -np.inf, problem.b_ub)
+        options = self.options.milp_options(integer=problem.is_integer)
+        if time_limit is not None:
+            options["time_limit"] = time_limit
+
+        return milp(c=problem.c,
+                    constraints=constraints,
+                    integrality=problem.integrality,
+                    bounds=(problem.lower, problem.upper),
+                    options=options)
+
+    def solve(self, problem: LinearProgram) -> LPResult:
+        if not problem.is_integer:
+            return super().solve(problem)
+
+        start = perf_counter()
+        relaxed = super().solve(problem.relaxation())
+        if not relaxed.success:
+            return relaxed
+
+        if problem.integral(relaxed.x, self.tolerance, self.step):
+            rounded = np.round(relaxed.x / self.step) * self.step
+            x = np.where(problem.integrality.astype(bool), rounded, relaxed.x)
+            statistics = replace(relaxed.statistics,
+                                 wall_time=perf_counter() - start,
+                                 dual_bound=relaxed.statistics.objective,
+                                 mip_gap=0.0)
+            return LPResult(x=x, statistics=statistics)
+
+        return self._branch(problem, relaxed, start)
+
+    def _branch(self, problem: LinearProgram, relaxed: LPResult, start: float) -> LPResult:
+        bound = relaxed.statistics.objective
+        reduced, rows, columns = problem, None, None
+        if self.options.presolve:
+            reduced, rows, columns = problem.presolve()
+        time_limit = None
+        if self.options.time_limit is not None:
+            time_limit = max(self.options.time_limit - (perf_counter() - start), 0)
+
+        result = self._solve(reduced, time_limit)
+        # objective of the columns presolve fixed at their lower bound
+        offset = 0 if columns is None else float(problem.c[~columns] @ problem.lower[~columns])
+        if result.get("mip_dual_bound") is not None:
+            bound = max(bound, result.mip_dual_bound + offset)
+
+        gap = None
+        if result.x is not None:
+            objective = float(result.fun) + offset
+            gap = max(objective - bound, 0) / max(abs(objective), 1e-9)
+
+        return self._result(problem, rows, columns, result, start, dual_bound=bound, mip_gap=gap)
+
+
+class RoundingBackend(MilpBackend):
+    """
+    Integer problems solved by rounding the LP relaxation up to multiples of step, then repairing
+    it. Rows left violated get more of the node that fixes them at least cost, preferring nodes the
+    relaxation used, and each node is then trimmed as far as the rows allow, most rounded up first.
+    Costs about one relaxation, and reports the gap to its bound. Problems that adding nodes can't
+    repair, like exceeded inputs, fall back to branch and bound.
+
+    step: 1 for whole machines, or a fraction for machines at a fraction of their clock speed
+    """
+    name = "rounding"
+    max_repairs: ClassVar[int] = 1000
+
+    def __init__(self, options: SolverOptions | None = None, step: float = 1):
+        super().__init__(options)
+        self.step = step
+
+    def _branch(self, problem: LinearProgram, relaxed: LPResult, start: float) -> LPResult:
+        x = self._round(problem, relaxed.x)
+        if x is None:
+            return super()._branch(problem, relaxed, start)
+
+        bound = relaxed.statistics.objective
+        objective = float(problem.c @ x)
+        statistics = replace(relaxed.statistics,
+                             backend=self.name,
+                             message="Rounded and repaired the LP relaxation.",
+                             wall_time=perf_counter() - start,
+                             objective=objective,
+                             dual_bound=bound,
+                             mip_gap=max(objective - bound, 0) / max(abs(objective), 1e-9))
+        return LPResult(x=x, statistics=statistics)
+
+    def _round(self, problem: LinearProgram, relaxed_x: np.ndarray) -> np.ndarray | None:
+        A = problem.A_ub.tocsc()
+        rows = A.tocsr()
+        integer = problem.integrality.astype(bool)
+        step = self.step
+
+        x = relaxed_x.copy()
+        rounded_up = np.ceil(x[integer] / step - self.tolerance) * step
+        x[integer] = np.minimum(rounded_up, problem.upper[integer])
+        lhs = A @ x
+        allowance = self.tolerance * (1 + np.abs(problem.b_ub))
+        used = relaxed_x > self.tolerance
+
+        # repair: add to the cheapest producer of a violated row until every row holds
+        for _ in range(self.max_repairs):
+            violated = np.flatnonzero(lhs - problem.b_ub > allowance)
+            if not violated.size:
+                break
+
+            row = violated[0]
+            columns = rows.indices[rows.indptr[row]:rows.indptr[row + 1]]
+            values = rows.data[rows.indptr[row]:rows.indptr[row + 1]]
+            room = x[columns] + step <= problem.upper[columns]
+            candidates = (values < 0) & integer[columns] & room
+            if (candidates & used[columns]).any():
+                candidates &= used[columns]
+            if not candidates.any():
+                return None
+
+            costs = np.where(candidates, problem.c[columns] / -values, np.inf)
+            best = np.argmin(costs)
+            column, value = columns[best], values[best]
+            amount = np.ceil((lhs[row] - problem.b_ub[row]) / -value / step - self.tolerance) * step
+            amount = min(amount, problem.upper[column] - x[column])
+            x[column] += amount
+            lhs += amount * A[:, [column]].toarray().ravel()
+        else:
+            return None
+
+        # trim: remove whole steps of each node while the rows it supplies have slack
+        excess = np.where(integer, x - relaxed_x, -np.inf)
+        for column in np.argsort(-excess):
+            if not integer[column] or x[column] <= problem.lower[column]:
+                continue
+
+            entries = slice(A.indptr[column], A.indptr[column + 1])
+            column_rows, values = A.indices[entries], A.data[entries]
+            supplies = values < 0
+            slack = problem.b_ub[column_rows[supplies]] - lhs[column_rows[supplies]]
+            limit = min(x[column] - problem.lower[column],
+                        (slack / -values[supplies]).min(initial=np.inf))
+            amount = np.floor(limit / step + self.tolerance) * step
+            if amount > 0:
+                x[column] -= amount
+                lhs[column_rows] -= amount * values
+
+        return x
+
+class DecomposedBackend(LPBackend):
+    """
+    Splits problems into independent blocks, which share no material or power rows, and solves them
+    concurrently with backend in a pool of workers, one per cpu by default. Blocks are packed into
+    one subproblem per worker, so solve time follows the largest block rather than the whole
+    problem. Problems with fewer nonzeros than min_size, or with a single block, are solved
+    directly.
+
+    The pool is started by the first solve that needs it and kept for later solves, until close. It
+    isn't pickled, copies start their own.
+
+    Solutions are merged into one, and the statistics of the blocks combined. The status is the
+    worst of any block, and the objective, bound and gap are those of the whole problem.
+    """
+    name = "decomposed"
+    # smaller problems solve faster than a pool starts
+    min_size: ClassVar[int] = 5000
+    backend: LPBackend
+    workers: int
+    _executor: ProcessPoolExecutor | None
+
+    def __init__(self, backend: LPBackend | None = None, workers: int | None = None):
+        self.backend = backend or HighsBackend()
+        super().__init__(self.backend.options)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return self.__dict__ | {"_executor": None}
+
+    def close(self) -> None:
+        """
+        Shut down the pool, if one was started. Later solves start another.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _solve(self, problem: LinearProgram) -> OptimizeResult:
+        return self.backend._solve(problem)
+
+    def solve(self, problem: LinearProgram) -> LPResult:
+        start = perf_counter()
+        if self.workers == 1 or problem.A_ub.nnz < self.min_size:
+            return self.backend.solve(problem)
+
+        blocks = problem.blocks(self.workers)
+        if len(blocks) == 1:
+            return self.backend.solve(problem)
+
+        subproblems = [problem.subproblem(rows, columns) for rows, columns in blocks]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+
+        results = list(self._executor.map(self.backend.solve, subproblems))
+
+        return self._merge(problem, blocks, results, start)
+
+    def _merge(self, problem: LinearProgram,
+               blocks: list[tuple[np.ndarray, np.ndarray]],
+               results: list[LPResult],
+               start: float) -> LPResult:
+        statistics = [result.statistics for result in results]
+        worst = max(statistics, key=lambda block: block.status)
+
+        x = None
+        if all(result.x is not None for result in results):
+            x = np.empty(len(problem.c))
+            for (rows, columns), result in zip(blocks, results, strict=True):
+                x[columns] = result.x
+
+        row_duals = None
+        if all(result.row_duals is not None for result in results):
+            row_duals = np.zeros(len(problem.b_ub))
+            for (rows, columns), result in zip(blocks, results, strict=True):
+                row_duals[rows] = result.row_duals
+
+        def total(values: list[Any]) -> Any:
+            return None if None in values else sum(values)
+
+        objective = None if x is None else float(problem.c @ x)
+        dual_bound = total([block.dual_bound for block in statistics])
+        mip_gap = None
+        if objective is not None and dual_bound is not None:
+            mip_gap = max(objective - dual_bound, 0) / max(abs(objective), 1e-9)
+
+        merged = SolveStatistics(backend=self.backend.name,
+                                 status=worst.status,
+                                 message=worst.message,
+                                 iterations=total([block.iterations for block in statistics]),
+                                 wall_time=perf_counter() - start,
+                                 rows_removed=sum(block.rows_removed for block in statistics),
+                                 columns_removed=sum(block.columns_removed for block in statistics),
+                                 objective=objective,
+                                 dual_bound=dual_bound,
+                                 mip_gap=mip_gap)
+        return LPResult(x=x, statistics=merged, row_duals=row_duals)
+
+
+class SolveSession:
+    """
+    Solves a sequence of problems that share an objective and constraint rows, reusing the last
+    optimal solution. Problems with the same key may only differ in their right hand side, bounds
+    and columns appended at the end.
+
+    The duals of the last solve serve as its basis. Reduced costs fix every column that isn't basic
+    at a bound, and the basic columns are solved for from the rows that were tight. If that point is
+    feasible it's optimal, since the duals are unchanged and complementary slackness holds by
+    construction. Otherwise the backend solves from scratch.
+    """
+    backend: LPBackend
+    tolerance: ClassVar[float] = 1e-7
+    _key: Hashable | None
+    _row_duals: np.ndarray | None
+    # pseudo-inverse of the tight rows over the basic columns, reused while they're unchanged
+    _active_set: tuple[bytes, bytes] | None
+    _inverse: np.ndarray | None
+
+    def __init__(self, backend: LPBackend | None = None):
+        self.backend = backend or HighsBackend()
+        self._key = None
+        self._row_duals = None
+        self._active_set = None
+        self._inverse = None
+
+    def solve(self, problem: LinearProgram, key: Hashable) -> LPResult:
+        start = perf_counter()
+        result = None
+        if key == self._key and self._row_duals is not None:
+            result = self._reoptimize(problem, self._row_duals, start)
+
+        if result is None:
+            result = self.backend.solve(problem)
+
+        if key != self._key or result.row_duals is not self._row_duals:
+            self._active_set = None
+            self._inverse = None
+
+        self._key = key
+        self._row_duals = result.row_duals if result.success else None
+        return result
+
+    def _reoptimize(self, problem: LinearProgram, row_duals: np.ndarray,
+                    start: float) -> LPResult | None:
+        if len(row_duals) != len(problem.b_ub):
+            return None
+
+        A = problem.A_ub
+        x, basic, tight = problem.active_set(row_duals, self.tolerance)
+        if not np.isfinite(x[~basic]).all():
+            return None
+
+        if basic.any() and tight.any():
+            active_set = (tight.tobytes(), basic.tobytes())
+            if active_set != self._active_set:
+                self._active_set = active_set
+                self._inverse = np.linalg.pinv(A[tight][:, basic].toarray())
+
+            x[basic] = self._inverse @ (problem.b_ub[tight] - A[tight] @ x)
+
+        scale = 1 + np.abs(problem.b_ub)
+        slack = problem.b_ub - A @ x
+        if (
+            (slack < -self.tolerance * scale).any()
+            or (slack[tight] > self.tolerance * scale[tight]).any()
+            or (x < problem.lower - self.tolerance).any()
+            or (x > problem.upper + self.tolerance).any()
+        ):
+            return None
+
+        x = np.clip(x, problem.lower, problem.upper)
+        statistics = SolveStatistics(backend=self.backend.name,
+                                     status=0,
+                                     message="Previous optimal basis is still optimal.",
+                                     iterations=0,
+                                     wall_time=perf_counter() - start,
+                                     rows_removed=0,
+                                     columns_removed=0,
+                                     objective=float(problem.c @ x),
+                                     warm_start=True)
+        return LPResult(x=x, statistics=statistics, row_duals=row_duals)
+
 
 class _SignalClass(BaseModel):
     """
@@ -32,29 +682,93 @@ class ProcessNode(_SignalClass):
     machine: ConfigData
     internal_nodes: frozenset["ProcessNode"] = Field(default_factory=frozenset)
     scale: float = 1
+    # nodes are graph and dictionary keys throughout, so their hash is computed once
+    _hash: int | None = PrivateAttr(default=None)
 
+    @classmethod
+    def _trusted(cls, **fields: Any) -> Self:
+        """
+        Build a node from fields produced internally, which are already valid, without running
+        pydantic validation. Nodes from users and config go through the normal constructor.
+        """
+        obj = cls.__new__(cls)
+        # in declaration order, as pydantic fills them, so dumps list fields in the same order
+        values = {name: fields[name] if name in fields
+                  else field.get_default(call_default_factory=True)
+                  for name, field in cls.model_fields.items()}
+        _object_setattr(obj, "__dict__", values)
+        _object_setattr(obj, "__pydantic_fields_set__", set(fields))
+        _object_setattr(obj, "__pydantic_extra__", None)
+        private = {name: attribute.get_default()
+                   for name, attribute in cls.__private_attributes__.items()}
+        _object_setattr(obj, "__pydantic_private__", private)
+        return obj
+
+    def _replace(self, **updates: Any) -> Self:
+        """
+        Trusted copy of this node with some fields replaced, keeping private attributes.
+        """
+        obj = self.__class__.__new__(self.__class__)
+        _object_setattr(obj, "__dict__", self.__dict__ | updates)
+        _object_setattr(obj, "__pydantic_fields_set__",
+                        self.__pydantic_fields_set__ | updates.keys())
+        _object_setattr(obj, "__pydantic_extra__", None)
+        _object_setattr(obj, "__pydantic_private__", self.__pydantic_private__ | {"_hash": None})
+        return obj
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__pydantic_private__["_hash"] = None
+        return copied
+
+    def __hash__(self) -> int:
+        private = self.__pydantic_private__
+        if private["_hash"] is None:
+            private["_hash"] = hash(tuple(self.__dict__[name] for name in type(self).model_fields))
+
+        return private["_hash"]
+
+    def __eq__(self, other: object) -> bool:
+        # private attributes, like the cached hash, are ignored
+        if not isinstance(other, ProcessNode):
+            return NotImplemented
+
+        # hashing first settles chains, which compare as the composite they become
+        return self is other or (
+            hash(self) == hash(other)
+            and type(self) is type(other)
+            and self.__dict__ == other.__dict__
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # cached hashes aren't pickled, string hashing differs between processes
+        state = super().__getstate__()
+        state["__pydantic_private__"] = state["__pydantic_private__"] | {"_hash": None}
+        return state
 
     @classmethod
     def from_nodes(cls, *nodes: Self, name: str="Composite") -> Self:
-        empty = nodes[0].input_materials.empty()  # FIXME: why
-
         # TODO: hide input/output so that scale is unavoidable
-        sum_inputs = sum((node.scaled_input for node in nodes), empty)
-        sum_outputs = sum((node.scaled_output for node in nodes), empty)
-
-        net_inputs = (sum_inputs - sum_outputs) > 0
-        net_outputs = (sum_outputs - sum_inputs) > 0
-        power_production = sum(node.power_production * node.scale for node in nodes)
+        if not nodes:
+            raise ValueError("Cannot combine an empty set of nodes.")
 
-        power_consumption = sum(node.power_consumption * node.scale for node in nodes)
+        # one pass over the nodes, then one weighted sum where inputs count negatively
+        columns = ((node.output_materials,
+                    node.input_materials,
+                    (node.scale, node.power_production, node.power_consumption))
+                   for node in nodes)
+        outputs, inputs, fields = zip(*columns, strict=True)
+        scales, power_production, power_consumption = np.array(fields, dtype=np.float64).T
+        net_production = MaterialSpec.weighted_sum(outputs + inputs,
+                                                   np.concatenate([scales, -scales]))
 
-        return cls(name=name, 
-                   input_materials=net_inputs, 
-                   output_materials=net_outputs,
-                   power_production=power_production,
-                   power_consumption=power_consumption,
-                   machine=ConfigData(display_name=name, class_name=""),
-                   internal_nodes=frozenset(nodes))
+        return cls._trusted(name=name,
+                            input_materials=-net_production > 0,
+                            output_materials=net_production > 0,
+                            power_production=float(scales @ power_production),
+                            power_consumption=float(scales @ power_consumption),
+                            machine=ConfigData(display_name=name, class_name=""),
+                            internal_nodes=frozenset(nodes))
 
     def __repr__(self) -> str:
         ingredients = " ".join(repr(self.scaled_input).splitlines())
@@ -76,7 +790,7 @@ class ProcessNode(_SignalClass):
 
     @__rshift__.register(_SignalClass)
     def _(self, other: Self) -> Self:
-        return self.from_nodes(self, other)
+        return ProcessChain._join(self, other)
 
     @singledispatchmethod
     def __lshift__(self, other: Any) -> Self | MaterialSpec:
@@ -93,7 +807,7 @@ class ProcessNode(_SignalClass):
 
     @__lshift__.register(_SignalClass)
     def _(self, other: Self) -> Self:
-        return self.from_nodes(other, self)
+        return ProcessChain._join(other, self)
 
     def __rrshift__(self, other: Self | MaterialSpec | Any) -> Self | MaterialSpec:
         """
@@ -113,13 +827,13 @@ class ProcessNode(_SignalClass):
         """
         Scale up this recipe
         """
-        return self.model_copy(update={"scale": scalar * self.scale})
+        return self._replace(scale=scalar * self.scale)
 
     def has_input(self, material: str) -> bool:
-        return getattr(self.input_materials, material) > 0
+        return material in self.input_materials
 
     def has_output(self, material: str) -> bool:
-        return getattr(self.output_materials, material) > 0
+        return material in self.output_materials
 
     @property
     def scaled_input(self) -> MaterialSpec:
@@ -129,148 +843,901 @@ class ProcessNode(_SignalClass):
     def scaled_output(self) -> MaterialSpec:
         return self.output_materials * self.scale
 
+    @property
+    def unscaled(self) -> Self:
+        """
+        This node run once.
+        """
+        return self if self.scale == 1 else self._replace(scale=1)
+
 ProcessNode.update_forward_refs()
 
 
+class ProcessChain(ProcessNode):
+    """
+    Composite built by joining nodes with >> and <<. Joining only links the operands, and the chain
+    becomes the flat composite of every linked node, an ordinary ProcessNode, the first time
+    anything else about it is accessed. Long chains cost one from_nodes call rather than one per
+    operator, and their internal nodes are the joined nodes rather than nested composites.
+    """
+
+    @classmethod
+    def _join(cls, first: ProcessNode, second: ProcessNode) -> Self:
+        obj = cls.__new__(cls)
+        _object_setattr(obj, "__dict__", {})
+        _object_setattr(obj, "__pydantic_fields_set__", set())
+        _object_setattr(obj, "__pydantic_extra__", None)
+        # a tree of the operands, with chains replaced by their own links
+        _object_setattr(obj, "__pydantic_private__",
+                        {"_link": (_chain_link(first), _chain_link(second))})
+        return obj
+
+    def __getattribute__(self, name: str) -> Any:
+        # the class is used to dispatch operators, anything else needs the composite
+        if name != "__class__":
+            _materialize_chain(self)
+
+        return object.__getattribute__(self, name)
+
+
+def _chain_link(node: ProcessNode) -> ProcessNode | tuple:
+    if type(node) is ProcessChain:
+        return object.__getattribute__(node, "__pydantic_private__")["_link"]
+
+    return node
+
+
+def _materialize_chain(chain: ProcessChain) -> None:
+    nodes = []
+    stack = [object.__getattribute__(chain, "__pydantic_private__")["_link"]]
+    while stack:
+        link = stack.pop()
+        if isinstance(link, tuple):
+            stack.extend(reversed(link))
+        else:
+            nodes.append(link)
+
+    composite = ProcessNode.from_nodes(*nodes)
+    state = ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__")
+    for name in state:
+        _object_setattr(chain, name, object.__getattribute__(composite, name))
+
+    # from here on the chain is the composite
+    _object_setattr(chain, "__class__", ProcessNode)
+
+
 class Process(ProcessNode):
     """
-    Store graph of nodes defining process.
+    Store graph of nodes defining process. Graph nodes are keyed by integer id, with the process
+    node itself stored in the "node" attribute. Synthetic nodes, like resource pools, get negative
+    keys so they never collide with catalog ids. Edges carry the material and the amount that flows
+    along them.
+
+    The graph is only built the first time it's accessed.
     """
-    _graph: nx.MultiGraph
+    _graph: nx.MultiDiGraph | None = PrivateAttr(default=None)
+    # graph keys of the internal nodes
+    _nodes: dict[int, ProcessNode] | None = PrivateAttr(default=None)
 
     @classmethod
-    def from_nodes(cls, nodes_or_graph: Iterable[ProcessNode] | nx.MultiDiGraph, name: str="Composite") -> Self:
+    def from_nodes(
+        cls,
+        nodes_or_graph: Iterable[ProcessNode] | Mapping[int, ProcessNode] | nx.MultiDiGraph,
+        name: str="Composite",
+    ) -> Self:
+        graph = None
         if isinstance(nodes_or_graph, nx.MultiDiGraph):
-            _graph = nodes_or_graph
+            graph = nodes_or_graph
+            nodes = {key: node for key, node in graph.nodes(data="node") if key >= 0}
+        elif isinstance(nodes_or_graph, Mapping):
+            nodes = dict(nodes_or_graph)
         else:
-            _graph = cls._make_graph(nodes_or_graph)
+            nodes = dict(enumerate(nodes_or_graph))
 
-        obj = super().from_nodes(*_graph.nodes, name=name)
-        obj._graph = _graph
+        obj = super().from_nodes(*nodes.values(), name=name)
+        obj._graph = graph
+        obj._nodes = nodes
         return obj
 
+    def __getstate__(self) -> dict[str, Any]:
+        # graphs are rebuilt on demand, from the nodes by their graph keys, which are kept
+        state = super().__getstate__()
+        state["__pydantic_private__"] = state["__pydantic_private__"] | {"_graph": None}
+        return state
+
+    @staticmethod
+    def _filter_eligible_nodes(target_output: MaterialSpec,
+                               compiled: CompiledCatalog,
+                               available_ids: Iterable[int],
+                               include_power: bool = False) -> np.ndarray:
+        """
+        Ids of the available nodes that can contribute to the target output, or to power generation
+        if power is included.
+        """
+        available = np.zeros(compiled.stoichiometry.shape[1], dtype=bool)
+        available[list(available_ids)] = True
+        generators = available & (compiled.power_production > 0) if include_power else None
+        return compiled.suppliers(target_output.array != 0, available, generators)
+
     @classmethod
-    def _filter_eligible_nodes(cls, output_node: ProcessNode, available_nodes: list[ProcessNode]) -> list[ProcessNode]:
-        graph = cls._make_graph([output_node] + available_nodes, make_pool_nodes=False)
-        return list(nx.ancestors(graph, output_node) | {output_node})
+    def _prune(cls,
+               target_output: MaterialSpec,
+               compiled: CompiledCatalog,
+               connected_ids: np.ndarray,
+               include_power: bool,
+               supplied: MaterialSpec | None = None) -> tuple[np.ndarray, PruneReport]:
+        """
+        Connected nodes without those an optimal solution doesn't need, see CompiledCatalog.prune,
+        and without nodes that only supplied them.
+        """
+        kept, report = compiled.prune(connected_ids,
+                                      None if supplied is None else supplied.array > 0)
+        return cls._filter_eligible_nodes(target_output, compiled, kept, include_power), report
 
     @staticmethod
-    def _make_graph(nodes: list[ProcessNode], make_pool_nodes: bool = True) -> nx.MultiGraph:
+    def _make_graph(nodes: Mapping[int, ProcessNode]) -> nx.MultiDiGraph:
         graph = nx.MultiDiGraph()
-        graph.add_nodes_from(nodes)
+        graph.add_nodes_from((node_id, {"node": node}) for node_id, node in nodes.items())
+        if not nodes:
+            return graph
 
-        def join_nodes(a: ProcessNode, b: ProcessNode, material: str):
-            if material in b.output_materials and material in a.input_materials:
-                graph.add_edge(b, a, material=material)
+        # material column -> (node id, amount) of each node producing or consuming it
+        producers: defaultdict[int, list[tuple[int, float]]] = defaultdict(list)
+        consumers: defaultdict[int, list[tuple[int, float]]] = defaultdict(list)
+        for node_id, node in nodes.items():
+            for column, amount in zip(*node.scaled_output.nonzero(), strict=True):
+                producers[column].append((node_id, amount))
+            for column, amount in zip(*node.scaled_input.nonzero(), strict=True):
+                consumers[column].append((node_id, amount))
 
-            if material in a.output_materials and material in b.input_materials:
-                graph.add_edge(a, b, material=material)
+        empty = next(iter(nodes.values())).input_materials.empty()
+        pool_id = min(min(nodes), 0)
+        for column in sorted(producers.keys() | consumers.keys()):
+            material = empty.index.names[column]
+            produced, consumed = producers[column], consumers[column]
 
-        adjacency_dict = defaultdict(list)
-        for node in nodes:
-            material_requirements = node.input_materials | node.output_materials
-            for material in material_requirements.keys():
-                if material in material_requirements:
-                    adjacency_dict[material].append(node)
-        
-        for material, nodes in adjacency_dict.items():
-            if len(nodes) > 2 and make_pool_nodes:
+            if len({node_id for node_id, _ in produced} | {node_id for node_id, _ in consumed}) > 2:
                 # make a pool node for this resource, so that we don't connect every machine that
                 # has a byproduct to every other machine that uses that material
-                # FIXME: material spec ergonomics
-                input_count = sum((node.scaled_input[material] for node in nodes))
-                output_count = sum((node.scaled_output[material] for node in nodes))
-                input_materials = nodes[0].input_materials.empty({material: input_count})
-                output_materials = nodes[0].output_materials.empty({material: output_count})
-                name = f"{material} Node"
-
-                pool_node = ProcessNode(name=name, input_materials=input_materials, output_materials=output_materials, power_production=0, power_consumption=0, machine=ConfigDict(display_name="Resource Pool", class_name=""))
-                for node in nodes:
-                    join_nodes(node, pool_node, material)
+                input_count = sum(amount for _, amount in consumed)
+                output_count = sum(amount for _, amount in produced)
+                pool_id -= 1
+                pool_node = ProcessNode._trusted(
+                    name=f"{material} Node",
+                    input_materials=empty.empty({material: input_count}),
+                    output_materials=empty.empty({material: output_count}),
+                    power_production=0,
+                    power_consumption=0,
+                    machine=ConfigData(display_name="Resource Pool", class_name=""),
+                )
+                graph.add_node(pool_id, node=pool_node)
+                graph.add_edges_from((node_id, pool_id, {"material": material, "amount": amount})
+                                     for node_id, amount in produced)
+                graph.add_edges_from((pool_id, node_id, {"material": material, "amount": amount})
+                                     for node_id, amount in consumed)
             else:
-                for a, b in distinct_combinations(nodes, 2):
-                    join_nodes(a, b, material)
+                graph.add_edges_from(
+                    (producer, consumer, {"material": material, "amount": min(supplied, demanded)})
+                    for producer, supplied in produced
+                    for consumer, demanded in consumed
+                    if producer != consumer
+                )
 
         return graph
 
+    @staticmethod
+    def _compile(catalog: RecipeCatalog, target_output: MaterialSpec) -> CompiledCatalog:
+        compiled = catalog.compile()
+        if compiled.index is not target_output.index:
+            raise ValueError("Target is defined over different materials than the process nodes.")
+
+        return compiled
+
+    @staticmethod
+    def _minimize_input_problem(compiled: CompiledCatalog,
+                                connected_ids: np.ndarray,
+                                target_output: MaterialSpec,
+                                include_power: bool,
+                                net_power: float = 0) -> LinearProgram:
+        costs = np.ones(len(connected_ids))  # TODO: cost per recipe
+        output_lower_bound = target_output.array
+        if include_power:
+            output_lower_bound = np.append(output_lower_bound, net_power)
+
+        # matrix where each machine is a column and each material is a row. production is positive,
+        # consumption is negative. net power production is the last row, if included
+        material_constraints = compiled.columns(connected_ids, include_power)
+
+        # use -1 factor to convert problem of materials * coeefficients >= outputs to minimization
+        # production >= target
+        return LinearProgram.nonnegative(c=costs,
+                                         A_ub=material_constraints * -1,
+                                         b_ub=output_lower_bound * -1)
+
+    @staticmethod
+    def _maximize_output_problem(compiled: CompiledCatalog,
+                                 connected_ids: np.ndarray,
+                                 available_materials: MaterialSpec,
+                                 target_output: MaterialSpec,
+                                 include_power: bool) -> LinearProgram:
+        # the output sink is the last column
+        # small penalty for using machines, to avoid creating redundant loops, reward for producing
+        # more output
+        costs = np.append(np.full(len(connected_ids), .0001), -1)  # TODO: cost per recipe
+
+        # matrix where each machine is a column and each material is a row. production is positive,
+        # consumption is negative. net power production is the last row, if included
+        # sink column for output, mirror to minimize input requiring source nodes for ingredients
+        output_column = -target_output.array
+        if include_power:
+            output_column = np.append(output_column, 0)
+
+        material_constraints = sparse.hstack([compiled.columns(connected_ids, include_power),
+                                              output_column[:, np.newaxis]], format="csc")
+
+        material_consumption_upper_bound = available_materials.array
+        if include_power:
+            material_consumption_upper_bound = np.append(material_consumption_upper_bound, 0)
+
+        # -1*consumption <= available
+        # byproducts >= 0
+        return LinearProgram.nonnegative(c=costs,
+                                         A_ub=material_constraints * -1,
+                                         b_ub=material_consumption_upper_bound)
+
+    @staticmethod
+    def _solve(compiled: CompiledCatalog,
+               connected_ids: np.ndarray,
+               build: Callable[[np.ndarray], LinearProgram],
+               key: Hashable,
+               backend: LPBackend | None,
+               session: SolveSession | None,
+               integer: bool = False) -> tuple[np.ndarray, LinearProgram, LPResult]:
+        """
+        Solve the problem over the connected nodes, or with a session over every catalog node with
+        the others fixed at 0, so that later solves with other targets or recipes keep the same
+        columns. Integer problems, where the leading columns are integral, skip the session. Returns
+        the node id of each leading column with the problem and result.
+        """
+        if integer:
+            column_ids = connected_ids
+            problem = build(column_ids)
+            integrality = np.zeros(len(problem.c), dtype=np.int8)
+            integrality[:len(column_ids)] = 1
+            problem = replace(problem, integrality=integrality)
+            result = (backend or MilpBackend()).solve(problem)
+        elif session is None:
+            column_ids = connected_ids
+            problem = build(column_ids)
+            result = (backend or HighsBackend()).solve(problem)
+        else:
+            column_ids = np.arange(compiled.stoichiometry.shape[1])
+            problem = build(column_ids)
+            upper = problem.upper.copy()
+            upper[:len(column_ids)][~np.isin(column_ids, connected_ids)] = 0
+            problem = replace(problem, upper=upper)
+            result = session.solve(problem, key)
+
+        if not result.feasible:
+            raise SolutionFailedException(result)
+
+        return column_ids, problem, result
+
+    @staticmethod
+    def _sensitivity(problem: LinearProgram,
+                     result: LPResult,
+                     compiled: CompiledCatalog,
+                     column_ids: np.ndarray,
+                     rhs_sign: float) -> "Sensitivity | None":
+        if result.row_duals is None:
+            return None
+
+        return Sensitivity(problem, result, compiled.index, column_ids, rhs_sign)
+
     @classmethod
-    def minimize_input(cls, target_output: MaterialSpec, process_nodes: list[ProcessNode], include_power=False, name="Result") -> Self:
+    def minimize_input(cls,
+                       target_output: MaterialSpec,
+                       process_nodes: Iterable[ProcessNode],
+                       include_power=False,
+                       name="Result",
+                       catalog: RecipeCatalog | None = None,
+                       backend: LPBackend | None = None,
+                       session: SolveSession | None = None,
+                       net_power: float = 0,
+                       integer: bool = False,
+                       prune: bool = True,
+                       flatten: bool = False) -> "Solution":
         """
         Find the weights on process nodes that produce the desired output with the least input and
-        process cost.
-        
-        # TODO: availability constraints
-        """
-        output = ProcessNode(name="Output", input_materials=target_output, output_materials=target_output, power_production=0, power_consumption=0, machine=ConfigData(display_name="Output", class_name=""))
+        process cost. Nodes are registered in the catalog if given, otherwise in a catalog of just
+        process_nodes. Solved with HiGHS defaults unless a backend is given, or by the session,
+        which reuses its previous solution where it can. With include_power, generators are eligible
+        and the nodes' net power production has to be at least net_power.
 
-        connected_nodes = cls._filter_eligible_nodes(output, process_nodes)
-        costs = [1 for _ in connected_nodes]  # TODO: cost per recipe
-        output_lower_bound = np.array(list(target_output.values()))
+        With integer, weights are whole multiples of each node, whole machines for parsed recipes.
+        Integer problems are solved by a MilpBackend, whose options set the time limit and gap, and
+        the solution may be the best found within the limit, see its statistics. They have no
+        sensitivity.
 
-        material_constraints = np.array(
-            [
-                list((node.output_materials - node.input_materials).values())
-                + ([node.power_consumption - node.power_production] if include_power else [])
-            for node in connected_nodes]).T
+        With prune, nodes that are duplicates, dominated or starved of inputs are left out, and the
+        solution's pruning reports them.
 
-        # use -1 factor to convert problem of materials * coeefficients >= outputs to minimization
-        # production >= target
-        bounds = (0, None)
-        solution = linprog(c=costs,
-                           bounds=bounds,
-                           A_ub=material_constraints * -1, b_ub=output_lower_bound * -1)
+        With flatten, composite nodes, like earlier results, are reported as the primitive recipes
+        they run, see Solution.flattened. Each composite is still a single column in the solve,
+        which keeps the ratios of its recipes.
+        
+        # TODO: availability constraints
+        """
+        catalog = catalog if catalog is not None else RecipeCatalog()
+        available_ids = catalog.register_all(process_nodes)
+        compiled = cls._compile(catalog, target_output)
+        connected_ids = cls._filter_eligible_nodes(target_output, compiled, available_ids,
+                                                   include_power)
+        pruning = None
+        if prune:
+            connected_ids, pruning = cls._prune(target_output, compiled, connected_ids,
+                                                include_power)
 
-        if not solution.success:
-            raise SolutionFailedException(solution)
+        column_ids, problem, result = cls._solve(
+            compiled, connected_ids,
+            lambda column_ids: cls._minimize_input_problem(compiled, column_ids, target_output,
+                                                           include_power, net_power),
+            ("minimize_input", catalog.key, include_power),
+            backend, session, integer,
+        )
 
-        # TODO: remove output node from solution
+        # rows are -target
+        sensitivity = cls._sensitivity(problem, result, compiled, column_ids, -1)
         # TODO: remove source node from solution
-        return cls.from_nodes([node * scale for node, scale in zip(connected_nodes, solution.x) if not isclose(scale, 0) and node in process_nodes], name=name)
+        solution = Solution(catalog, column_ids, result.x, name=name,
+                            statistics=result.statistics,
+                            sensitivity=sensitivity,
+                            pruning=pruning)
+        return solution.flattened() if flatten else solution
 
     @classmethod
-    def maximize_output(cls, available_materials: MaterialSpec, target_output: MaterialSpec, process_nodes: list[ProcessNode], include_power=False, name="Result") -> Self:
+    def maximize_output(cls,
+                        available_materials: MaterialSpec,
+                        target_output: MaterialSpec,
+                        process_nodes: Iterable[ProcessNode],
+                        include_power=False,
+                        name="Result",
+                        catalog: RecipeCatalog | None = None,
+                        backend: LPBackend | None = None,
+                        session: SolveSession | None = None,
+                        integer: bool = False,
+                        prune: bool = True,
+                        flatten: bool = False) -> "Solution":
         """
         Maximize production of output materials where input materials are constrained. If extractors
         are allowed, problem may be unbounded due to unlimited material supply. This may be addressed
         by future work that constrains extractors by total available supply or changes how extractor
-        cost is modelled.
+        cost is modelled. See minimize_input for integer, the amount of output stays continuous, for
+        prune, where available materials count as produced, and for flatten.
         """
-        # sinks node for output, mirror to minimize input requiring source nodes for ingredients
-        output = ProcessNode(name="Output", input_materials=target_output, output_materials=target_output.empty(), power_production=0, power_consumption=0, machine=ConfigData(display_name="Output", class_name=""))
+        catalog = catalog if catalog is not None else RecipeCatalog()
+        available_ids = catalog.register_all(process_nodes)
+        compiled = cls._compile(catalog, target_output)
+        connected_ids = cls._filter_eligible_nodes(target_output, compiled, available_ids,
+                                                   include_power)
+        pruning = None
+        if prune:
+            connected_ids, pruning = cls._prune(target_output, compiled, connected_ids,
+                                                include_power, available_materials)
 
-        visited = cls._filter_eligible_nodes(output, process_nodes)
+        column_ids, problem, result = cls._solve(
+            compiled, connected_ids,
+            lambda column_ids: cls._maximize_output_problem(compiled, column_ids,
+                                                            available_materials, target_output,
+                                                            include_power),
+            # the target is the sink column, so only available materials can change between solves
+            ("maximize_output", catalog.key, include_power, target_output),
+            backend, session, integer,
+        )
 
-        # small penalty for using machines, to avoid creating redundant loops, reward for producing
-        # more output
-        costs = [-1 if node is output else .0001 for node in visited]  # TODO: cost per recipe
+        # rows are the available materials
+        sensitivity = cls._sensitivity(problem, result, compiled, column_ids, 1)
+        # TODO: remove source node from solution
+        solution = Solution(catalog, column_ids, result.x[:len(column_ids)], name=name,
+                            statistics=result.statistics,
+                            sensitivity=sensitivity,
+                            pruning=pruning)
+        return solution.flattened() if flatten else solution
 
-        # matrix where each machine is a column and each material is a row. production is positive,
-        # consumption is negative
-        material_constraints = np.array(
-            [list((node.output_materials - node.input_materials).values()) for node in visited]).T
+    @classmethod
+    def minimize_input_sweep(cls,
+                             targets: MaterialMatrix | Iterable[MaterialSpec],
+                             process_nodes: Iterable[ProcessNode],
+                             include_power=False,
+                             catalog: RecipeCatalog | None = None,
+                             backend: LPBackend | None = None,
+                             workers: int | None = None) -> "SweepResult":
+        """
+        minimize_input for each row of targets, sharing one problem over the nodes eligible for any
+        row. Rows are split into contiguous chunks solved in a pool of workers, defaulting to one
+        per cpu, and each chunk reuses solutions along the sweep, so similar targets should be
+        adjacent. Failed rows are reported by status rather than raised.
+        """
+        if not isinstance(targets, MaterialMatrix):
+            targets = MaterialMatrix.from_specs(targets)
+        catalog = catalog if catalog is not None else RecipeCatalog()
+        available_ids = catalog.register_all(process_nodes)
+        # any material targeted in any row
+        union = MaterialSpec._from_dense(targets.index, np.abs(targets.array).sum(axis=0))
+        compiled = cls._compile(catalog, union)
+        connected_ids = cls._filter_eligible_nodes(union, compiled, available_ids, include_power)
+        connected_ids, _ = cls._prune(union, compiled, connected_ids, include_power)
+        problem = cls._minimize_input_problem(compiled, connected_ids, union, include_power)
 
-        material_consumption_upper_bound = list(available_materials.values())
+        rhs = -targets.array
+        if include_power:
+            rhs = np.column_stack([rhs, np.zeros(len(rhs))])
 
-        # -1*consumption <= available
-        # byproducts >= 0
-        bounds = (0, None)
+        return SweepResult._solve(catalog, connected_ids, problem, rhs, backend, workers)
 
-        solution = linprog(c=costs,
-                           bounds=bounds,
-                           A_ub=material_constraints*-1,
-                           b_ub=material_consumption_upper_bound)
+    @classmethod
+    def maximize_output_sweep(cls,
+                              available_materials: MaterialMatrix | Iterable[MaterialSpec],
+                              target_output: MaterialSpec,
+                              process_nodes: Iterable[ProcessNode],
+                              include_power=False,
+                              catalog: RecipeCatalog | None = None,
+                              backend: LPBackend | None = None,
+                              workers: int | None = None) -> "SweepResult":
+        """
+        maximize_output for each row of available materials, see minimize_input_sweep.
+        """
+        if not isinstance(available_materials, MaterialMatrix):
+            available_materials = MaterialMatrix.from_specs(available_materials)
+        catalog = catalog if catalog is not None else RecipeCatalog()
+        available_ids = catalog.register_all(process_nodes)
+        compiled = cls._compile(catalog, target_output)
+        # any material available in any row
+        supplied = available_materials.sum()
+        connected_ids = cls._filter_eligible_nodes(target_output, compiled, available_ids,
+                                                   include_power)
+        connected_ids, _ = cls._prune(target_output, compiled, connected_ids, include_power,
+                                      supplied)
+        problem = cls._maximize_output_problem(compiled, connected_ids, supplied, target_output,
+                                               include_power)
 
-        if not solution.success:
-            raise SolutionFailedException(solution)
+        rhs = available_materials.array
+        if include_power:
+            rhs = np.column_stack([rhs, np.zeros(len(rhs))])
 
-        # TODO: remove sink node from solution
-        # TODO: remove source node from solution
-        return cls.from_nodes([node * scale for node, scale in zip(visited, solution.x) if not isclose(scale, 0) and node in process_nodes], name=name)
+        return SweepResult._solve(catalog, connected_ids, problem, rhs, backend, workers)
 
     @classmethod
-    def optimize_power(self, target_output: float, available_nodes: Iterable[ProcessNode]) -> Self:
-        ...
+    def optimize_power(cls,
+                       target_output: MaterialSpec,
+                       process_nodes: Iterable[ProcessNode],
+                       net_power: float = 0,
+                       name="Result",
+                       catalog: RecipeCatalog | None = None,
+                       backend: LPBackend | None = None,
+                       session: SolveSession | None = None,
+                       integer: bool = False,
+                       prune: bool = True,
+                       flatten: bool = False) -> "Solution":
+        """
+        Produce target_output with generators covering the plan's own power draw plus net_power,
+        sizing production and generators, with their fuel, in a single solve.
+        """
+        return cls.minimize_input(target_output, process_nodes,
+                                  include_power=True,
+                                  name=name,
+                                  catalog=catalog,
+                                  backend=backend,
+                                  session=session,
+                                  net_power=net_power,
+                                  integer=integer,
+                                  prune=prune,
+                                  flatten=flatten)
 
     @property
-    def graph(self):
+    def graph(self) -> nx.MultiDiGraph:
+        if self._graph is None:
+            nodes = self._nodes if self._nodes is not None else dict(enumerate(self.internal_nodes))
+            self._graph = self._make_graph(nodes)
+
         return self._graph
+
+
+class Sensitivity:
+    """
+    What-if answers from the duals of a single solve. Shadow prices are the change in the objective
+    per unit increase of a material's target for minimize_input, or of its availability for
+    maximize_output, and hold while the material stays within its range. Ranges are found by moving
+    along the active set of the solve, so for degenerate solutions they can be narrower than the
+    true ranges.
+
+    Computed on first use from the solved problem. Pickles as the answers, without the problem.
+    """
+    tolerance: ClassVar[float] = 1e-7
+
+    def __init__(self, problem: LinearProgram, result: LPResult, index: MaterialIndex,
+                 node_ids: np.ndarray, rhs_sign: float):
+        """
+        rhs_sign: sign relating each row's right hand side to the material value it constrains
+        """
+        self._problem = problem
+        self._x = result.x
+        self._row_duals = result.row_duals
+        self.index = index
+        self.node_ids = node_ids
+        self._rhs_sign = rhs_sign
+
+    def __reduce__(self):
+        # the answers rather than the problem, which is much larger than the solution it comes with
+        lower, upper = self._ranges
+        reduced_costs = np.fromiter(self.reduced_costs.values(),
+                                    dtype=np.float64,
+                                    count=len(self.node_ids))
+        return _restore_sensitivity, (self.index, self.node_ids, self._rhs_sign, self._row_duals,
+                                      reduced_costs, lower, upper)
+
+    @cached_property
+    def shadow_prices(self) -> MaterialSpec:
+        prices = self._row_duals[:len(self.index)] * self._rhs_sign
+        return MaterialSpec._from_dense(self.index, prices)
+
+    @property
+    def power_price(self) -> float | None:
+        """
+        Shadow price of the net power row, if power was included. Its value is the required net
+        power surplus for minimize_input, and the external power allowed for maximize_output.
+        """
+        if len(self._row_duals) == len(self.index):
+            return None
+
+        return float(self._row_duals[len(self.index)] * self._rhs_sign)
+
+    @cached_property
+    def reduced_costs(self) -> dict[int, float]:
+        """
+        Reduced cost of each node considered by the solve. Nodes in use are at 0, an unused node has
+        to get that much cheaper before it's used.
+        """
+        reduced_costs = self._problem.reduced_costs(self._row_duals)[:len(self.node_ids)]
+        return dict(zip(self.node_ids.tolist(), reduced_costs.tolist(), strict=True))
+
+    @cached_property
+    def _ranges(self) -> tuple[np.ndarray, np.ndarray]:
+        # interval of each row's right hand side where the duals stay optimal, in problem terms
+        problem, x, tolerance = self._problem, self._x, self.tolerance
+        A, b = problem.A_ub, problem.b_ub
+        slack = np.maximum(b - A @ x, 0)
+        lower = b - slack
+        upper = np.full(len(b), np.inf)
+
+        _, basic, tight = problem.active_set(self._row_duals, tolerance)
+        lower[tight] = upper[tight] = b[tight]
+        if not (basic.any() and tight.any()):
+            return lower, upper
+
+        # change of the basic columns, and of each row, per unit change of each tight row
+        directions = np.linalg.pinv(A[tight][:, basic].toarray())
+        row_changes = A[:, basic] @ directions
+        # tight rows that can't be moved on their own keep a zero width range
+        consistent = np.abs(row_changes[tight] - np.eye(tight.sum())).max(axis=0) <= tolerance
+
+        x_basic = x[basic][:, np.newaxis]
+        below = (x_basic - problem.lower[basic][:, np.newaxis])
+        above = (problem.upper[basic][:, np.newaxis] - x_basic)
+        free_slack = slack[~tight][:, np.newaxis]
+        free_changes = row_changes[~tight]
+
+        def steps(*limits: tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+            # largest step before the first of the limits, each room / rate where rate > 0
+            step = np.full(directions.shape[1], np.inf)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for room, rate in limits:
+                    limit = np.where(rate > tolerance, room / rate, np.inf)
+                    step = np.minimum(step, limit.min(axis=0, initial=np.inf))
+
+            return np.where(consistent, step, 0)
+
+        increase = steps((free_slack, free_changes), (below, -directions), (above, directions))
+        decrease = steps((free_slack, -free_changes), (below, directions), (above, -directions))
+        lower[tight] -= decrease
+        upper[tight] += increase
+        return lower, upper
+
+    def range(self, material: str) -> tuple[float, float]:
+        """
+        Values of the material's target or availability over which its shadow price holds.
+        """
+        lower, upper = self._ranges
+        column = self.index[material]
+        bounds = (lower[column] * self._rhs_sign, upper[column] * self._rhs_sign)
+        return min(bounds), max(bounds)
+
+
+class Solution:
+    """
+    Result of a solve, stored as the scale of each used node in a recipe catalog rather than as
+    copies of the nodes. Scaled nodes, the composite Process and its graph are built on first use.
+    Solutions pickle as the catalog key and the scale vector, so the catalog has to be loaded in the
+    process that receives them.
+    """
+    catalog: RecipeCatalog
+    ids: np.ndarray
+    scales: np.ndarray
+    name: str
+    # None for solutions that weren't solved for, like loaded processes
+    statistics: SolveStatistics | None
+    # None as well when the backend doesn't report duals
+    sensitivity: Sensitivity | None
+    # nodes left out of the solve, None when nodes weren't pruned
+    pruning: PruneReport | None
+
+    def __init__(self,
+                 catalog: RecipeCatalog,
+                 ids: Iterable[int] | np.ndarray,
+                 scales: Iterable[float] | np.ndarray,
+                 name: str = "Result",
+                 statistics: SolveStatistics | None = None,
+                 sensitivity: Sensitivity | None = None,
+                 pruning: PruneReport | None = None):
+        ids = np.asarray(ids, dtype=np.intp)
+        scales = np.asarray(scales, dtype=np.float64)
+        used = scales != 0
+        order = np.argsort(ids[used], kind="stable")
+
+        self.catalog = catalog
+        self.ids = ids[used][order]
+        self.scales = scales[used][order]
+        self.name = name
+        self.statistics = statistics
+        self.sensitivity = sensitivity
+        self.pruning = pruning
+        self.ids.flags.writeable = False
+        self.scales.flags.writeable = False
+
+    @classmethod
+    def from_process(cls, process: ProcessNode) -> Self:
+        """
+        Solution using each internal node of the process once, in a catalog of just those nodes.
+        """
+        catalog = RecipeCatalog(process.internal_nodes)
+        return cls(catalog, np.arange(len(catalog)), np.ones(len(catalog)), name=process.name)
+
+    def __reduce__(self):
+        return _restore_solution, (self.catalog.key, self.ids, self.scales, self.name,
+                                   self.statistics, self.sensitivity, self.pruning)
+
+    def flattened(self) -> Self:
+        """
+        The same plan over the primitive nodes of the used nodes, see RecipeCatalog.primitives, so
+        that composites, like earlier results, are replaced by the recipes they run. Recipes used by
+        several composites are one node with the scales summed. Statistics, sensitivity and pruning
+        still refer to the solved nodes.
+        """
+        if not len(self):
+            return self
+
+        ids, scales = zip(*((ids, counts * scale)
+                            for node_id, scale in self.items()
+                            for ids, counts in [self.catalog.primitives(node_id)]), strict=True)
+        ids, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        return Solution(self.catalog, ids, np.bincount(inverse, np.concatenate(scales)),
+                        name=self.name,
+                        statistics=self.statistics,
+                        sensitivity=self.sensitivity,
+                        pruning=self.pruning)
+
+    def items(self) -> Iterable[tuple[int, float]]:
+        yield from zip(self.ids.tolist(), self.scales.tolist(), strict=True)
+
+    def save(self, file: Path | BinaryIO) -> None:
+        """
+        Write the solution as the content fingerprint and scale of each used node, with its name and
+        statistics. Sensitivity and pruning refer to the solve and aren't saved. See load.
+        """
+        if isinstance(file, Path):
+            # np.savez would add a suffix to the path
+            with file.open("wb") as f:
+                return self.save(f)
+
+        fingerprints = np.frombuffer(b"".join(self.catalog.fingerprints(self.ids)), dtype=np.uint8)
+        statistics = ""
+        if self.statistics is not None:
+            # numpy scalars are written as the python values they hold
+            statistics = json.dumps(asdict(self.statistics), default=lambda value: value.item())
+        np.savez(file,
+                 version=SAVE_VERSION,
+                 fingerprints=fingerprints.reshape(len(self), 16),
+                 scales=self.scales,
+                 name=self.name,
+                 statistics=statistics)
+
+    @classmethod
+    def load(cls, file: Path | BinaryIO, catalog: RecipeCatalog) -> Self:
+        """
+        Solution saved by save, over the matching nodes of catalog. Raises KeyError when nodes have
+        changed or aren't in the catalog, since the plan may no longer hold.
+        """
+        with np.load(file, allow_pickle=False) as stored:
+            if stored["version"] != SAVE_VERSION:
+                raise ValueError(f"Saved solution has version {stored['version']}, "
+                                 f"expected {SAVE_VERSION}.")
+
+            ids = [catalog.find(fingerprint.tobytes()) for fingerprint in stored["fingerprints"]]
+            scales = stored["scales"]
+            name = str(stored["name"])
+            statistics = str(stored["statistics"])
+
+        if (missing := ids.count(None)):
+            raise KeyError(f"{missing} of the {len(ids)} saved nodes are not in the catalog.")
+
+        return cls(catalog, ids, scales, name=name,
+                   statistics=SolveStatistics(**json.loads(statistics)) if statistics else None)
+
+    @cached_property
+    def nodes(self) -> dict[int, ProcessNode]:
+        """
+        Scaled node for each used catalog id.
+        """
+        return {node_id: self.catalog[node_id] * scale for node_id, scale in self.items()}
+
+    @cached_property
+    def process(self) -> Process:
+        return Process.from_nodes(self.nodes, name=self.name)
+
+    @property
+    def graph(self) -> nx.MultiDiGraph:
+        return self.process.graph
+
+    @property
+    def internal_nodes(self) -> frozenset[ProcessNode]:
+        return self.process.internal_nodes
+
+    @property
+    def input_materials(self) -> MaterialSpec:
+        return self.process.input_materials
+
+    @property
+    def output_materials(self) -> MaterialSpec:
+        return self.process.output_materials
+
+    @property
+    def power_production(self) -> float:
+        return self.process.power_production
+
+    @property
+    def power_consumption(self) -> float:
+        return self.process.power_consumption
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Solution):
+            return NotImplemented
+
+        return (
+            self.catalog is other.catalog
+            and np.array_equal(self.ids, other.ids)
+            and np.array_equal(self.scales, other.scales)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.catalog.key, self.ids.tobytes(), self.scales.tobytes()))
+
+    def __repr__(self) -> str:
+        return f"Solution({self.name!r}, {len(self)} nodes)"
+
+
+class SweepResult:
+    """
+    Columnar results of a sweep, with one row per target and one scale column per node id. Rows that
+    failed have NaN scales and objective, and their status says why.
+    """
+    # fewer rows per worker aren't worth starting a pool for
+    min_chunk: ClassVar[int] = 32
+
+    catalog: RecipeCatalog
+    node_ids: np.ndarray
+    scales: np.ndarray
+    objective: np.ndarray
+    status: np.ndarray
+    # rows that reused the previous row's solution
+    warm_start: np.ndarray
+
+    def __init__(self,
+                 catalog: RecipeCatalog,
+                 node_ids: np.ndarray,
+                 scales: np.ndarray,
+                 objective: np.ndarray,
+                 status: np.ndarray,
+                 warm_start: np.ndarray):
+        self.catalog = catalog
+        self.node_ids = node_ids
+        self.scales = scales
+        self.objective = objective
+        self.status = status
+        self.warm_start = warm_start
+
+    @classmethod
+    def _solve(cls,
+               catalog: RecipeCatalog,
+               node_ids: np.ndarray,
+               problem: LinearProgram,
+               rhs: np.ndarray,
+               backend: LPBackend | None,
+               workers: int | None) -> Self:
+        workers = workers or os.cpu_count() or 1
+        chunks = np.array_split(rhs, max(1, min(workers, len(rhs) // cls.min_chunk)))
+        if len(chunks) == 1:
+            results = [_solve_sweep(problem, rhs, backend)]
+        else:
+            with ProcessPoolExecutor(len(chunks)) as executor:
+                results = list(executor.map(_solve_sweep, repeat(problem), chunks, repeat(backend)))
+
+        x, objective, status, warm_start = (np.concatenate(column)
+                                            for column in zip(*results, strict=True))
+        return cls(catalog, node_ids, x[:, :len(node_ids)], objective, status, warm_start)
+
+    @property
+    def success(self) -> np.ndarray:
+        return self.status == 0
+
+    def solution(self, row: int, name: str = "Result") -> Solution:
+        if not self.success[row]:
+            raise ValueError(f"Row {row} failed with status {self.status[row]}.")
+
+        return Solution(self.catalog, self.node_ids, self.scales[row], name=name)
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+
+def _solve_sweep(problem: LinearProgram, rhs: np.ndarray,
+                 backend: LPBackend | None) -> tuple[np.ndarray, ...]:
+    # runs in pool workers, one session per chunk so each row starts from the last
+    session = SolveSession(backend)
+    x = np.full((len(rhs), len(problem.c)), np.nan)
+    objective = np.full(len(rhs), np.nan)
+    status = np.zeros(len(rhs), dtype=np.int8)
+    warm_start = np.zeros(len(rhs), dtype=bool)
+    for row, b_ub in enumerate(rhs):
+        result = session.solve(replace(problem, b_ub=b_ub), "sweep")
+        status[row] = result.statistics.status
+        if result.success:
+            x[row] = result.x
+            objective[row] = result.statistics.objective
+            warm_start[row] = result.statistics.warm_start
+
+    return x, objective, status, warm_start
+
+
+def _restore_sensitivity(index: MaterialIndex,
+                         node_ids: np.ndarray,
+                         rhs_sign: float,
+                         row_duals: np.ndarray,
+                         reduced_costs: np.ndarray,
+                         lower: np.ndarray,
+                         upper: np.ndarray) -> Sensitivity:
+    sensitivity = Sensitivity.__new__(Sensitivity)
+    sensitivity._problem = sensitivity._x = None
+    sensitivity._row_duals = row_duals
+    sensitivity.index = index
+    sensitivity.node_ids = node_ids
+    sensitivity._rhs_sign = rhs_sign
+    # answers of the cached properties
+    sensitivity.reduced_costs = dict(zip(node_ids.tolist(), reduced_costs.tolist(), strict=True))
+    sensitivity._ranges = lower, upper
+    return sensitivity
+
+
+def _restore_solution(catalog_key: str,
+                      ids: np.ndarray,
+                      scales: np.ndarray,
+                      name: str,
+                      statistics: SolveStatistics | None = None,
+                      sensitivity: Sensitivity | None = None,
+                      pruning: PruneReport | None = None) -> Solution:
+    return Solution(RecipeCatalog.get(catalog_key), ids, scales, name=name,
+                    statistics=statistics,
+                    sensitivity=sensitivity,
+                    pruning=pruning)
@@ -16,7 +16,8 @@ def plot_process(process: Process, layout=spring_layout):
     min_scale = min((node.scale for node in process.internal_nodes))
 
     positions = layout(process.graph)
-    categories = [{"name": machine.display_name} for machine in {node.machine for node in process.graph.nodes}]
+    nodes = dict(process.graph.nodes(data="node"))
+    categories = [{"name": machine.display_name} for machine in {node.machine for node in nodes.values()}]
     category_indices = {cat["name"]: i for i, cat in enumerate(categories)}
     config = {
         "legend": {},
@@ -45,20 +46,20 @@ def plot_process(process: Process, layout=spring_layout):
                 },
                 "nodes": [
                     {"name": node.name,
-                     "x": scale_coordinate(positions[node][0]),
-                     "y": scale_coordinate(positions[node][1]),
+                     "x": scale_coordinate(positions[node_id][0]),
+                     "y": scale_coordinate(positions[node_id][1]),
                      "category": category_indices[node.machine.display_name],
                      "value": f"{node.scale:.2f}",
                      "symbolSize": scale_value(node.scale, pre_scale=1/min_scale)
                      }
-                     for node in process.graph.nodes
+                     for node_id, node in nodes.items()
                 ],
                 "categories": categories,
                 # TODO: scale edges and show direction, base on material properties of edge (also TODO)
                 "edges": [
-                    {"source": edge[0].name,
-                     "target": edge[1].name}
-                    for edge in process.graph.edges()
+                    {"source": nodes[source].name,
+                     "target": nodes[target].name}
+                    for source, target in process.graph.edges()
                 ],
                 "itemStyle": {},
                 "emphasis": {
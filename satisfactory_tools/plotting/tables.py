@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 
-from satisfactory_tools.core.process import Process, ProcessNode
+from satisfactory_tools.core.catalog import PruneReport, RecipeCatalog
+from satisfactory_tools.core.material import MaterialMatrix
+from satisfactory_tools.core.process import Process, ProcessNode, Sensitivity
 
 
 @dataclass
@@ -20,20 +22,18 @@ class Table:
 
 
 def production_summary(process: ProcessNode) -> Table:
-
-    net_production = process.scaled_output - process.scaled_input
+    totals = MaterialMatrix.from_specs([process.scaled_output, process.scaled_input])
+    totals = totals.select_materials(totals.used_materials())
+    production, consumption = totals.array
+    net_production = production - consumption
 
     headers = ["Material", "Total Production", "Total Consumption", "Net Production"]
-    rows = []
-    for material in process.scaled_input.keys():
-        if material not in process.scaled_input and material not in process.scaled_output:
-            continue
-        rows.append([
-            material,
-            f"{process.scaled_output[material]:.2f}",
-            f"{process.scaled_input[material]:.2f}",
-            f"{net_production[material]:.2f}",
-        ])
+    rows = [
+        [material, f"{produced:.2f}", f"{consumed:.2f}", f"{net:.2f}"]
+        for material, produced, consumed, net in zip(
+            totals.index.names, production, consumption, net_production, strict=True
+        )
+    ]
 
     table = Table(column_headers=headers, rows=rows)
     return table
@@ -42,7 +42,7 @@ def production_summary(process: ProcessNode) -> Table:
 def machines_summary(process: Process) -> Table:
     headers = ["Recipe", "Count", "Machine Type", "Power Production", "Power Consumption"]
     rows = []
-    for node in process.graph.nodes:
+    for _, node in process.graph.nodes(data="node"):
         rows.append([node.name,
                      f"{node.scale:.2f}",
                      node.machine.display_name,
@@ -51,3 +51,35 @@ def machines_summary(process: Process) -> Table:
                     ])
 
     return Table(column_headers=headers, rows=rows)
+
+
+def sensitivity_summary(sensitivity: Sensitivity) -> Table:
+    """
+    Shadow price and range of each material that constrains the solution.
+    """
+    headers = ["Material", "Shadow Price", "Range Low", "Range High"]
+    rows = []
+    for column, price in zip(*sensitivity.shadow_prices.nonzero(), strict=True):
+        material = sensitivity.index.names[column]
+        low, high = sensitivity.range(material)
+        # adding 0 turns -0 into 0
+        rows.append([material, f"{price:.4f}", f"{low + 0:.2f}", f"{high + 0:.2f}"])
+
+    return Table(column_headers=headers, rows=rows)
+
+
+def pruning_summary(report: PruneReport, catalog: RecipeCatalog) -> Table:
+    """
+    Each recipe left out of the solve, why, and the recipe kept in its place.
+    """
+    headers = ["Recipe", "Pruned As", "Kept Instead"]
+    rows = []
+    for reason, removed in (("duplicate", report.duplicates), ("dominated", report.dominated)):
+        for node_id, kept_id in removed.items():
+            rows.append([catalog[node_id].name, reason, catalog[kept_id].name])
+
+    unproduced = ", ".join(catalog.index.names[column] for column in report.unproduced)
+    for node_id in report.starved:
+        rows.append([catalog[node_id].name, "starved", f"needs one of {unproduced}"])
+
+    return Table(column_headers=headers, rows=rows)
@@ -3,8 +3,19 @@ from pathlib import Path
 from typing import Any, Iterable, Self
 
 from satisfactory_tools.categorized_collection import CategorizedCollection
+from satisfactory_tools.core.cache import SolutionCache, request_fingerprint
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.library import PlanEntry, PlanLibrary
 from satisfactory_tools.core.material import MaterialSpec, MaterialSpecFactory
-from satisfactory_tools.core.process import Process, ProcessNode
+from satisfactory_tools.core.process import (
+    MilpBackend,
+    Process,
+    ProcessNode,
+    RoundingBackend,
+    Solution,
+    SolverOptions,
+    SolveSession,
+)
 from satisfactory_tools.plotting import graph, tables
 from satisfactory_tools.ui.widgets import Picker, Setter
 
@@ -16,16 +27,40 @@ class DependencyException(Exception):
 
 
 class OptimizationResult:
-    def __init__(self, process: Process):
-        self.process = process
+    def __init__(self, solution: Solution, session: SolveSession | None = None,
+                 cache_key: bytes | None = None):
+        self.solution = solution
+        # session the solution was found with, solves run in worker processes so it comes back here
+        self.session = session
+        self.cache_key = cache_key
+
+    @property
+    def process(self) -> Process:
+        return self.solution.process
+
+    @property
+    def machine_count(self) -> float:
+        # counted over recipes, since solved or loaded nodes may be composites or scaled nodes
+        return float(self.solution.flattened().scales.sum())
 
     def save(self, path: Path) -> None:
-        path.write_text(self.process.model_dump_json())
+        """
+        Save the plan over the recipes it runs, see Solution.save, so it loads into any catalog with
+        those recipes.
+        """
+        self.solution.flattened().save(path)
 
     @classmethod
-    def load(cls, path: Path) -> Self:
-        with path.open() as f:
-            return cls(Process(**json.load(f)))
+    def load(cls, path: Path, catalog: RecipeCatalog) -> Self:
+        """
+        Result saved by save, over the recipes of catalog. Results saved as json by earlier versions
+        are loaded with their own nodes.
+        """
+        if path.suffix == ".json":
+            with path.open() as f:
+                return cls(Solution.from_process(Process(**json.load(f))))
+
+        return cls(Solution.load(path, catalog))
 
     def graph(self) -> dict[str, Any]:
         return graph.plot_process(self.process)
@@ -36,6 +71,18 @@ class OptimizationResult:
     def machines_table(self) -> tables.Table:
         return tables.machines_summary(self.process)
 
+    def sensitivity_table(self) -> tables.Table | None:
+        if self.solution.sensitivity is None:
+            return None
+
+        return tables.sensitivity_summary(self.solution.sensitivity)
+
+    def pruning_table(self) -> tables.Table | None:
+        if not self.solution.pruning:
+            return None
+
+        return tables.pruning_summary(self.solution.pruning, self.solution.catalog)
+
     def per_machine_tables(self) -> dict[str, tables.Table]:
         result: dict[str, tables.Table] = {}
         for node in self.process.internal_nodes:
@@ -45,11 +92,27 @@ class OptimizationResult:
 
 
 class Optimizer:
-    def __init__(self, materials: MaterialSpecFactory, available_processes: CategorizedCollection[str, ProcessNode]):
+    def __init__(self, materials: MaterialSpecFactory,
+                 available_processes: CategorizedCollection[str, ProcessNode],
+                 cache: SolutionCache | None = None,
+                 library: PlanLibrary | None = None):
         self.include_power = False
         self.include_input = False
+        # spare power in MW that power balanced plans have to produce, None while the field is empty
+        self.net_power = 0.0
+        # whole machine counts, rounded from the continuous plan unless exact, which is bounded in
+        # time since integer solves can take long on many recipes
+        self.integer = False
+        self.exact = False
+        self.integer_options = SolverOptions(time_limit=10, mip_rel_gap=.01)
 
         self._materials = materials
+        self.catalog = RecipeCatalog(available_processes.values())
+        # reuses the last solution when only rates or recipes change between runs
+        self.session = SolveSession()
+        self.cache = cache if cache is not None else SolutionCache()
+        # saved plans, None when plans can't be saved
+        self.library = library
 
         self.output_setter: Setter = Setter(list(self._materials.keys()))
         self.input_setter: Setter = Setter(list(self._materials.keys()))
@@ -76,6 +139,38 @@ class Optimizer:
     def clear_processes(self) -> None:
         self.process_picker.clear()
 
+    def add_process(self, name: str, process: ProcessNode, tags: set[str]) -> None:
+        """
+        Make a process available to later solves. Processes, and the recipes they're flattened into
+        by solves so that results built from earlier results don't nest, are registered in the
+        catalog here, rather than in the worker running the solve, so that ids agree between
+        processes.
+        """
+        self.catalog.primitives(self.catalog.register(process))
+        self.process_picker.add(name, process, tags)
+
+    def save_result(self, result: OptimizationResult, name: str) -> PlanEntry:
+        if self.library is None:
+            raise DependencyException("No plan library to save to.")
+
+        # TODO: prompt before overwriting
+        return self.library.save(result.solution, name, overwrite=True)
+
+    def saved_plans(self, query: str = "") -> list[PlanEntry]:
+        if self.library is None:
+            return []
+
+        return self.library.search(query)
+
+    def open_plan(self, name: str) -> OptimizationResult:
+        return OptimizationResult(self.library.load(name, self.catalog))
+
+    def use_plan(self, name: str) -> None:
+        """
+        Make a saved plan available to later solves, reading it only now.
+        """
+        self.add_process(name, self.library.node(name, self.catalog), {"saved"})
+
     @property
     def input_materials(self) -> MaterialSpec | None:
         if not self.include_input:
@@ -91,15 +186,89 @@ class Optimizer:
     def processes(self) -> Iterable[ProcessNode]:
         return self.process_picker.selected
 
+    def input_cache_key(self) -> bytes:
+        return self._cache_key("minimize_input", include_power=self.include_power)
+
+    def output_cache_key(self) -> bytes:
+        return self._cache_key("maximize_output",
+                               available_materials=self.input_materials,
+                               include_power=self.include_power)
+
+    def power_cache_key(self) -> bytes:
+        return self._cache_key("optimize_power", include_power=True, net_power=self.net_power or 0)
+
+    def _cache_key(self, objective: str, **request: Any) -> bytes:
+        return request_fingerprint(objective, self.catalog, self.processes, self.output_materials,
+                                   integer=self.integer,
+                                   exact=self.exact,
+                                   flatten=True,
+                                   options=self.integer_options,
+                                   **request)
+
+    @property
+    def backend(self) -> MilpBackend | None:
+        if not self.integer:
+            return None
+
+        backend = MilpBackend if self.exact else RoundingBackend
+        return backend(self.integer_options)
+
+    def _solve_options(self) -> dict[str, Any]:
+        return {"catalog": self.catalog,
+                "backend": self.backend,
+                "session": self.session,
+                "integer": self.integer,
+                "flatten": True}
+
+    def cached(self, cache_key: bytes) -> OptimizationResult | None:
+        solution = self.cache.get(cache_key, self.catalog, self.name)
+        if solution is None:
+            return None
+
+        return OptimizationResult(solution, self.session, cache_key)
+
+    def remember(self, result: OptimizationResult) -> None:
+        """
+        Keep the session and cache the solution of a result, which may have been found in a worker.
+        """
+        self.session = result.session
+        if result.cache_key is not None:
+            self.cache.put(result.cache_key, result.solution)
+
     def optimize_input(self) -> OptimizationResult:
-        return OptimizationResult(Process.minimize_input(self.output_materials, list(self.processes), self.include_power, self.name))
+        cache_key = self.input_cache_key()
+        if (result := self.cached(cache_key)) is not None:
+            return result
+
+        solution = Process.minimize_input(self.output_materials, self.processes, self.include_power,
+                                          self.name, **self._solve_options())
+        result = OptimizationResult(solution, self.session, cache_key)
+        self.remember(result)
+        return result
 
     def optimize_output(self) -> OptimizationResult:
         if not self.input_materials:
             raise DependencyException("Available input required.")
 
-        return OptimizationResult(Process.maximize_output(self.input_materials, self.output_materials, list(self.processes), self.include_power, self.name))
+        cache_key = self.output_cache_key()
+        if (result := self.cached(cache_key)) is not None:
+            return result
 
-    def optimize_power(self) -> Process:
-        raise NotImplementedError()
+        solution = Process.maximize_output(self.input_materials, self.output_materials,
+                                           self.processes, self.include_power, self.name,
+                                           **self._solve_options())
+        result = OptimizationResult(solution, self.session, cache_key)
+        self.remember(result)
+        return result
+
+    def optimize_power(self) -> OptimizationResult:
+        cache_key = self.power_cache_key()
+        if (result := self.cached(cache_key)) is not None:
+            return result
+
+        solution = Process.optimize_power(self.output_materials, self.processes,
+                                          self.net_power or 0, self.name, **self._solve_options())
+        result = OptimizationResult(solution, self.session, cache_key)
+        self.remember(result)
+        return result
 
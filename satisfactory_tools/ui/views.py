@@ -63,14 +63,18 @@ class SetterView(View):
 
 
 class OptimizationResultView(View):
-    def __init__(self, model: OptimizationResult):
+    def __init__(self, model: OptimizationResult,
+                 on_save: Callable[[OptimizationResult, str], None] | None = None):
         self.model = model
+        self.on_save = on_save
 
     def render(self):
         with ui.expansion(self.model.process.name) as container:
             container.classes("w-full")
-            # TODO: on_click with overwrite handling, name input, real placement for button
-            ui.button("save")
+            # TODO: name input, real placement for button
+            if self.on_save is not None:
+                ui.button("save",
+                          on_click=lambda: self.on_save(self.model, self.model.process.name))
 
             ui.echart(self.model.graph()).classes("aspect-video w-full h-full")
 
@@ -83,7 +87,7 @@ class OptimizationResultView(View):
                     ],
                     rows=[
                         [
-                            f"{sum((node.scale for node in self.model.process.internal_nodes)):.2f}",
+                            f"{self.model.machine_count:.2f}",
                             f"{self.model.process.power_production: .2f}",
                             f"{self.model.process.power_consumption: .2f}",
                         ]
@@ -92,6 +96,10 @@ class OptimizationResultView(View):
             ).classes("w-full")
             self._render_table(self.model.material_table()).classes("w-full")
             self._render_table(self.model.machines_table()).classes("w-full")
+            if (sensitivity_table := self.model.sensitivity_table()) is not None:
+                self._render_table(sensitivity_table).classes("w-full")
+            if (pruning_table := self.model.pruning_table()) is not None:
+                self._render_table(pruning_table).classes("w-full")
 
             # TODO: layout for per-machine tables
             with ui.row().classes("w-full"):
@@ -111,24 +119,83 @@ class OptimizationResultView(View):
         return ui.table(columns=columns, rows=rows)
 
 
+class PlanLibraryView(View):
+    """
+    Saved plans matching a search, each can be opened as a result or used as a recipe.
+    """
+    def __init__(self, model: Optimizer, open_plan: Callable[[str], None],
+                 use_plan: Callable[[str], None]):
+        self.model = model
+        self.open_plan = open_plan
+        self.use_plan = use_plan
+        self.query = ""
+        self.plans_element = None
+
+    def render(self):
+        searchbox = ui.input(placeholder="Search...",
+                             on_change=lambda e: self._search(e.value or ""))
+        searchbox.props("clearable")
+        with ui.scroll_area().classes("max-h-80 max-w-96"):
+            self.plans_element = ui.column()
+            self._render_plans()
+
+    def update(self):
+        if self.plans_element is not None:
+            self._render_plans()
+
+    def _search(self, query: str) -> None:
+        self.query = query
+        self._render_plans()
+
+    def _render_plans(self) -> None:
+        self.plans_element.clear()
+        with self.plans_element:
+            for entry in self.model.saved_plans(self.query):
+                with ui.row().classes("items-center"):
+                    outputs = (f"{name}: {rate:.2f}" for name, rate in entry.outputs.items())
+                    ui.label(entry.name).tooltip(", ".join(outputs))
+                    ui.button("Open", on_click=partial(self.open_plan, entry.name))
+                    ui.button("Use", on_click=partial(self.use_plan, entry.name))
+
+
 class OptimizerView(View):
-    # TODO: load
     def __init__(self, model: Optimizer, output_element: Element):
         self.model = model
         self.output_element = output_element
         self.output_view = SetterView(self.model.output_setter)
         self.input_view = SetterView(self.model.input_setter)
         self.process_view = PickerView(self.model.process_picker)
+        self.library_view = PlanLibraryView(self.model, self.open_plan, self.use_plan)
+
+    def save_result(self, result: OptimizationResult, name: str) -> None:
+        self.model.save_result(result, name)
+        self.library_view.update()
+        ui.notify(f"Saved {name}")
+
+    def open_plan(self, name: str) -> None:
+        # plans are only read when opened
+        with self.output_element:
+            OptimizationResultView(self.model.open_plan(name), self.save_result).render()
+
+    def use_plan(self, name: str) -> None:
+        self.model.use_plan(name)
+        # FIXME: this is re-drawing outside of context?
+        self.process_view.update()
 
     def render(self):
-        async def optimize_and_render(callback: Callable[[], OptimizationResult]) -> None:
-            result = await run.cpu_bound(callback)
+        async def optimize_and_render(callback: Callable[[], OptimizationResult],
+                                      cache_key: Callable[[], bytes]) -> None:
+            # repeated requests are answered here, rather than after starting a worker
+            result = self.model.cached(cache_key())
+            if result is None:
+                result = await run.cpu_bound(callback)
+                self.model.remember(result)
 
             # TODO: prompt on duplicate, delete existing process. We can await a button event
             # TODO: in prompt
-            self.model.process_picker.add(
+            self.model.add_process(
                 self.model.name,
-                result,
+                result.process,
                 {
                     "custom",
                 },
@@ -146,7 +213,8 @@ class OptimizerView(View):
                 self.model.name += " 1"
 
             with self.output_element:
-                OptimizationResultView(result).render()
+                on_save = self.save_result if self.model.library is not None else None
+                OptimizationResultView(result, on_save).render()
 
         with ui.expansion("Target Output") as ex:
             ex.classes("w-full")
@@ -161,15 +229,40 @@ class OptimizerView(View):
             ex.classes("w-full")
             self.process_view.render()
 
+        if self.model.library is not None:
+            with ui.expansion("Saved Plans") as ex:
+                ex.classes("w-full")
+                self.library_view.render()
+
+        with ui.expansion("Power") as ex:
+            ex.classes("w-full")
+            with ui.row():
+                ui.switch("Balance").bind_value(self.model.__dict__, "include_power")
+                ui.number("Spare MW", min=0).bind_value(self.model.__dict__, "net_power")
+
+        with ui.row():
+            ui.switch("Whole machines").bind_value(self.model.__dict__, "integer")
+            exact = ui.switch("Exact").bind_value(self.model.__dict__, "exact")
+            exact.bind_visibility_from(self.model.__dict__, "integer")
         ui.input("name").bind_value(self.model.__dict__, "name")
         with ui.row():
             # TODO: disable button while optimizing--optimization is generally fast enough that
             # TODO: this isn't all that important
             ui.button(
                 "Maximize output",
-                on_click=partial(optimize_and_render, self.model.optimize_output),
+                on_click=partial(optimize_and_render,
+                                 self.model.optimize_output,
+                                 self.model.output_cache_key),
             )
             ui.button(
                 "Minimize input",
-                on_click=partial(optimize_and_render, self.model.optimize_input),
+                on_click=partial(optimize_and_render,
+                                 self.model.optimize_input,
+                                 self.model.input_cache_key),
+            )
+            ui.button(
+                "Power plan",
+                on_click=partial(optimize_and_render,
+                                 self.model.optimize_power,
+                                 self.model.power_cache_key),
             )
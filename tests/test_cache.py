@@ -0,0 +1,100 @@
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+
+from satisfactory_tools.config.standardization import ConfigData
+from satisfactory_tools.core.cache import SolutionCache, request_fingerprint
+from satisfactory_tools.core.catalog import RecipeCatalog, node_fingerprint
+from satisfactory_tools.core.process import Process, ProcessNode, SolverOptions
+from tests import Materials
+
+CONFIG = ConfigData(display_name="test", class_name="test")
+
+
+def nodes():
+    source = ProcessNode(name="source", input_materials=Materials(), output_materials=Materials(a=1), power_production=0, power_consumption=0, machine=CONFIG)
+    first = ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=0, machine=CONFIG)
+    return [source, first]
+
+
+def test_node_fingerprint():
+    source, first = nodes()
+
+    assert node_fingerprint(first) == node_fingerprint(nodes()[1])
+    assert node_fingerprint(first) != node_fingerprint(first * 2)
+    assert node_fingerprint(Process.from_nodes([source, first])) == node_fingerprint(Process.from_nodes([first, source]))
+
+    # the same in other processes
+    script = "from tests.test_cache import nodes; from satisfactory_tools.core.catalog import node_fingerprint; print(node_fingerprint(nodes()[1]).hex())"
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == node_fingerprint(first).hex()
+
+
+def test_request_fingerprint():
+    source, first = nodes()
+    catalog = RecipeCatalog()
+    key = request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1))
+
+    assert key == request_fingerprint("minimize_input", catalog, [first, source], Materials(b=1))
+    assert key == request_fingerprint("minimize_input", RecipeCatalog(), nodes(), Materials(b=1))
+    assert key != request_fingerprint("maximize_output", catalog, [source, first], Materials(b=1))
+    assert key != request_fingerprint("minimize_input", catalog, [source, first], Materials(b=2))
+    assert key != request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), include_power=True)
+    assert key != request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), Materials(a=1))
+    assert key != request_fingerprint("minimize_input", catalog, [source], Materials(b=1))
+    # a changed recipe
+    assert key != request_fingerprint("minimize_input", catalog, [source, first * 2], Materials(b=1))
+    # integer solves stopped at another limit or gap may return other solutions
+    integer = request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), integer=True)
+    assert integer == request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), integer=True, options=SolverOptions())
+    assert integer != request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), integer=True, options=SolverOptions(time_limit=10))
+    assert integer != request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), integer=True, options=SolverOptions(mip_rel_gap=.01))
+    assert key == request_fingerprint("minimize_input", catalog, [source, first], Materials(b=1), options=SolverOptions(time_limit=10))
+
+
+def test_cache_memory():
+    catalog = RecipeCatalog(nodes())
+    cache = SolutionCache(maxsize=2)
+    keys = []
+    for amount in range(1, 4):
+        key = request_fingerprint("minimize_input", catalog, catalog, Materials(b=amount))
+        cache.put(key, Process.minimize_input(Materials(b=amount), catalog, catalog=catalog))
+        keys.append(key)
+
+    # least recently used is evicted
+    assert len(cache) == 2
+    assert cache.get(keys[0], catalog) is None
+    hit = cache.get(keys[2], catalog, name="Again")
+    assert hit.name == "Again"
+    assert hit.output_materials["b"] == 3
+    assert hit.statistics is not None
+
+
+def test_cache_directory(tmp_path):
+    catalog = RecipeCatalog(nodes())
+    key = request_fingerprint("minimize_input", catalog, catalog, Materials(b=2))
+    solution = Process.minimize_input(Materials(b=2), catalog, catalog=catalog)
+    SolutionCache(directory=tmp_path).put(key, solution)
+
+    # a new cache and catalog, with the nodes registered in a different order
+    restarted = RecipeCatalog(reversed(nodes()))
+    cached = SolutionCache(directory=tmp_path).get(key, restarted)
+    assert cached.catalog is restarted
+    assert cached.process == solution.process
+
+    # nodes missing from the catalog
+    assert SolutionCache(directory=tmp_path).get(key, RecipeCatalog(nodes()[:1])) is None
+
+
+def test_cache_pickles_empty(tmp_path):
+    catalog = RecipeCatalog(nodes())
+    cache = SolutionCache(maxsize=3, directory=tmp_path)
+    cache.put(b"key", Process.minimize_input(Materials(b=2), catalog, catalog=catalog))
+    copy = pickle.loads(pickle.dumps(cache))
+
+    assert copy.maxsize == 3
+    assert copy.directory is None
+    assert len(copy) == 0
+    assert np.array_equal(cache.get(b"key", catalog).scales, [4, 2])
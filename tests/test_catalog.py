@@ -0,0 +1,124 @@
+import numpy as np
+
+from satisfactory_tools.config.standardization import ConfigData
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.process import ProcessNode
+from tests import MATERIAL_NAMES, Materials
+
+CONFIG = ConfigData(display_name="test", class_name="test")
+
+FIRST = ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=0, machine=CONFIG)
+SECOND = ProcessNode(name="second", input_materials=Materials(b=2), output_materials=Materials(c=1), power_production=0, power_consumption=0, machine=CONFIG)
+
+
+def test_catalog_ids():
+    catalog = RecipeCatalog([FIRST, SECOND])
+
+    assert catalog.id(FIRST) == 0
+    assert catalog.id(SECOND) == 1
+    assert catalog[1] is SECOND
+    assert catalog.nodes([1, 0]) == [SECOND, FIRST]
+    assert len(catalog) == 2
+
+
+def test_catalog_register_is_stable():
+    catalog = RecipeCatalog([FIRST])
+
+    assert catalog.register_all([SECOND, FIRST]) == [1, 0]
+    assert catalog.register(FIRST * 2) == 2
+    assert FIRST * 2 in catalog
+
+
+def test_compiled_catalog():
+    catalog = RecipeCatalog([FIRST, SECOND * 2])
+    compiled = catalog.compile()
+
+    assert compiled.stoichiometry.shape == (len(MATERIAL_NAMES), 2)
+    assert compiled.stoichiometry[:, [1]].toarray().ravel().tolist() == (Materials(c=2) - Materials(b=4)).array.tolist()
+    assert catalog.compile() is compiled
+
+
+def test_compiled_catalog_rebuilt_on_register():
+    catalog = RecipeCatalog([FIRST])
+    compiled = catalog.compile()
+
+    catalog.register(FIRST)
+    assert catalog.compile() is compiled
+
+    catalog.register(SECOND)
+    assert catalog.compile().stoichiometry.shape == (len(MATERIAL_NAMES), 2)
+
+
+def test_compiled_catalog_kept_across_pickles():
+    catalog = RecipeCatalog([FIRST])
+    compiled = catalog.compile()
+    key = catalog.key
+    del catalog
+
+    # as in a worker, where each request unpickles a fresh copy of the catalog
+    restored = RecipeCatalog([FIRST], key=key)
+    assert restored.compile() is compiled
+    restored.register(SECOND)
+    assert restored.compile() is not compiled
+
+
+def test_compiled_catalog_power():
+    powered = ProcessNode(name="powered", input_materials=Materials(a=1), output_materials=Materials(b=1), power_production=0, power_consumption=4, machine=CONFIG)
+    compiled = RecipeCatalog([FIRST, powered]).compile()
+
+    columns = compiled.columns([1], include_power=True)
+
+    assert columns.shape == (len(MATERIAL_NAMES) + 1, 1)
+    assert columns[-1, 0] == -4
+
+
+def test_compiled_catalog_suppliers():
+    unrelated = ProcessNode(name="unrelated", input_materials=Materials(d=1), output_materials=Materials(e=1), power_production=0, power_consumption=0, machine=CONFIG)
+    source = ProcessNode(name="source", input_materials=Materials(), output_materials=Materials(a=1), power_production=0, power_consumption=0, machine=CONFIG)
+    compiled = RecipeCatalog([FIRST, SECOND, unrelated, source]).compile()
+
+    available = np.ones(4, dtype=bool)
+
+    assert compiled.suppliers(Materials(c=1).array != 0, available).tolist() == [0, 1, 3]
+    assert compiled.suppliers(Materials(b=1).array != 0, available).tolist() == [0, 3]
+
+    available[0] = False
+    assert compiled.suppliers(Materials(c=1).array != 0, available).tolist() == [1]
+
+
+def test_compiled_catalog_prune():
+    # alternates for b: a copy of first, one needing more a, one needing less a but more power, and
+    # one needing j, which nothing makes
+    copy = FIRST.model_copy(update={"name": "copy"})
+    wasteful = FIRST._replace(name="wasteful", input_materials=Materials(a=3))
+    hungry = FIRST._replace(name="hungry", input_materials=Materials(a=1), power_consumption=5)
+    starved = FIRST._replace(name="starved", input_materials=Materials(j=1))
+    mine = ProcessNode(name="mine", input_materials=Materials(), output_materials=Materials(a=1), power_production=0, power_consumption=0, machine=CONFIG)
+    catalog = RecipeCatalog([FIRST, SECOND, copy, wasteful, hungry, starved, mine])
+    compiled = catalog.compile()
+
+    kept, report = compiled.prune(np.arange(len(catalog)))
+    assert kept.tolist() == [0, 1, 4, 6]
+    assert report.duplicates == {2: 0}
+    assert report.dominated == {3: 0}
+    assert report.starved == [5]
+    assert report.unproduced == [MATERIAL_NAMES.index("j")]
+    assert report.removed == [2, 3, 5] and len(report) == 3
+
+    # supplied materials don't starve nodes
+    supplied = Materials(j=1).array > 0
+    kept, report = compiled.prune(np.arange(len(catalog)), supplied)
+    assert kept.tolist() == [0, 1, 4, 5, 6]
+
+
+def test_catalog_primitives():
+    inner = ProcessNode.from_nodes(FIRST * 2, SECOND)
+    outer = ProcessNode.from_nodes(inner * 3, SECOND * .5, name="outer")
+    catalog = RecipeCatalog([outer, FIRST])
+
+    ids, counts = catalog.primitives(0)
+    assert catalog.nodes(ids) == [FIRST, SECOND]
+    assert counts.tolist() == [6, 3.5]
+    # the inner composite and the primitives are registered once
+    assert len(catalog) == 4
+    assert catalog.primitives(1)[1].tolist() == [1]
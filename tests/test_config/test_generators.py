@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from satisfactory_tools.config.machines import BUILDABLE_KEYS, EXTRACTOR_KEYS, GENERATOR_KEYS
+from satisfactory_tools.config.materials import RESOURCE_KEYS
+from satisfactory_tools.config.parser import ConfigParser
+from satisfactory_tools.config.recipes import RECIPE_KEY
+
+
+def native_class(key: str, classes: list[dict]) -> dict:
+    return {"NativeClass": f"/Script/CoreUObject.Class'/Script/FactoryGame.{key}'", "Classes": classes}
+
+
+def material(class_name: str, display_name: str, form: str = "RF_SOLID", energy: float = 0) -> dict:
+    return {"ClassName": class_name, "mDisplayName": display_name, "mForm": form, "mEnergyValue": str(energy)}
+
+
+def generator(class_name: str, display_name: str, power: float, fuels: list[dict], ratio: float = 0) -> dict:
+    return {
+        "ClassName": class_name,
+        "mDisplayName": display_name,
+        "mPowerConsumption": "0",
+        "mPowerProduction": str(power),
+        "mFuelLoadAmount": "1",
+        "mSupplementalLoadAmount": "0",
+        "mSupplementalToPowerRatio": str(ratio),
+        "mFuel": fuels,
+    }
+
+
+def fuel(class_name: str, supplemental: str = "", byproduct: str = "", amount: str = "") -> dict:
+    return {"mFuelClass": class_name, "mSupplementalResourceClass": supplemental, "mByproduct": byproduct, "mByproductAmount": amount}
+
+
+@pytest.fixture
+def docs(tmp_path):
+    config = {key: [] for key in [*RESOURCE_KEYS, RECIPE_KEY, *BUILDABLE_KEYS, *EXTRACTOR_KEYS, *GENERATOR_KEYS]}
+    config["FGItemDescriptor"] = [
+        material("Desc_Coal_C", "Coal", energy=300),
+        material("Desc_Rod_C", "Uranium Fuel Rod", energy=750000),
+        material("Desc_Waste_C", "Uranium Waste"),
+    ]
+    config["FGResourceDescriptor"] = [
+        material("Desc_Water_C", "Water", form="RF_LIQUID"),
+        material("Desc_Fuel_C", "Fuel", form="RF_LIQUID", energy=.75),
+    ]
+    config["FGBuildableGeneratorFuel"] = [
+        generator("Build_Coal_C", "Coal Generator", 75, [fuel("Desc_Coal_C", supplemental="Desc_Water_C")], ratio=10),
+        generator("Build_Fuel_C", "Fuel Generator", 150, [fuel("Desc_Fuel_C"), fuel("FGItemDescriptorBiomass")]),
+    ]
+    config["FGBuildableGeneratorNuclear"] = [
+        generator("Build_Nuclear_C", "Nuclear Power Plant", 2500, [fuel("Desc_Rod_C", supplemental="Desc_Water_C", byproduct="Desc_Waste_C", amount="50")], ratio=10),
+    ]
+
+    path = tmp_path / "Docs.json"
+    path.write_text(json.dumps([native_class(key, classes) for key, classes in config.items()]), encoding="utf-16")
+    return path
+
+
+def test_generator_nodes(docs):
+    recipes = ConfigParser(docs).parse_config().recipes
+
+    # fuel classes aren't parsed materials
+    assert sorted(recipes.keys()) == ["Coal Generator: Coal", "Fuel Generator: Fuel", "Nuclear Power Plant: Uranium Fuel Rod"]
+
+    coal = recipes["Coal Generator: Coal"]
+    assert coal.power_production == 75
+    assert coal.input_materials["Coal"] == pytest.approx(15)
+    assert coal.input_materials["Water"] == pytest.approx(45)
+    assert "Coal Generator: Coal" in recipes.tags["generator"]
+
+    # 150 MW is 9000 MJ per minute, 12 m3 of fuel at 750 MJ per m3
+    assert recipes["Fuel Generator: Fuel"].input_materials["Fuel"] == pytest.approx(12)
+
+    nuclear = recipes["Nuclear Power Plant: Uranium Fuel Rod"]
+    assert nuclear.input_materials["Uranium Fuel Rod"] == pytest.approx(.2)
+    assert nuclear.output_materials["Uranium Waste"] == pytest.approx(10)
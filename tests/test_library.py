@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from satisfactory_tools.config.standardization import ConfigData
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.core.library import PlanLibrary
+from satisfactory_tools.core.process import Process, ProcessNode
+from tests import Materials
+
+CONFIG = ConfigData(display_name="test", class_name="test")
+
+
+def nodes():
+    source = ProcessNode(name="source", input_materials=Materials(), output_materials=Materials(a=1), power_production=0, power_consumption=2, machine=CONFIG)
+    first = ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=3, machine=CONFIG)
+    second = ProcessNode(name="second", input_materials=Materials(a=1), output_materials=Materials(c=1), power_production=0, power_consumption=1, machine=CONFIG)
+    return [source, first, second]
+
+
+def test_library(tmp_path):
+    catalog = RecipeCatalog(nodes())
+    library = PlanLibrary(tmp_path)
+    plan = Process.minimize_input(Materials(b=2), catalog, catalog=catalog, name="b plan")
+    entry = library.save(plan)
+    library.save(Process.minimize_input(Materials(c=1), catalog, catalog=catalog), name="c plan")
+
+    assert entry.outputs == {"b": 2}
+    assert entry.machines == 6
+    assert entry.power_consumption == 14
+    with pytest.raises(ValueError):
+        library.save(plan)
+
+    # a new library only reads the index
+    reopened = PlanLibrary(tmp_path)
+    assert [entry.name for entry in reopened.search()] == ["b plan", "c plan"]
+    assert [entry.name for entry in reopened.search("C")] == ["c plan"]
+    assert reopened.entries["b plan"] == entry
+
+    loaded = reopened.load("b plan", RecipeCatalog(nodes()[::-1]))
+    assert loaded.name == "b plan"
+    assert np.allclose(sorted(loaded.scales), [2, 4])
+    assert reopened.node("b plan", catalog).output_materials == Materials(b=2)
+
+    reopened.save(Process.minimize_input(Materials(b=1), catalog, catalog=catalog), name="b plan", overwrite=True)
+    reopened.remove("c plan")
+    assert PlanLibrary(tmp_path).search() == [reopened.entries["b plan"]]
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+
+def test_library_index_version(tmp_path):
+    catalog = RecipeCatalog(nodes())
+    PlanLibrary(tmp_path).save(Process.minimize_input(Materials(b=2), catalog, catalog=catalog))
+    index = tmp_path / PlanLibrary.index_name
+    index.write_text(index.read_text().replace('"version": 1', '"version": 0'))
+
+    library = PlanLibrary(tmp_path)
+    with pytest.raises(ValueError):
+        library.save(Process.minimize_input(Materials(c=1), catalog, catalog=catalog), name="c plan")
+    assert '"version": 0' in index.read_text()
@@ -1,8 +1,18 @@
+import pickle
 from math import isclose
 
+import numpy as np
 import pytest
+from pydantic import BaseModel
 
-from tests import Materials
+from satisfactory_tools.core.material import (
+    SPARSE_MERGE_SIZE,
+    MaterialIndex,
+    MaterialMatrix,
+    MaterialSpec,
+    MaterialSpecFactory,
+)
+from tests import MATERIAL_NAMES, Materials
 
 
 def test_materials():
@@ -55,6 +65,15 @@ def test_materials_floordiv_by_zero():
         numerator / denominator
 
 
+def test_materials_div_by_zero_scalar():
+    mats = Materials(a=1, b=2)
+
+    with pytest.raises(ZeroDivisionError):
+        mats / 0
+    with pytest.raises(ZeroDivisionError):
+        mats // 0
+
+
 def test_materials_truediv():
     mats = Materials(a=1, b=2, c=3, d=4, e=5, f=6)
     mats = mats / 2
@@ -159,3 +178,138 @@ def test_materials_in():
     assert "f" in mats
     assert "g" not in mats
     assert "h" not in mats
+
+
+def test_materials_hash_and_equality():
+    first = Materials(a=1, b=0.0)
+    second = Materials(a=1, b=-0.0)
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != Materials(a=2)
+
+
+def test_materials_different_index():
+    other = MaterialSpecFactory(x=0, y=0)
+
+    with pytest.raises(ValueError):
+        Materials(a=1) + other(x=1)
+
+
+def test_materials_unknown_material():
+    with pytest.raises(KeyError):
+        Materials(z=1)
+
+
+def test_materials_pydantic_round_trip():
+    class Model(BaseModel):
+        materials: MaterialSpec
+
+    model = Model(materials=Materials(a=1, c=3))
+    loaded = Model.model_validate_json(model.model_dump_json())
+
+    assert loaded.materials == model.materials
+
+
+def test_materials_sparse():
+    first = Materials(a=1)
+    second = Materials(b=2)
+
+    assert first.is_sparse
+    assert (first * 3).is_sparse
+    assert (first > 2).is_sparse
+    # small indexes are combined densely
+    assert first + second == Materials(a=1, b=2)
+    assert "b" in first + second
+    assert "c" not in first + second
+
+
+def test_materials_sparse_merge():
+    many = MaterialIndex([f"m{i}" for i in range(SPARSE_MERGE_SIZE)])
+    first = MaterialSpec.from_sparse(many, [1, 5], [1., 2.])
+    second = MaterialSpec.from_sparse(many, [5, 9], [-2., 3.])
+
+    assert (first + second).is_sparse
+    assert (first + second).nonzero()[0].tolist() == [1, 9]
+    assert (first & second).nonzero()[0].tolist() == [5]
+    assert (first - second).array.tolist() == (first.array - second.array).tolist()
+
+
+def test_materials_sparse_densifies():
+    mats = Materials(a=1) + Materials(b=2) + Materials(c=3) + Materials(d=4)
+
+    assert not mats.is_sparse
+    assert mats == Materials(a=1, b=2, c=3, d=4)
+    assert hash(mats) == hash(MaterialSpec.from_sparse(mats.index, *mats.nonzero()))
+
+
+def test_materials_sparse_matches_dense():
+    sparse = Materials(a=1, c=-3)
+    dense = MaterialSpec(sparse.index, sparse.array)
+    other = Materials(c=7, d=4)
+
+    assert sparse.is_sparse
+    assert not dense.is_sparse
+    assert sparse == dense
+    assert (sparse - other).array.tolist() == (dense - other).array.tolist()
+    assert (sparse | other).array.tolist() == (dense | other).array.tolist()
+    assert (sparse & other).array.tolist() == (dense & other).array.tolist()
+    assert (sparse < 0).array.tolist() == (dense < 0).array.tolist()
+
+
+def test_material_matrix():
+    matrix = MaterialMatrix.from_specs([Materials(a=1, b=2), Materials(b=3, c=4)])
+
+    assert matrix.shape == (2, len(MATERIAL_NAMES))
+    assert matrix[1] == Materials(b=3, c=4)
+    assert matrix.sum() == Materials(a=1, b=5, c=4)
+    assert matrix.sum([2, 1]) == Materials(a=2, b=7, c=4)
+    assert matrix.scale([2, 1]).sum() == Materials(a=2, b=7, c=4)
+    assert matrix.used_materials() == ["a", "b", "c"]
+
+
+def test_material_matrix_selection():
+    matrix = MaterialMatrix.from_specs([Materials(a=1, b=2), Materials(b=3, c=4), Materials(d=1)])
+
+    rows = matrix.select_rows([0, 2])
+    columns = matrix.select_materials(["b", "d"])
+
+    assert list(rows) == [Materials(a=1, b=2), Materials(d=1)]
+    assert columns.array.tolist() == [[2, 0], [3, 0], [0, 1]]
+    assert matrix.column("b").tolist() == [2, 3, 0]
+
+
+def test_material_matrix_net_production():
+    production = MaterialMatrix.from_specs([Materials(c=2), Materials(d=1)])
+    consumption = MaterialMatrix.from_specs([Materials(a=1), Materials(c=1)])
+
+    assert production.net_production(consumption, [1, 2]) == Materials(a=-1, c=0, d=2)
+
+
+def test_materials_weighted_sum():
+    specs = [Materials(c=2), Materials(d=1), Materials(a=1), Materials(c=1)]
+    total = MaterialSpec.weighted_sum(specs, np.array([1, 2, -1, -2]))
+
+    assert total == Materials(a=-1, d=2)
+    assert total.is_sparse
+
+    with pytest.raises(ValueError):
+        MaterialSpec.weighted_sum([], np.array([]))
+
+
+def test_materials_intern():
+    first = Materials(a=1, b=2).intern()
+    second = Materials(a=1, b=2).intern()
+
+    assert first is second
+    assert Materials(a=1, b=3).intern() is not first
+
+
+def test_materials_pickle():
+    mats = Materials(a=1, b=2)
+    hash(mats)
+
+    loaded = pickle.loads(pickle.dumps(mats))
+
+    assert loaded._hash is None
+    assert loaded == mats
@@ -1,6 +1,7 @@
 import pytest
 
 import satisfactory_tools.plotting.graph as graph_module
+import satisfactory_tools.plotting.tables as tables_module
 from satisfactory_tools.config.standardization import ConfigData
 from satisfactory_tools.core.process import Process, ProcessNode
 from tests import Materials
@@ -28,3 +29,27 @@ def process():
 def test_graph(process):
 
     graph_module.plot_process(process)
+
+
+def test_production_summary(process):
+    table = tables_module.production_summary(process)
+
+    assert table.rows == [["a", "2.00", "0.00", "2.00"], ["b", "4.00", "0.00", "4.00"]]
+
+
+def test_sensitivity_summary(process):
+    nodes = {node.name: node for node in process.internal_nodes}
+    solution = Process.minimize_input(Materials(c=4, d=16), [nodes["source"], nodes["first"], nodes["second"]])
+    table = tables_module.sensitivity_summary(solution.sensitivity)
+
+    # intermediates have a price too, from their net production rows
+    assert table.rows == [["b", "0.2500", "0.00", "inf"], ["d", "0.7500", "8.00", "inf"], ["f", "0.2857", "0.00", "inf"]]
+
+
+def test_pruning_summary(process):
+    nodes = {node.name: node for node in process.internal_nodes}
+    copy = nodes["first"].model_copy(update={"name": "copy"})
+    solution = Process.minimize_input(Materials(c=4, d=8), [nodes["source"], nodes["first"], nodes["second"], copy])
+    table = tables_module.pruning_summary(solution.pruning, solution.catalog)
+
+    assert table.rows == [["copy", "duplicate", "first"]]
@@ -1,5 +1,8 @@
+import pickle
 from math import isclose
 
+import pytest
+
 import satisfactory_tools.core.process as module
 from satisfactory_tools.config.standardization import ConfigData
 from tests import Materials
@@ -29,6 +32,22 @@ def test_process_node_shift():
     assert first >> second >> 2*outputs == 2*inputs
 
 
+def test_process_node_chain():
+    nodes = [module.ProcessNode(name=str(i), input_materials=Materials(a=i), output_materials=Materials(b=i + 1), power_production=0, power_consumption=1, machine=CONFIG)
+             for i in range(10)]
+
+    chain = nodes[0] >> nodes[1] >> (nodes[2] << nodes[3])
+    for node in nodes[4:]:
+        chain = chain >> node
+
+    assert type(chain) is module.ProcessChain
+    assert chain == module.ProcessNode.from_nodes(*nodes)
+    assert type(chain) is module.ProcessNode
+    assert chain.internal_nodes == frozenset(nodes)
+    assert chain.power_consumption == 10
+    assert Materials(a=45) >> chain == Materials(b=55)
+
+
 def test_simple_optimization_minimize_input():
     inputs = Materials(a=2, b=4)
     midputs = Materials(e=4, f=7)
@@ -40,10 +59,10 @@ def test_simple_optimization_minimize_input():
 
     optimal = module.Process.minimize_input(4*outputs, [source, first, second], include_power=False)
 
-    assert len(optimal._graph.nodes()) == 3
+    assert len(optimal.graph.nodes()) == 3
     assert optimal.input_materials == Materials.empty()
     assert optimal.output_materials == 4*outputs
-    assert all(isclose(node.scale, 4) for node in optimal._graph.nodes())
+    assert all(isclose(node.scale, 4) for _, node in optimal.graph.nodes(data="node"))
 
 
 def test_optimization_extraneous_recipes_minimize_input():
@@ -61,10 +80,10 @@ def test_optimization_extraneous_recipes_minimize_input():
 
     optimal = module.Process.minimize_input(4*outputs, [source, first, second, third, fourth], include_power=False)
 
-    assert len(optimal._graph.nodes()) == 3
+    assert len(optimal.graph.nodes()) == 3
     assert optimal.input_materials == Materials.empty()
     assert optimal.output_materials == 4*outputs
-    assert all(isclose(node.scale, 4) for node in optimal._graph.nodes())
+    assert all(isclose(node.scale, 4) for _, node in optimal.graph.nodes(data="node"))
 
 
 def test_optimization_loop_available_minimize_input():
@@ -83,10 +102,10 @@ def test_optimization_loop_available_minimize_input():
 
     optimal = module.Process.minimize_input(4*outputs, [source, first, second, loop_1, loop_2], include_power=False)
 
-    assert len(optimal._graph.nodes()) == 3
+    assert len(optimal.graph.nodes()) == 3
     assert optimal.input_materials == Materials.empty()
     assert optimal.output_materials == 4*outputs
-    assert all(isclose(node.scale, 4) for node in optimal._graph.nodes())
+    assert all(isclose(node.scale, 4) for _, node in optimal.graph.nodes(data="node"))
 
 
 def test_optimization_simple_maximize_output():
@@ -99,10 +118,10 @@ def test_optimization_simple_maximize_output():
 
     optimal = module.Process.maximize_output(4*inputs, outputs, [first, second], include_power=False)
 
-    assert len(optimal._graph.nodes()) == 2
+    assert len(optimal.graph.nodes()) == 2
     assert optimal.input_materials == 4*inputs
     assert optimal.output_materials == 4*outputs
-    assert all(isclose(node.scale, 4) for node in optimal._graph.nodes())
+    assert all(isclose(node.scale, 4) for _, node in optimal.graph.nodes(data="node"))
 
 
 def test_optimization_extraneous_recipes_maximize_output():
@@ -119,10 +138,10 @@ def test_optimization_extraneous_recipes_maximize_output():
 
     optimal = module.Process.maximize_output(4*inputs, outputs, [first, second, third, fourth], include_power=False)
 
-    assert len(optimal._graph.nodes()) == 2
+    assert len(optimal.graph.nodes()) == 2
     assert optimal.input_materials == 4*inputs
     assert optimal.output_materials == 4*outputs
-    assert all(isclose(node.scale, 4) for node in optimal._graph.nodes())
+    assert all(isclose(node.scale, 4) for _, node in optimal.graph.nodes(data="node"))
 
 
 # def test_optimization_loop_available_maximize_output():
@@ -131,3 +150,110 @@ def test_optimization_extraneous_recipes_maximize_output():
 
 # TODO: tests that include power
 # TODO: tests with fork in solution
+
+
+def test_process_node_hash():
+    first = module.ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=0, machine=CONFIG)
+    same = module.ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=0, machine=CONFIG)
+
+    hash(first)
+
+    assert first == same
+    assert hash(first) == hash(same)
+    assert first * 2 != first
+    assert hash(first * 2) == hash(first.model_copy(update={"scale": 2}))
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_trusted_node_field_order():
+    first = module.ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=0, machine=CONFIG)
+    composite = module.ProcessNode.from_nodes(first, first * 2)
+
+    assert list(composite.__dict__) == list(first.__dict__)
+    assert list(composite.model_dump(exclude={"internal_nodes"})) == list(first.model_dump(exclude={"internal_nodes"}))
+
+
+def test_solution_pickle():
+    inputs = Materials(a=2, b=4)
+    outputs = Materials(c=2, d=4)
+
+    source = module.ProcessNode(name="source", input_materials=Materials(), output_materials=inputs, power_production=0, power_consumption=0, machine=CONFIG)
+    first = module.ProcessNode(name="first", input_materials=inputs, output_materials=outputs, power_production=0, power_consumption=0, machine=CONFIG)
+
+    optimal = module.Process.minimize_input(outputs, [source, first], include_power=False)
+    loaded = pickle.loads(pickle.dumps(optimal))
+
+    assert loaded == optimal
+    assert loaded.catalog is optimal.catalog
+    assert loaded.output_materials == outputs
+
+    process = optimal.process
+    process.graph
+    loaded = pickle.loads(pickle.dumps(process))
+    assert loaded._graph is None
+    assert sorted(loaded.graph.nodes) == sorted(process.graph.nodes)
+
+
+def test_solution_save(tmp_path):
+    inputs = Materials(a=2, b=4)
+    outputs = Materials(c=2, d=4)
+
+    source = module.ProcessNode(name="source", input_materials=Materials(), output_materials=inputs, power_production=0, power_consumption=0, machine=CONFIG)
+    first = module.ProcessNode(name="first", input_materials=inputs, output_materials=outputs, power_production=0, power_consumption=0, machine=CONFIG)
+
+    optimal = module.Process.minimize_input(3*outputs, [source, first], name="Plan")
+    optimal.save(tmp_path / "plan")
+
+    # loads into another catalog with the same nodes, in any order
+    catalog = module.RecipeCatalog([first, source])
+    loaded = module.Solution.load(tmp_path / "plan", catalog)
+    assert loaded.nodes == {0: first * 3, 1: source * 3}
+    assert loaded.name == "Plan"
+    assert loaded.statistics == optimal.statistics
+
+    with pytest.raises(KeyError):
+        module.Solution.load(tmp_path / "plan", module.RecipeCatalog([first]))
+
+
+def test_optimization_with_power_minimize_input():
+    inputs = Materials(a=2, b=4)
+    outputs = Materials(c=2, d=4)
+    fuel = Materials(e=1)
+
+    source = module.ProcessNode(name="source", input_materials=Materials(), output_materials=inputs + fuel, power_production=0, power_consumption=0, machine=CONFIG)
+    first = module.ProcessNode(name="first", input_materials=inputs, output_materials=outputs, power_production=0, power_consumption=10, machine=CONFIG)
+    generator = module.ProcessNode(name="generator", input_materials=fuel, output_materials=Materials(), power_production=20, power_consumption=0, machine=CONFIG)
+
+    optimal = module.Process.minimize_input(outputs, [source, first, generator], include_power=True)
+
+    assert optimal.power_production >= optimal.power_consumption
+    assert isclose(optimal.power_consumption, 10)
+
+
+def test_process_graph():
+    source = module.ProcessNode(name="source", input_materials=Materials(), output_materials=Materials(a=4), power_production=0, power_consumption=0, machine=CONFIG)
+    first = module.ProcessNode(name="first", input_materials=Materials(a=2), output_materials=Materials(b=1), power_production=0, power_consumption=0, machine=CONFIG)
+    second = module.ProcessNode(name="second", input_materials=Materials(a=1), output_materials=Materials(c=1), power_production=0, power_consumption=0, machine=CONFIG)
+
+    process = module.Process.from_nodes([source, first, second*2])
+    # built on first access
+    assert process._graph is None
+
+    graph = process.graph
+    assert process.graph is graph
+
+    # a is shared by three nodes, so it's pooled
+    pools = [key for key in graph.nodes if key < 0]
+    assert len(pools) == 1
+    assert graph.nodes[pools[0]]["node"].name == "a Node"
+    edges = {(u, v): (material, amount) for u, v, material, amount in _edges(graph)}
+    assert edges == {(0, pools[0]): ("a", 4), (pools[0], 1): ("a", 2), (pools[0], 2): ("a", 2)}
+
+    # pairs are joined directly
+    pair = module.Process.from_nodes([source, first]).graph
+    assert list(_edges(pair)) == [(0, 1, "a", 2)]
+
+
+def _edges(graph):
+    for u, v, data in graph.edges(data=True):
+        yield u, v, data["material"], data["amount"]
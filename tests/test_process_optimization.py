@@ -1,5 +1,7 @@
+import pytest
+
 from satisfactory_tools.config.standardization import ConfigData
-from satisfactory_tools.core.process import ProcessNode
+from satisfactory_tools.core.process import Process, ProcessNode
 from tests import MATERIAL_NAMES, Materials
 
 _MATERIAL_FRACTION = len(MATERIAL_NAMES) // 4
@@ -46,8 +48,35 @@ SIDE_PRODUCT_PROCESSES = [
     in zip(zip(SECOND_ORDER_MATERIALS[:_SUBSET], SECOND_ORDER_MATERIALS[_SUBSET:]), zip(FINAL_ORDER_MATERIALS[:_SUBSET], FINAL_ORDER_MATERIALS[_SUBSET:]))
 ]
 
-# TODO
 # take second order ingredients and make power
-# GENERATOR_PROCESSES = [
-#
-# ]
+GENERATOR_PROCESSES = [
+    ProcessNode(name=f"generator_{name}", input_materials=Materials(**{name: 3}), output_materials=Materials(), power_production=100, power_consumption=0, machine=CONFIG)
+    for name in SECOND_ORDER_MATERIALS
+]
+
+POWERED_PROCESSES = [node._replace(power_consumption=10) for node in EXTRACTORS + FIRST_ORDER_PROCESSES + SECOND_ORDER_PROCESSES + FINAL_PROCESSES]
+
+
+def test_optimize_power():
+    target = Materials(**{FINAL_ORDER_MATERIALS[0]: 4})
+    solution = Process.optimize_power(target, POWERED_PROCESSES + GENERATOR_PROCESSES)
+
+    # generators burn enough second order product to run the machines making the target and their fuel
+    assert solution.output_materials[FINAL_ORDER_MATERIALS[0]] == pytest.approx(4)
+    assert any(node.name.startswith("generator") for node in solution.internal_nodes)
+    assert solution.power_production == pytest.approx(solution.power_consumption)
+    assert solution.sensitivity.power_price > 0
+
+
+def test_optimize_power_spare():
+    target = Materials(**{FINAL_ORDER_MATERIALS[0]: 4})
+    balanced = Process.optimize_power(target, POWERED_PROCESSES + GENERATOR_PROCESSES)
+    spare = Process.optimize_power(target, POWERED_PROCESSES + GENERATOR_PROCESSES, net_power=500)
+
+    assert spare.power_production - spare.power_consumption == pytest.approx(500)
+    assert spare.statistics.objective > balanced.statistics.objective
+
+    # only power
+    power = Process.optimize_power(Materials(), POWERED_PROCESSES + GENERATOR_PROCESSES, net_power=500)
+    assert power.power_production - power.power_consumption == pytest.approx(500)
+    assert power.output_materials.array == pytest.approx(0)
@@ -0,0 +1,372 @@
+import pickle
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+import satisfactory_tools.core.process as module
+from satisfactory_tools.config.standardization import ConfigData
+from tests import Materials
+
+CONFIG = ConfigData(display_name="test", class_name="test")
+
+
+def chain():
+    inputs = Materials(a=2, b=4)
+    midputs = Materials(e=4, f=7)
+    outputs = Materials(c=2, d=4)
+
+    source = module.ProcessNode(name="source", input_materials=Materials(), output_materials=inputs, power_production=0, power_consumption=0, machine=CONFIG)
+    first = module.ProcessNode(name="first", input_materials=inputs, output_materials=midputs, power_production=0, power_consumption=0, machine=CONFIG)
+    second = module.ProcessNode(name="second", input_materials=midputs, output_materials=outputs, power_production=0, power_consumption=0, machine=CONFIG)
+    return outputs, [source, first, second]
+
+
+@pytest.mark.parametrize("backend", [
+    module.HighsBackend(),
+    module.HighsBackend(module.SolverOptions(method="simplex")),
+    module.HighsBackend(module.SolverOptions(method="ipm", time_limit=10)),
+    module.HighsBackend(module.SolverOptions(presolve=False)),
+    module.MilpBackend(),
+])
+def test_backends(backend):
+    outputs, nodes = chain()
+    optimal = module.Process.minimize_input(4*outputs, nodes, backend=backend)
+
+    assert np.allclose(optimal.scales, 4)
+    statistics = optimal.statistics
+    assert statistics.backend == backend.name
+    assert statistics.status == 0
+    assert statistics.objective == pytest.approx(12)
+    assert statistics.wall_time > 0
+    if backend.options.presolve:
+        # only materials a-f are used
+        assert statistics.rows_removed == 4
+    else:
+        assert statistics.presolve_reductions == 0
+
+
+@pytest.mark.parametrize("backend", [module.HighsBackend, module.MilpBackend, module.RoundingBackend])
+def test_backend_options(backend, recwarn):
+    outputs, nodes = chain()
+    options = module.SolverOptions(time_limit=10, mip_rel_gap=.1, primal_feasibility_tolerance=1e-8, dual_feasibility_tolerance=1e-8)
+    integer = backend is not module.HighsBackend
+    optimal = module.Process.minimize_input(4*outputs, nodes, backend=backend(options), integer=integer)
+
+    assert optimal.statistics.status == 0
+    # every option passed is one the scipy function takes
+    assert not [warning for warning in recwarn if "Unrecognized options" in str(warning.message)]
+
+
+def test_presolve():
+    A = sparse.csc_array(np.array([[1., 0, 0], [0, 0, 0], [0, 0, 0], [0, 1, 0]]))
+    problem = module.LinearProgram.nonnegative(c=np.array([-1., -1, 1]), A_ub=A, b_ub=np.array([1., 0, -1, 2]))
+    reduced, rows, columns = problem.presolve()
+
+    # empty rows are dropped unless they're infeasible, empty columns unless they improve the objective
+    assert rows.tolist() == [True, False, True, True]
+    assert columns.tolist() == [True, True, False]
+    assert reduced.A_ub.shape == (3, 2)
+
+    result = module.HighsBackend().solve(problem)
+    assert not result.success
+    assert result.statistics.status == 2
+
+
+def test_failed_solve():
+    outputs, (source, first, second) = chain()
+    with pytest.raises(module.SolutionFailedException) as error:
+        module.Process.minimize_input(outputs, [first, second])
+
+    assert error.value.result.statistics.status == 2
+
+
+def node(name, inputs, outputs):
+    return module.ProcessNode(name=name, input_materials=inputs, output_materials=outputs, power_production=0, power_consumption=0, machine=CONFIG)
+
+
+def test_session_reuses_solution():
+    outputs, nodes = chain()
+    session = module.SolveSession()
+
+    first = module.Process.minimize_input(4*outputs, nodes, session=session)
+    assert not first.statistics.warm_start
+
+    # same nodes, so nudging the target keeps the basis
+    catalog = first.catalog
+    nudged = module.Process.minimize_input(4.5*outputs, nodes, catalog=catalog, session=session)
+    assert nudged.statistics.warm_start
+    assert nudged.statistics.iterations == 0
+    assert np.allclose(nudged.scales, 4.5)
+    assert np.allclose(nudged.output_materials.array, (4.5*outputs).array)
+
+
+def test_session_falls_back():
+    source = node("source", Materials(), Materials(a=1))
+    slow = node("slow", Materials(a=2), Materials(b=1))
+    fast = node("fast", Materials(a=1), Materials(b=1))
+    other = node("other", Materials(a=1), Materials(c=1))
+    catalog = module.RecipeCatalog()
+    session = module.SolveSession()
+
+    module.Process.minimize_input(Materials(b=2), [source, slow], catalog=catalog, session=session)
+    # a better recipe is appended, and its reduced cost rules out the previous solution
+    better = module.Process.minimize_input(Materials(b=2), [source, slow, fast], catalog=catalog, session=session)
+    assert not better.statistics.warm_start
+    assert better.statistics.objective == pytest.approx(4)
+    assert set(better.catalog.nodes(better.ids)) == {source, fast}
+
+    # a used recipe is disabled
+    disabled = module.Process.minimize_input(Materials(b=2), [source, slow], catalog=catalog, session=session)
+    assert not disabled.statistics.warm_start
+    assert disabled.statistics.objective == pytest.approx(6)
+
+    # a recipe that doesn't help is added
+    same = module.Process.minimize_input(Materials(b=3), [source, slow, other], catalog=catalog, session=session)
+    assert same.statistics.warm_start
+    assert same.statistics.objective == pytest.approx(9)
+
+
+def test_presolve_fixed_columns():
+    A = sparse.csc_array(np.array([[1., 1], [0, 1]]))
+    problem = module.LinearProgram(c=np.array([-1., -1]), A_ub=A, b_ub=np.array([4., 1]), lower=np.array([0., 1]), upper=np.array([np.inf, 1]))
+    reduced, rows, columns = problem.presolve()
+
+    # the fixed column moves to the right hand side, leaving its row empty
+    assert rows.tolist() == [True, False]
+    assert columns.tolist() == [True, False]
+    assert reduced.b_ub.tolist() == [3]
+
+    result = module.HighsBackend().solve(problem)
+    assert result.x.tolist() == [3, 1]
+    assert result.statistics.objective == -4
+
+
+def test_sensitivity_minimize_input():
+    outputs, nodes = chain()
+    # d needs four runs of the chain, which makes more c than needed
+    optimal = module.Process.minimize_input(Materials(c=4, d=16), nodes)
+    sensitivity = optimal.sensitivity
+
+    # three machines per 4 d
+    assert sensitivity.shadow_prices["d"] == pytest.approx(.75)
+    assert sensitivity.shadow_prices["c"] == 0
+    assert sensitivity.power_price is None
+    # below 8 d, c takes over
+    assert sensitivity.range("d") == pytest.approx((8, np.inf))
+    assert sensitivity.range("c")[1] == pytest.approx(8)
+    assert all(cost == pytest.approx(0) for cost in sensitivity.reduced_costs.values())
+
+    nudged = module.Process.minimize_input(Materials(c=4, d=12), nodes, catalog=optimal.catalog)
+    assert nudged.statistics.objective == pytest.approx(optimal.statistics.objective - 4*.75)
+
+
+def test_sensitivity_maximize_output():
+    source = node("source", Materials(), Materials(a=1))
+    slow = node("slow", Materials(a=2), Materials(b=1))
+    fast = node("fast", Materials(a=1, c=1), Materials(b=1))
+    optimal = module.Process.maximize_output(Materials(a=10, c=4), Materials(b=1), [slow, fast])
+    sensitivity = optimal.sensitivity
+
+    # fast uses all of c, slow uses the rest of a
+    assert optimal.output_materials["b"] == pytest.approx(7)
+    assert sensitivity.shadow_prices["a"] < 0
+    assert sensitivity.range("a") == pytest.approx((4, np.inf))
+    assert sensitivity.range("c") == pytest.approx((0, 10))
+
+    ids = {node.name: node_id for node_id, node in enumerate(optimal.catalog)}
+    assert sensitivity.reduced_costs[ids["fast"]] == pytest.approx(0)
+    assert source not in optimal.catalog
+
+
+def test_sensitivity_pickle():
+    outputs, nodes = chain()
+    optimal = module.Process.minimize_input(Materials(c=4, d=16), nodes)
+    loaded = pickle.loads(pickle.dumps(optimal)).sensitivity
+
+    # answers without the problem
+    assert loaded._problem is None
+    assert loaded.shadow_prices == optimal.sensitivity.shadow_prices
+    assert loaded.reduced_costs == optimal.sensitivity.reduced_costs
+    assert loaded.range("d") == optimal.sensitivity.range("d")
+    assert loaded.power_price is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_minimize_input_sweep(workers, monkeypatch):
+    monkeypatch.setattr(module.SweepResult, "min_chunk", 2)
+    outputs, nodes = chain()
+    # g can't be made
+    targets = [outputs * scale for scale in range(1, 6)] + [Materials(g=1)]
+    result = module.Process.minimize_input_sweep(targets, nodes, workers=workers)
+
+    assert len(result) == 6
+    assert result.status.tolist() == [0] * 5 + [2]
+    assert result.objective[:5] == pytest.approx([3, 6, 9, 12, 15])
+    assert np.isnan(result.objective[5])
+    assert result.warm_start.sum() >= 3
+    assert result.scales[:5] == pytest.approx(np.arange(1, 6)[:, np.newaxis] * np.ones((5, 3)))
+
+    solution = result.solution(3)
+    assert np.allclose(solution.output_materials.array, (4*outputs).array)
+    with pytest.raises(ValueError):
+        result.solution(5)
+
+
+def test_maximize_output_sweep():
+    slow = node("slow", Materials(a=2), Materials(b=1))
+    fast = node("fast", Materials(a=1, c=1), Materials(b=1))
+    available = [Materials(a=10, c=c) for c in range(5)]
+    result = module.Process.maximize_output_sweep(available, Materials(b=1), [slow, fast], workers=1)
+
+    # each unit of c saves one a
+    produced = [module.Process.maximize_output(spec, Materials(b=1), [slow, fast]).output_materials["b"] for spec in available]
+    assert produced == pytest.approx([5, 5.5, 6, 6.5, 7])
+    assert [result.solution(row).output_materials["b"] for row in range(len(result))] == pytest.approx(produced)
+
+
+def test_integer_minimize_input():
+    outputs, nodes = chain()
+
+    # the relaxation is already integral
+    exact = module.Process.minimize_input(4*outputs, nodes, integer=True)
+    assert exact.scales.tolist() == [4, 4, 4]
+    assert exact.statistics.mip_gap == 0
+    assert exact.sensitivity is None
+
+    whole = module.Process.minimize_input(outputs*1.5, nodes, integer=True)
+    assert whole.scales.tolist() == [2, 2, 2]
+    statistics = whole.statistics
+    assert statistics.status == 0
+    assert statistics.objective == pytest.approx(6)
+    # at least the relaxation's 4.5
+    assert 4.5 <= statistics.dual_bound <= 6
+
+    with pytest.raises(ValueError):
+        module.Process.minimize_input(outputs*1.5, nodes, integer=True, backend=module.HighsBackend())
+
+
+def test_integer_maximize_output():
+    slow = node("slow", Materials(a=2), Materials(b=1))
+    fast = node("fast", Materials(a=1, c=1), Materials(b=1))
+    optimal = module.Process.maximize_output(Materials(a=10, c=2.5), Materials(b=1), [slow, fast], integer=True)
+
+    assert optimal.output_materials["b"] == pytest.approx(6)
+    assert np.allclose(optimal.scales, np.round(optimal.scales))
+
+
+def test_integer_time_limit():
+    outputs, nodes = chain()
+    backend = module.MilpBackend(module.SolverOptions(time_limit=0))
+    with pytest.raises(module.SolutionFailedException) as error:
+        module.Process.minimize_input(outputs*1.5, nodes, integer=True, backend=backend)
+
+    # no time to find a solution
+    statistics = error.value.result.statistics
+    assert statistics.status == 1
+
+    # the best solution found by the limit is returned
+    incumbent = module.LPResult(x=np.ones(3), statistics=module.replace(statistics, mip_gap=.1))
+    assert incumbent.feasible and not incumbent.success
+
+
+def test_rounding_backend():
+    ore = node("ore", Materials(), Materials(a=1))
+    smelter = node("smelter", Materials(a=3), Materials(b=1))
+
+    # 1.5 smelters round up to 2, which need a sixth ore after rounding 4.5 up to 5
+    rounded = module.Process.minimize_input(Materials(b=1.5), [ore, smelter], integer=True, backend=module.RoundingBackend())
+    assert rounded.scales.tolist() == [6, 2]
+    statistics = rounded.statistics
+    assert statistics.backend == "rounding"
+    assert statistics.dual_bound == pytest.approx(6)
+    assert statistics.mip_gap == pytest.approx(2 / 8)
+
+    halves = module.Process.minimize_input(Materials(b=1.25), [ore, smelter], integer=True, backend=module.RoundingBackend(step=.5))
+    assert halves.scales.tolist() == [4.5, 1.5]
+
+
+def test_rounding_backend_falls_back():
+    slow = node("slow", Materials(a=2), Materials(b=1))
+    fast = node("fast", Materials(a=1, c=1), Materials(b=1))
+
+    # rounding up exceeds the available c, which more nodes can't fix
+    rounded = module.Process.maximize_output(Materials(a=10, c=2.5), Materials(b=1), [slow, fast], integer=True, backend=module.RoundingBackend())
+    exact = module.Process.maximize_output(Materials(a=10, c=2.5), Materials(b=1), [slow, fast], integer=True)
+    assert rounded.output_materials["b"] == pytest.approx(exact.output_materials["b"])
+
+
+def test_blocks():
+    A = sparse.csc_array(np.array([[1., 1, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]]))
+    problem = module.LinearProgram.nonnegative(c=np.ones(4), A_ub=A, b_ub=np.ones(4))
+
+    # columns 0 and 1 share rows, 2 and 3 are alone, and the empty row joins a block
+    blocks = problem.blocks(4)
+    assert [columns.tolist() for rows, columns in blocks] == [[0, 1], [2], [3]]
+    assert sorted(np.concatenate([rows for rows, columns in blocks]).tolist()) == [0, 1, 2, 3]
+
+    packed = problem.blocks(2)
+    assert [columns.tolist() for rows, columns in packed] == [[0, 1], [2, 3]]
+
+
+@pytest.mark.parametrize("backend", [module.HighsBackend(), module.RoundingBackend()])
+def test_decomposed_backend(backend, monkeypatch):
+    monkeypatch.setattr(module.DecomposedBackend, "min_size", 0)
+    outputs, nodes = chain()
+    ore = node("ore", Materials(), Materials(g=1))
+    smelter = node("smelter", Materials(g=3), Materials(h=1))
+    target = outputs*1.5 + Materials(h=1.5)
+    integer = isinstance(backend, module.MilpBackend)
+
+    expected = module.Process.minimize_input(target, nodes + [ore, smelter], backend=backend, integer=integer)
+    decomposed = module.DecomposedBackend(backend, workers=2)
+    optimal = module.Process.minimize_input(target, nodes + [ore, smelter], backend=decomposed, integer=integer)
+    assert np.allclose(optimal.scales, expected.scales)
+    assert optimal.statistics.objective == pytest.approx(expected.statistics.objective)
+    assert optimal.statistics.backend == backend.name
+    pool = decomposed._executor
+
+    # one infeasible block fails the whole problem
+    with pytest.raises(module.SolutionFailedException) as error:
+        module.Process.minimize_input(target, nodes[1:] + [ore, smelter], backend=decomposed, integer=integer)
+    assert error.value.result.statistics.status == 2
+
+    # the pool is kept between solves
+    assert pool is not None and decomposed._executor is pool
+    decomposed.close()
+    assert decomposed._executor is None
+
+
+def test_pruning():
+    outputs, nodes = chain()
+    wasteful = nodes[1]._replace(name="wasteful", input_materials=Materials(a=2, b=5))
+    starved = nodes[1]._replace(name="starved", input_materials=Materials(j=1))
+
+    optimal = module.Process.minimize_input(outputs, [wasteful, starved, *nodes])
+    assert [node.name for node in optimal.nodes.values()] == ["source", "first", "second"]
+    assert len(optimal.pruning) == 2
+    assert list(optimal.pruning.dominated) == [optimal.catalog.id(wasteful)]
+
+    unpruned = module.Process.minimize_input(outputs, [wasteful, starved, *nodes], prune=False)
+    assert unpruned.pruning is None
+    assert unpruned.statistics.objective == pytest.approx(optimal.statistics.objective)
+
+    # available j feeds the starved node
+    result = module.Process.maximize_output(Materials(a=10, b=20, j=2), Materials(e=1), [wasteful, starved, nodes[1]])
+    assert result.pruning.starved == []
+
+
+def test_flatten():
+    outputs, nodes = chain()
+    source, first, second = nodes
+    # an earlier result, reused alongside one of its recipes
+    earlier = module.Process.minimize_input(outputs, nodes).process
+    assert earlier.internal_nodes == frozenset(nodes)
+
+    nested = module.Process.minimize_input(3*outputs, [earlier, second])
+    assert [node.name for node in nested.nodes.values()] == ["Result"]
+
+    flat = module.Process.minimize_input(3*outputs, [earlier, second], flatten=True)
+    assert flat.nodes == {flat.catalog.id(node): node * 3 for node in nodes}
+    assert all(not node.internal_nodes for node in flat.internal_nodes)
+    assert flat.output_materials == nested.output_materials
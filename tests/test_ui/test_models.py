@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from satisfactory_tools.core.catalog import RecipeCatalog
+from satisfactory_tools.ui.models import OptimizationResult
+from tests import Materials
+
+
+def test_load_json_result():
+    # saved by earlier versions, where specs were models with a material_values field
+    result = OptimizationResult.load(Path(__file__).parent / "baseline_result.json", RecipeCatalog())
+
+    assert result.process.name == "Saved"
+    assert result.process.output_materials == Materials(b=2)
+    assert result.process.power_consumption == 10
+    assert sorted(node.name for node in result.process.internal_nodes) == ["first", "source"]
+    # two of each node
+    assert result.machine_count == 4